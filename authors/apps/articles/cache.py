@@ -0,0 +1,147 @@
+"""
+Caches of article detail payloads and of the tag directory.
+
+Article entries hold the serialized article, minus the viewer's flags,
+together with the versions of the article and of its author profile they
+were built from. The model signals bump those versions on every change,
+so an entry is only used while both still match, and nothing is cached
+unless those versions are shared by every process, see `SHARED_CACHE`.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from authors.apps.core.cache import get_version, get_versions
+from authors.apps.core.conditional import make_etag
+from authors.apps.profiles.models import profile_version
+
+from .models import Article, Tag, article_version, article_validators
+
+
+class ArticleDetailCache:
+    key_prefix = 'article-detail:'
+
+    @property
+    def cache(self):
+        return caches[settings.ARTICLE_CACHE_ALIAS]
+
+    def key(self, slug):
+        return self.key_prefix + slug
+
+    def versions(self, article_pk, author_pk):
+        return get_versions(
+            article_version(article_pk), profile_version(author_pk))
+
+    @property
+    def enabled(self):
+        return settings.SHARED_CACHE
+
+    def get(self, slug):
+        """ Return the current entry for `slug`, or None. """
+        if not self.enabled:
+            return None
+        entry = self.cache.get(self.key(slug))
+        if entry is None:
+            return None
+        if entry['versions'] != self.versions(entry['pk'], entry['author_pk']):
+            return None
+        return entry
+
+    def set(self, slug, article, versions, data):
+        """
+        Store the serialized `article`. `versions` must have been read
+        before the article was loaded, so that a change made in between
+        leaves the entry outdated rather than wrong.
+        """
+        if not self.enabled:
+            return
+        data = dict(data)
+        for field in Article.VIEWER_FLAG_FIELDS:
+            data.pop(field, None)
+        self.cache.set(self.key(slug), {
+            'pk': article.pk,
+            'author_pk': article.author_id,
+            'versions': versions,
+            'state': article.validator_state(),
+            'data': data,
+        }, settings.ARTICLE_CACHE_TTL)
+
+    @staticmethod
+    def validators(entry, flags):
+        return article_validators(entry['state'], flags)
+
+    @staticmethod
+    def payload(entry, flags):
+        """ The cached article with the viewer's flags spliced back in. """
+        data = dict(entry['data'])
+        data.update(zip(Article.VIEWER_FLAG_FIELDS, flags))
+        return data
+
+
+article_cache = ArticleDetailCache()
+
+
+class TagDirectory:
+    """
+    Every tag with its article count, most used first, held in memory.
+
+    The list is reloaded with one query whenever the `tags` version, bumped
+    by any tag or tagging change, has moved since it was loaded. Without a
+    shared cache, see `SHARED_CACHE`, other processes' changes do not move
+    it, and the list is reloaded once it is `TAG_DIRECTORY_TTL` seconds old
+    instead.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # The version the entries were loaded at, when, and the entries.
+        self.loaded = (None, None, [])
+
+    def entries(self):
+        """ Return the current list of `TagSerializer` shaped tags. """
+        version = get_version('tags') if settings.SHARED_CACHE else None
+        loaded = self.loaded
+        if not self.is_current(loaded, version):
+            with self.lock:
+                loaded = self.loaded
+                if not self.is_current(loaded, version):
+                    loaded = (version, time.monotonic(), list(
+                        Tag.objects.order_by('-articles_count', 'tag').values(
+                            'tag', 'articles_count')))
+                    self.loaded = loaded
+        return loaded[2]
+
+    @staticmethod
+    def is_current(loaded, version):
+        loaded_version, loaded_at, _ = loaded
+        if loaded_at is None:
+            return False
+        if version is not None:
+            return loaded_version == version
+        return time.monotonic() - loaded_at < settings.TAG_DIRECTORY_TTL
+
+    def etag(self):
+        """
+        The ETag of the tag list: the `tags` version where version counters
+        are shared, see `SHARED_CACHE`, and otherwise the tags themselves.
+        """
+        if settings.SHARED_CACHE:
+            return make_etag('tags', get_version('tags'))
+        return make_etag('tags', *(
+            (entry['tag'], entry['articles_count'])
+            for entry in self.entries()))
+
+    def search(self, prefix=''):
+        """ The entries whose tag starts with `prefix`, ignoring case. """
+        prefix = prefix.lower()
+        if not prefix:
+            return self.entries()
+        return [
+            entry for entry in self.entries()
+            if entry['tag'].lower().startswith(prefix)
+        ]
+
+
+tag_directory = TagDirectory()
@@ -0,0 +1,68 @@
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+
+from authors.apps.articles.models import Article
+
+
+class Command(BaseCommand):
+    help = ('Write every article as newline delimited JSON, one article per '
+            'line, for import_articles.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output', nargs='?', default='-',
+            help='File to write, or - for standard output.')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of articles loaded per query.')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        exported = 0
+
+        target = sys.stdout if options['output'] == '-' else open(
+            options['output'], 'w', encoding='utf-8')
+        try:
+            for article in self.articles(options['batch_size']):
+                target.write(json.dumps(
+                    self.row(article), cls=DjangoJSONEncoder) + '\n')
+                exported += 1
+        finally:
+            if target is not sys.stdout:
+                target.close()
+
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.stderr.write('Exported {} articles in {:.1f}s ({:.0f} rows/sec).'.format(
+            exported, elapsed, exported / elapsed))
+
+    def articles(self, batch_size):
+        """
+        Yield all articles in primary key order, a batch at a time, so that
+        memory use does not grow with the size of the table.
+        """
+        queryset = Article.objects.defer('search_vector').select_related(
+            'author__user').prefetch_related('tags').order_by('pk')
+        last = 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last)[:batch_size])
+            yield from batch
+            if len(batch) < batch_size:
+                return
+            last = batch[-1].pk
+
+    def row(self, article):
+        return {
+            'slug': article.slug,
+            'title': article.title,
+            'description': article.description,
+            'body': article.body,
+            'image_url': article.image_url,
+            'author': article.author.user.username,
+            'tagList': [tag.tag for tag in article.tags.all()],
+            'created_at': article.created_at,
+            'updated_at': article.updated_at,
+        }
@@ -0,0 +1,162 @@
+import json
+import sys
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils.dateparse import parse_datetime
+
+from authors.apps.articles.models import Article, Tag
+from authors.apps.articles.utils import resolve_tags, tag_slug
+from authors.apps.core.cache import expire_version
+from authors.apps.core.utils import generate_slug
+from authors.apps.profiles.models import Profile
+
+
+def parse_date(value):
+    """ `parse_datetime`, returning None for anything but a valid date. """
+    try:
+        return parse_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class Command(BaseCommand):
+    help = ('Load articles from newline delimited JSON, as written by '
+            'export_articles, in batches.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'input', nargs='?', default='-',
+            help='File to read, or - for standard input.')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of articles inserted per transaction.')
+
+    def handle(self, *args, **options):
+        self.imported = self.skipped = 0
+        self.verbosity = options['verbosity']
+        started = time.monotonic()
+
+        source = sys.stdin if options['input'] == '-' else open(
+            options['input'], encoding='utf-8')
+        try:
+            batch = []
+            for number, line in enumerate(source, 1):
+                if not line.strip():
+                    continue
+                try:
+                    batch.append(self.validate_row(json.loads(line)))
+                except ValueError as error:
+                    raise CommandError('Line {}: {}'.format(number, error))
+                if len(batch) >= options['batch_size']:
+                    self.import_batch(batch)
+                    batch = []
+            if batch:
+                self.import_batch(batch)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.stdout.write(
+            'Imported {} articles, skipped {}, in {:.1f}s ({:.0f} rows/sec).'.format(
+                self.imported, self.skipped, elapsed,
+                (self.imported + self.skipped) / elapsed))
+
+    def validate_row(self, row):
+        """
+        Check that `row` can be inserted, so that a bad row stops the
+        import with its line number instead of failing inside its batch.
+        The batches before it stay imported.
+        """
+        if not isinstance(row, dict):
+            raise ValueError('Expected an object.')
+        title = row.get('title')
+        if not isinstance(title, str) or not title.strip():
+            raise ValueError('The title is missing.')
+        if len(title) > Article._meta.get_field('title').max_length:
+            raise ValueError('The title is too long.')
+        for field in ('created_at', 'updated_at'):
+            value = row.get(field)
+            if value and parse_date(value) is None:
+                raise ValueError('Invalid {}: {!r}.'.format(field, value))
+        return row
+
+    def import_batch(self, rows):
+        """
+        Insert one batch of articles with a fixed number of queries: one to
+        find the authors, one for taken slugs, the inserts, one to read the
+        new ids back and the tag queries.
+        """
+        with transaction.atomic():
+            authors = dict(Profile.objects.filter(
+                user__username__in={row.get('author') for row in rows}
+            ).values_list('user__username', 'pk'))
+
+            for row in rows:
+                row['slug'] = row.get('slug') or generate_slug(row['title'])
+            taken = set(Article.objects.filter(
+                slug__in=[row['slug'] for row in rows]
+            ).values_list('slug', flat=True))
+
+            articles, dates, tag_names = [], [], {}
+            for row in rows:
+                if row.get('author') not in authors or row['slug'] in taken:
+                    self.skipped += 1
+                    continue
+                taken.add(row['slug'])
+                articles.append(Article(
+                    slug=row['slug'], title=row['title'],
+                    description=row.get('description', ''),
+                    body=row.get('body', ''), image_url=row.get('image_url'),
+                    author_id=authors[row['author']]))
+                dates.append((row.get('created_at'), row.get('updated_at')))
+                names = tag_names[row['slug']] = {}
+                for name in row.get('tagList') or []:
+                    names.setdefault(tag_slug(name), name)
+
+            # Bulk inserts skip `pre_save`, hence the slugs made above, and
+            # SQLite does not return the new ids, so they are read back.
+            Article.objects.bulk_create(articles)
+            ids = dict(Article.objects.filter(
+                slug__in=tag_names).values_list('slug', 'pk'))
+
+            # `auto_now_add` overrode the exported dates, put them back.
+            dated = []
+            for article, (created_at, updated_at) in zip(articles, dates):
+                if created_at:
+                    article.pk = ids[article.slug]
+                    article.created_at = parse_datetime(created_at)
+                    article.updated_at = parse_datetime(updated_at or created_at)
+                    dated.append(article)
+            Article.objects.bulk_update(dated, ['created_at', 'updated_at'])
+
+            tags = {tag.slug: tag for tag in resolve_tags(
+                name for names in tag_names.values() for name in names.values())}
+            tagging = [
+                Article.tags.through(article_id=ids[slug], tag_id=tags[tag].pk)
+                for slug, names in tag_names.items() for tag in names
+            ]
+            Article.tags.through.objects.bulk_create(tagging)
+
+            # The bulk insert sends no `m2m_changed` to count the tagging.
+            counts = Counter(row.tag_id for row in tagging)
+            if counts:
+                Tag.objects.filter(pk__in=counts).update(
+                    articles_count=F('articles_count') + Case(
+                        *(When(pk=pk, then=Value(count))
+                          for pk, count in counts.items()),
+                        output_field=IntegerField()))
+                expire_version('tags')
+
+            Article.objects.filter(pk__in=ids.values()).update_search_vectors()
+
+        # Bulk inserts send no `post_save` either, which would fan out.
+        Article.objects.filter(pk__in=ids.values()).fan_out()
+
+        self.imported += len(articles)
+        if self.verbosity > 1:
+            self.stdout.write('Imported {} articles.'.format(self.imported))
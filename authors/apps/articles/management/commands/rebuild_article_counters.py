@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
+
+from authors.apps.articles.models import Article, Rate
+from authors.apps.core.models import SubqueryCount
+from authors.apps.profiles.models import Profile
+
+
+def counter_expressions():
+    """ Map each stored counter to a subquery recounting its source rows. """
+    article = models.OuterRef('pk')
+    ratings = Rate.objects.filter(
+        article_id=article).order_by().values('article_id')
+    return {
+        'likes_count': SubqueryCount(Article.likes.through.objects.filter(
+            article_id=article).values('pk')),
+        'dislikes_count': SubqueryCount(Article.dislikes.through.objects.filter(
+            article_id=article).values('pk')),
+        'favorites_count': SubqueryCount(
+            Profile.favorites.through.objects.filter(
+                article_id=article).values('pk')),
+        'rating_sum': Coalesce(models.Subquery(
+            ratings.annotate(total=models.Sum('ratings')).values('total')), 0),
+        'rating_count': SubqueryCount(ratings.values('pk')),
+        'average_rating': models.Subquery(
+            ratings.annotate(average=models.Avg('ratings')).values('average'),
+            output_field=models.FloatField()),
+    }
+
+
+class Command(BaseCommand):
+    help = ('Recompute the denormalized like, dislike and favorite counters '
+            'and the rating aggregate.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Number of articles updated per UPDATE statement.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be at least 1.')
+        ids = Article.objects.order_by('pk').values_list('pk', flat=True)
+        start, last = ids.first(), ids.last()
+        updated = 0
+
+        # Walk the table in primary key ranges so each statement only locks
+        # a bounded number of rows.
+        while last is not None and start <= last:
+            end = start + batch_size
+            with transaction.atomic():
+                updated += Article.objects.filter(
+                    pk__gte=start, pk__lt=end).update(**counter_expressions())
+            start = end
+
+        self.stdout.write('Rebuilt counters for {} articles.'.format(updated))
@@ -0,0 +1,45 @@
+from django.db import migrations, models
+
+from authors.apps.core.models import SubqueryCount
+
+
+def populate_counters(apps, schema_editor):
+    Article = apps.get_model('articles', 'Article')
+    Profile = apps.get_model('profiles', 'Profile')
+    article = models.OuterRef('pk')
+
+    Article.objects.update(
+        likes_count=SubqueryCount(Article.likes.through.objects.filter(
+            article_id=article).values('pk')),
+        dislikes_count=SubqueryCount(Article.dislikes.through.objects.filter(
+            article_id=article).values('pk')),
+        favorites_count=SubqueryCount(Profile.favorites.through.objects.filter(
+            article_id=article).values('pk')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0003_auto_20200111_1422'),
+        ('profiles', '0003_profile_favorites'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='likes_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='dislikes_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='favorites_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
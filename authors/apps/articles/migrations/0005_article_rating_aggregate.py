@@ -0,0 +1,45 @@
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def populate_ratings(apps, schema_editor):
+    Article = apps.get_model('articles', 'Article')
+    Rate = apps.get_model('articles', 'Rate')
+    ratings = Rate.objects.filter(
+        article_id=models.OuterRef('pk')).order_by().values('article_id')
+
+    Article.objects.update(
+        rating_sum=Coalesce(models.Subquery(
+            ratings.annotate(total=models.Sum('ratings')).values('total')), 0),
+        rating_count=Coalesce(models.Subquery(
+            ratings.annotate(total=models.Count('pk')).values('total')), 0),
+        average_rating=models.Subquery(
+            ratings.annotate(average=models.Avg('ratings')).values('average'),
+            output_field=models.FloatField()),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0004_article_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='rating_sum',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='average_rating',
+            field=models.FloatField(db_index=True, null=True),
+        ),
+        migrations.RunPython(populate_ratings, migrations.RunPython.noop),
+    ]
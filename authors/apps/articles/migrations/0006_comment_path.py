@@ -0,0 +1,46 @@
+from django.db import migrations, models
+
+
+def populate_paths(apps, schema_editor):
+    Comment = apps.get_model('articles', 'Comment')
+    descendant_paths = {}
+    depths = {}
+    batch = []
+
+    # Parents are always created before their replies, so walking the
+    # table in primary key order sees every parent first.
+    for comment in Comment.objects.order_by('pk').only('pk', 'parent_id').iterator():
+        if comment.parent_id:
+            comment.path = descendant_paths[comment.parent_id]
+            comment.depth = depths[comment.parent_id] + 1
+            batch.append(comment)
+        descendant_paths[comment.pk] = '{}{:010d}/'.format(
+            comment.path if comment.parent_id else '', comment.pk)
+        depths[comment.pk] = comment.depth if comment.parent_id else 0
+
+        if len(batch) >= 1000:
+            Comment.objects.bulk_update(batch, ['path', 'depth'])
+            batch = []
+
+    Comment.objects.bulk_update(batch, ['path', 'depth'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0005_article_rating_aggregate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=1024),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='depth',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 3.1.14 on 2026-10-18 17:01
+
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+# The GIN index is not declared on the model because SQLite, used by the
+# tests, cannot create it. Search only uses the vector on PostgreSQL.
+CREATE_INDEX = (
+    'CREATE INDEX articles_article_search_vector_gin '
+    'ON articles_article USING gin (search_vector)'
+)
+DROP_INDEX = 'DROP INDEX IF EXISTS articles_article_search_vector_gin'
+
+POPULATE_VECTORS = """
+UPDATE articles_article SET search_vector =
+    setweight(to_tsvector(%(config)s::regconfig, coalesce(title, '')), 'A') ||
+    setweight(to_tsvector(%(config)s::regconfig, coalesce(description, '')), 'B') ||
+    setweight(to_tsvector(%(config)s::regconfig, coalesce((
+        SELECT string_agg(tag.tag, ' ')
+        FROM articles_article_tags article_tag
+        JOIN articles_tag tag ON tag.id = article_tag.tag_id
+        WHERE article_tag.article_id = articles_article.id
+    ), '')), 'B') ||
+    setweight(to_tsvector(%(config)s::regconfig, coalesce(body, '')), 'C')
+"""
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        POPULATE_VECTORS, {'config': settings.ARTICLE_SEARCH_CONFIG})
+    schema_editor.execute(CREATE_INDEX)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0007_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
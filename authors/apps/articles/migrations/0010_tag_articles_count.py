@@ -0,0 +1,30 @@
+# Generated by Django 3.1.14 on 2026-10-18 17:40
+
+from django.db import migrations, models
+
+from authors.apps.core.models import SubqueryCount
+
+
+def populate_counts(apps, schema_editor):
+    Article = apps.get_model('articles', 'Article')
+    Tag = apps.get_model('articles', 'Tag')
+
+    Tag.objects.update(articles_count=SubqueryCount(
+        Article.tags.through.objects.filter(
+            tag_id=models.OuterRef('pk')).values('pk')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0009_article_feed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='articles_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(populate_counts, migrations.RunPython.noop),
+    ]
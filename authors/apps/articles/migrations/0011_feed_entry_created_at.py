@@ -0,0 +1,41 @@
+# Generated by Django 3.1.14 on 2026-10-18 18:17
+
+from django.db import migrations, models
+
+
+def copy_created_at(apps, schema_editor):
+    Article = apps.get_model('articles', 'Article')
+    FeedEntry = apps.get_model('articles', 'FeedEntry')
+
+    FeedEntry.objects.update(created_at=models.Subquery(
+        Article.objects.filter(
+            pk=models.OuterRef('article_id')).values('created_at')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0010_tag_articles_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedentry',
+            name='created_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='feedentry',
+            name='created_at',
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(fanned_out=False), fields=['author'], name='article_not_fanned_out_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['owner', '-created_at', '-article'], name='articles_fe_owner_i_4ced16_idx'),
+        ),
+    ]
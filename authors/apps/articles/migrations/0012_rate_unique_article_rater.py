@@ -0,0 +1,50 @@
+# Generated by Django 3.1.14 on 2026-10-18 18:40
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+from authors.apps.core.models import SubqueryCount
+
+
+def remove_duplicate_ratings(apps, schema_editor):
+    """
+    Keep the latest rating of each rater of an article, and recompute the
+    rating aggregate of the articles that had several.
+    """
+    Article = apps.get_model('articles', 'Article')
+    Rate = apps.get_model('articles', 'Rate')
+
+    duplicates = Rate.objects.order_by().values('article_id', 'rater_id').annotate(
+        latest=models.Max('pk'), rows=models.Count('pk')).filter(rows__gt=1)
+    articles = set()
+    for duplicate in duplicates:
+        Rate.objects.filter(
+            article_id=duplicate['article_id'], rater_id=duplicate['rater_id'],
+        ).exclude(pk=duplicate['latest']).delete()
+        articles.add(duplicate['article_id'])
+
+    ratings = Rate.objects.filter(
+        article_id=models.OuterRef('pk')).order_by().values('article_id')
+    Article.objects.filter(pk__in=articles).update(
+        rating_sum=Coalesce(models.Subquery(
+            ratings.annotate(total=models.Sum('ratings')).values('total')), 0),
+        rating_count=SubqueryCount(ratings.values('pk')),
+        average_rating=models.Subquery(
+            ratings.annotate(average=models.Avg('ratings')).values('average'),
+            output_field=models.FloatField()),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0011_feed_entry_created_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_ratings, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='rate',
+            constraint=models.UniqueConstraint(fields=('article', 'rater'), name='unique_article_rater'),
+        ),
+    ]
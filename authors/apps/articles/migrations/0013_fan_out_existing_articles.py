@@ -0,0 +1,47 @@
+# Generated by Django 3.1.14 on 2026-10-18 19:05
+
+from django.conf import settings
+from django.db import migrations
+
+
+def fan_out_articles(apps, schema_editor):
+    """
+    Deliver the articles written before feeds were fanned out, like
+    `ArticleQuerySet.fan_out`, so that their readers' feeds are paged
+    from their timelines.
+    """
+    Article = apps.get_model('articles', 'Article')
+    FeedEntry = apps.get_model('articles', 'FeedEntry')
+    Profile = apps.get_model('profiles', 'Profile')
+
+    pending = Article.objects.filter(fanned_out=False)
+    authors = Profile.objects.filter(
+        pk__in=pending.values('author_id'),
+        followers_count__lte=settings.FEED_FANOUT_THRESHOLD,
+    ).values_list('pk', flat=True)
+    for author in authors:
+        articles = list(pending.filter(author_id=author).order_by(
+        ).values_list('pk', 'created_at'))
+        followers = Profile.follows.through.objects.filter(
+            to_profile_id=author).values_list('from_profile_id', flat=True)
+        FeedEntry.objects.bulk_create(
+            (FeedEntry(owner_id=follower, article_id=article,
+                       created_at=created_at)
+             for follower in followers.iterator()
+             for article, created_at in articles),
+            batch_size=1000, ignore_conflicts=True)
+        Article.objects.filter(
+            pk__in=[article for article, _ in articles]
+        ).update(fanned_out=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0004_profile_follow_counters'),
+        ('articles', '0012_rate_unique_article_rater'),
+    ]
+
+    operations = [
+        migrations.RunPython(fan_out_articles, migrations.RunPython.noop),
+    ]
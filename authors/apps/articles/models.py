@@ -1,12 +1,209 @@
-from django.db import models
-from django.db.models.signals import pre_save
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import connections, models, transaction
+from django.db.models.functions import Cast, Coalesce
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete, pre_save)
 from django.dispatch import receiver
 from authors.apps.core.utils import random_string_generator, generate_slug
+from authors.apps.core.cache import expire_version
+from authors.apps.core.conditional import make_etag
 from authors.apps.core.models import TimeModel
 
 from authors.apps.authentication.models import User
 from authors.apps.profiles.models import Profile
 
+
+def author_prefetch():
+    """ Batch-load author profiles with everything `ProfileSerializer` reads. """
+    return models.Prefetch(
+        'author',
+        queryset=Profile.objects.select_related('user'))
+
+
+def article_version(pk):
+    """ Name of the version counter of an article's own data. """
+    return 'article:{}'.format(pk)
+
+
+def article_validators(state, flags):
+    """
+    The ETag of an article for a viewer, from the values of
+    `Article.VALIDATOR_FIELDS` and the viewer's flags, see
+    `ArticleQuerySet.with_viewer_flags`.
+
+    There is no Last-Modified date: the counters change without touching
+    `updated_at`, so it would claim a changed article was not modified.
+    """
+    return {'etag': make_etag('article', *state, *flags)}
+
+
+class ArticleQuerySet(models.QuerySet):
+
+    def with_viewer_flags(self, user=None, flags=None):
+        """
+        Annotate whether `user` has favorited, liked and disliked each
+        article, as `Article.VIEWER_FLAGS` or the given subset of them,
+        with one lookup on the unique (article, user) index of each
+        relation.
+        """
+        flags = Article.VIEWER_FLAGS if flags is None else flags
+        if user is None or not user.is_authenticated:
+            return self.annotate(**{
+                flag: models.Value(False, models.BooleanField())
+                for flag in flags
+            })
+
+        lookups = {
+            'is_favorited': Profile.favorites.through.objects.filter(
+                article_id=models.OuterRef('pk'), profile__user=user),
+            'is_liked': Article.likes.through.objects.filter(
+                article_id=models.OuterRef('pk'), user=user),
+            'is_disliked': Article.dislikes.through.objects.filter(
+                article_id=models.OuterRef('pk'), user=user),
+        }
+        return self.annotate(**{
+            flag: models.Exists(lookups[flag]) for flag in flags
+        })
+
+    def viewer_flags(self, user=None):
+        """ Return the `VIEWER_FLAGS` of `user` for the first article. """
+        if user is None or not user.is_authenticated:
+            return (False, ) * len(Article.VIEWER_FLAGS)
+        return self.with_viewer_flags(user).values_list(
+            *Article.VIEWER_FLAGS).first()
+
+    def with_serializer_data(self, user=None, selection=None):
+        """
+        Load everything `ArticleSerializer` reads in a fixed number of
+        queries, however many articles are serialized.
+
+        The viewer's flags are annotated on the article rows, while tags
+        and the author profile are fetched in one batched query each.
+        Who liked or disliked the articles is never loaded, only counted.
+
+        With a `FieldSelection`, the text columns, flags, tags and author
+        left out of it are not loaded.
+        """
+        if selection is None:
+            return self.defer('search_vector').with_viewer_flags(
+                user).prefetch_related('tags', author_prefetch())
+
+        wants = selection.wants
+        # Search highlights are cut from the title and the body.
+        highlighted = ()
+        if selection.fields and wants('highlight'):
+            highlighted = ('title', 'body')
+        queryset = self.defer('search_vector', *(
+            column for column in Article.TEXT_FIELDS
+            if not wants(column) and column not in highlighted))
+        queryset = queryset.with_viewer_flags(user, [
+            flag for flag, field in zip(
+                Article.VIEWER_FLAGS, Article.VIEWER_FLAG_FIELDS)
+            if wants(field)])
+
+        if wants('tagList'):
+            queryset = queryset.prefetch_related('tags')
+        if wants('author') and selection.expands('author'):
+            queryset = queryset.prefetch_related(author_prefetch())
+        elif wants('author'):
+            # Collapsed to the username.
+            queryset = queryset.select_related('author__user')
+        return queryset
+
+    def validator_state(self, user=None):
+        """
+        Return the values of `Article.VALIDATOR_FIELDS` followed by the
+        `VIEWER_FLAGS` of `user` for the first article, or None.
+
+        They are read with one narrow query over the stored counters and
+        the author's columns, without loading the relations, so that the
+        article's validators are cheap to check.
+        """
+        return self.with_viewer_flags(user).values_list(
+            *Article.VALIDATOR_FIELDS, *Article.VIEWER_FLAGS).first()
+
+    def update_search_vectors(self):
+        """
+        Recompute the stored `search_vector` of the articles in one UPDATE.
+
+        The vector is only maintained on PostgreSQL, other databases search
+        the columns directly.
+        """
+        if connections[self.db].vendor != 'postgresql':
+            return
+
+        tags = models.Subquery(
+            Tag.objects.filter(
+                articles=models.OuterRef('pk')
+            ).values('articles').annotate(
+                text=StringAgg('tag', ' ')
+            ).values('text'))
+
+        vector = None
+        for field, weight in Article.SEARCH_WEIGHTS:
+            source = Coalesce(tags, models.Value('')) if field == 'tags' else field
+            part = SearchVector(
+                source, weight=weight, config=settings.ARTICLE_SEARCH_CONFIG)
+            vector = part if vector is None else vector + part
+
+        self.update(search_vector=vector)
+
+    def feed(self, profile):
+        """
+        Articles written by the profiles `profile` follows, newest first by
+        their `published_at` annotation.
+
+        Articles that were fanned out are paged straight from the reader's
+        `FeedEntry` timeline, along its (owner, created_at) index. The
+        others, written by authors with too many followers to fan out to or
+        not fanned out yet, are read from the followed authors instead,
+        which only the readers of such articles pay for.
+        """
+        followed = Profile.follows.through.objects.filter(
+            from_profile=profile).values('to_profile_id')
+        pulled = models.Q(fanned_out=False, author_id__in=followed)
+        if not self.filter(pulled).exists():
+            return self.filter(feed_entries__owner=profile).annotate(
+                published_at=models.F('feed_entries__created_at'),
+            ).order_by('-published_at', '-id')
+
+        in_timeline = models.Exists(FeedEntry.objects.filter(
+            owner=profile, article_id=models.OuterRef('pk')))
+        return self.filter(in_timeline | pulled).annotate(
+            published_at=models.F('created_at'),
+        ).order_by('-published_at', '-id')
+
+    def fan_out(self):
+        """
+        `Article.fan_out` for many articles, such as bulk inserted ones,
+        with one pass over the followers of each of their authors.
+        """
+        pending = self.filter(fanned_out=False)
+        authors = Profile.objects.filter(
+            pk__in=pending.values('author_id'),
+            followers_count__lte=settings.FEED_FANOUT_THRESHOLD,
+        ).values_list('pk', flat=True)
+        for author in authors:
+            articles = list(pending.filter(author_id=author).order_by(
+            ).values_list('pk', 'created_at'))
+            followers = Profile.follows.through.objects.filter(
+                to_profile_id=author).values_list('from_profile_id', flat=True)
+            with transaction.atomic():
+                FeedEntry.objects.bulk_create(
+                    (FeedEntry(owner_id=follower, article_id=article,
+                               created_at=created_at)
+                     for follower in followers.iterator()
+                     for article, created_at in articles),
+                    batch_size=1000, ignore_conflicts=True)
+                Article.objects.filter(
+                    pk__in=[article for article, _ in articles]
+                ).update(fanned_out=True)
+
+
 class Article(TimeModel):
     """ This class represents the Article model """
     slug = models.SlugField(db_index=True, max_length=255, unique=True)
@@ -24,22 +221,379 @@ class Article(TimeModel):
         User, related_name="dislikes", blank=True)
     tags = models.ManyToManyField('articles.Tag', related_name='articles')
 
+    # Denormalized sizes of the likes, dislikes and `users_favorites`
+    # relations so that reads never have to count the join tables. They are
+    # only ever changed through `update_counters` and can be rebuilt with
+    # the `rebuild_article_counters` management command.
+    likes_count = models.IntegerField(default=0)
+    dislikes_count = models.IntegerField(default=0)
+    favorites_count = models.IntegerField(default=0)
+
+    # Running aggregate of the article's `Rate` rows, maintained by
+    # `record_rating` in the same transaction as the rating itself.
+    rating_sum = models.IntegerField(default=0)
+    rating_count = models.IntegerField(default=0)
+    average_rating = models.FloatField(db_index=True, null=True)
+
+    # Weighted full-text document of the article, only maintained on
+    # PostgreSQL where migration 0008 also puts a GIN index on it.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # Whether the article was copied into its author's followers' feeds
+    # when published, see `fan_out`.
+    fanned_out = models.BooleanField(default=False, editable=False)
+
+    # The columns folded into `search_vector` and their weight labels.
+    SEARCH_WEIGHTS = (
+        ('title', 'A'),
+        ('description', 'B'),
+        ('tags', 'B'),
+        ('body', 'C'),
+    )
+    # The article's own columns among them.
+    INDEXED_FIELDS = ('title', 'description', 'body')
+
+    objects = ArticleQuerySet.as_manager()
+
+    # The values the detail representation's validators are built from,
+    # everything but the viewer's `favorited` flag.
+    VALIDATOR_FIELDS = (
+        'pk', 'updated_at', 'likes_count', 'dislikes_count',
+        'favorites_count', 'rating_count', 'rating_sum', 'author__updated_at',
+        'author__following_count', 'author__followers_count',
+        'author__user__username', 'author__user__email', 'author_id',
+    )
+
+    # Per-viewer annotations of `ArticleQuerySet.with_viewer_flags`, and
+    # the `ArticleSerializer` fields showing them.
+    VIEWER_FLAGS = ('is_favorited', 'is_liked', 'is_disliked')
+    VIEWER_FLAG_FIELDS = ('favorited', 'liked', 'disliked')
+
+    # Columns only loaded when their serializer field is selected.
+    TEXT_FIELDS = ('title', 'description', 'body', 'image_url')
+
+    # The relation and the counter behind each reaction to an article.
+    REACTIONS = {
+        'like': ('likes', 'likes_count'),
+        'dislike': ('dislikes', 'dislikes_count'),
+    }
+
+    class Meta(TimeModel.Meta):
+        indexes = [
+            # Serves the keyset pagination of article lists.
+            models.Index(fields=['-created_at', '-id']),
+            # Finds the articles feeds read from their authors, see
+            # `ArticleQuerySet.feed`.
+            models.Index(
+                fields=['author'], condition=models.Q(fanned_out=False),
+                name='article_not_fanned_out_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        article = super().from_db(db, field_names, values)
+        # Remember the stored text so that saving can tell whether the slug
+        # and the search vector have to follow it without querying the row
+        # again.
+        article._saved_text = {
+            name: getattr(article, name)
+            for name in cls.INDEXED_FIELDS if name in field_names
+        }
+        return article
+
+    def text_changed(self, update_fields=None):
+        """
+        Whether saving writes a title, description or body other than the
+        stored one. Articles not loaded from the database count as changed.
+        """
+        try:
+            saved = self._saved_text
+        except AttributeError:
+            return True
+        for name in self.INDEXED_FIELDS:
+            if update_fields is not None and name not in update_fields:
+                continue
+            if name not in self.__dict__:
+                # Deferred fields that were never set are not written.
+                continue
+            if name not in saved or saved[name] != self.__dict__[name]:
+                return True
+        return False
+
+    def remember_saved_text(self, update_fields=None):
+        """ Record the text fields just written as the stored ones. """
+        saved = self.__dict__.setdefault('_saved_text', {})
+        for name in self.INDEXED_FIELDS:
+            if name in self.__dict__ and (
+                    update_fields is None or name in update_fields):
+                saved[name] = self.__dict__[name]
+
+    def validator_state(self):
+        """ The values of `VALIDATOR_FIELDS` for this loaded article. """
+        author = self.author
+        return (
+            self.pk, self.updated_at, self.likes_count, self.dislikes_count,
+            self.favorites_count, self.rating_count, self.rating_sum,
+            author.updated_at, author.following_count, author.followers_count,
+            author.user.username, author.user.email, self.author_id,
+        )
+
+    def update_counters(self, **deltas):
+        """ Atomically shift the stored counters by the given amounts. """
+        Article.objects.filter(pk=self.pk).update(**{
+            name: models.F(name) + delta for name, delta in deltas.items()
+        })
+        self.refresh_from_db(fields=list(deltas))
+        # Neither the update nor the writes to the auto-created through
+        # tables behind the counters send `post_save`.
+        expire_version(article_version(self.pk))
+
+    def record_rating(self, ratings, previous=None):
+        """
+        Fold a new rating, or a change from `previous`, into the stored
+        rating aggregate.
+        """
+        added = ratings - (previous or 0)
+        counted = 0 if previous is not None else 1
+        rating_sum = models.F('rating_sum') + added
+        rating_count = models.F('rating_count') + counted
+
+        Article.objects.filter(pk=self.pk).update(
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            average_rating=models.ExpressionWrapper(
+                Cast(rating_sum, models.FloatField()) / rating_count,
+                output_field=models.FloatField()),
+        )
+        self.refresh_from_db(
+            fields=['rating_sum', 'rating_count', 'average_rating'])
+        expire_version(article_version(self.pk))
+
+    def fan_out(self):
+        """
+        Push the article into the feed of every follower of its author.
+
+        Authors with more than `FEED_FANOUT_THRESHOLD` followers are skipped
+        and their articles are merged into feeds when they are read.
+        """
+        followers_count = Profile.objects.filter(
+            pk=self.author_id).values_list('followers_count', flat=True).get()
+        if followers_count > settings.FEED_FANOUT_THRESHOLD:
+            return
+
+        followers = Profile.follows.through.objects.filter(
+            to_profile_id=self.author_id).values_list('from_profile_id', flat=True)
+        with transaction.atomic():
+            FeedEntry.objects.bulk_create(
+                (FeedEntry(owner_id=follower, article=self,
+                           created_at=self.created_at)
+                 for follower in followers.iterator()),
+                batch_size=1000, ignore_conflicts=True)
+            Article.objects.filter(pk=self.pk).update(fanned_out=True)
+        self.fanned_out = True
+
+    def react(self, user, reaction, active=True):
+        """
+        Give the article the user's `reaction`, 'like' or 'dislike',
+        replacing any other reaction, or take it back when `active` is
+        False, and return the reaction left in place, if any.
+
+        The user's reactions are read in the same query that locks the
+        article row, so concurrent clicks on the article are applied one
+        after the other, and only the statements that change something
+        are run: repeating a reaction writes nothing.
+        """
+        counters = [counter for _, counter in self.REACTIONS.values()]
+        with transaction.atomic():
+            state = Article.objects.select_for_update().filter(
+                pk=self.pk
+            ).annotate(**{
+                name: models.Exists(getattr(Article, relation).through.objects.filter(
+                    article=models.OuterRef('pk'), user=user))
+                for name, (relation, _) in self.REACTIONS.items()
+            }).values(*self.REACTIONS, *counters).get()
+
+            deltas = {}
+            for name, (relation, counter) in self.REACTIONS.items():
+                wanted = name == reaction if active else (
+                    state[name] and name != reaction)
+                if wanted == state[name]:
+                    continue
+                through = getattr(Article, relation).through
+                if wanted:
+                    through.objects.create(article=self, user=user)
+                else:
+                    through.objects.filter(article=self, user=user).delete()
+                deltas[counter] = 1 if wanted else -1
+                state[name] = wanted
+
+            if deltas:
+                Article.objects.filter(pk=self.pk).update(**{
+                    counter: models.F(counter) + delta
+                    for counter, delta in deltas.items()
+                })
+                expire_version(article_version(self.pk))
+        for counter in counters:
+            setattr(self, counter, state[counter] + deltas.get(counter, 0))
+
+        return next((name for name in self.REACTIONS if state[name]), None)
+
+    def like(self, user):
+        """ Like the article, dropping any dislike from the same user. """
+        return self.react(user, 'like')
+
+    def dislike(self, user):
+        """ Dislike the article, dropping any like from the same user. """
+        return self.react(user, 'dislike')
+
 @receiver(pre_save, sender=Article)
-def add_slug_to_article_if_not_exists(sender, instance, *args, **kwargs):
+def add_slug_to_article_if_not_exists(sender, instance, update_fields=None,
+                                      *args, **kwargs):
     """ create a signal to add slug field if None exists. """
-    slug = generate_slug(instance.title)
-    if instance and not instance.slug:
-        instance.slug = slug
+    if update_fields is not None and 'title' not in update_fields:
+        return
+    if 'title' not in instance.__dict__:
+        # A deferred title has not been changed.
+        return
+
+    if not instance.slug:
+        instance.slug = generate_slug(instance.title)
+    elif not instance._state.adding:
+        try:
+            saved_title = instance._saved_text['title']
+        except (AttributeError, KeyError):
+            # Only articles built by hand for an existing row, or loaded
+            # without their title, get here.
+            saved_title = Article.objects.filter(
+                pk=instance.pk).values_list('title', flat=True).first()
+        if saved_title != instance.title:
+            instance.slug = generate_slug(instance.title)
+
+@receiver(post_save, sender=Article)
+def update_article_search_vector(sender, instance, created, raw=False,
+                                 update_fields=None, **kwargs):
+    """ create a signal to keep the search vector in step with the text. """
+    if raw:
+        return
+    if created or instance.text_changed(update_fields):
+        Article.objects.filter(pk=instance.pk).update_search_vectors()
+    instance.remember_saved_text(update_fields)
+
+@receiver(post_save, sender=Article)
+def fan_out_new_article(sender, instance, created, raw=False, **kwargs):
+    """
+    create a signal to deliver new articles to their readers' feeds, once
+    the article is committed. Feeds read it from its author until then.
+    """
+    if created and not raw:
+        transaction.on_commit(instance.fan_out)
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def update_tagged_article_search_vector(sender, instance, action, reverse,
+                                        pk_set, **kwargs):
+    """ create a signal to reindex articles whose tags changed. """
+    if reverse and action == 'pre_clear':
+        # The tag's articles are gone by the time `post_clear` is sent.
+        instance._cleared_article_ids = list(
+            instance.articles.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        pk_set = [instance.pk]
+    elif action == 'post_clear':
+        pk_set = instance.__dict__.pop('_cleared_article_ids', [])
+    Article.objects.filter(pk__in=pk_set).update_search_vectors()
+
+class FeedEntry(models.Model):
+    """ An article delivered to a reader's feed by `Article.fan_out`. """
+    owner = models.ForeignKey(
+        'profiles.Profile', related_name='feed_entries', on_delete=models.CASCADE)
+    article = models.ForeignKey(
+        Article, related_name='feed_entries', on_delete=models.CASCADE)
+    # The article's `created_at`, copied so that feeds are paged from this
+    # table alone.
+    created_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('owner', 'article')
+        indexes = [
+            models.Index(fields=['owner', '-created_at', '-article']),
+        ]
+
+@receiver(m2m_changed, sender=Profile.follows.through)
+def update_feed_on_follow(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    create a signal to backfill a feed with the latest articles of a newly
+    followed author, and to empty it of the articles of unfollowed ones.
+    """
+    if reverse or action not in ('post_add', 'post_remove'):
         return
 
-    article = Article.objects.get(slug = instance.slug)
-    if article.title != instance.title:
-        instance.slug = slug
+    if action == 'post_remove':
+        FeedEntry.objects.filter(
+            owner=instance, article__author_id__in=pk_set).delete()
         return
 
+    entries = []
+    for author_id in pk_set:
+        articles = Article.objects.filter(
+            author_id=author_id, fanned_out=True
+        ).order_by('-created_at', '-id').values_list('pk', 'created_at')
+        entries.extend(
+            FeedEntry(owner=instance, article_id=article, created_at=created_at)
+            for article, created_at in articles[:settings.FEED_BACKFILL_SIZE])
+    FeedEntry.objects.bulk_create(entries, ignore_conflicts=True)
+
+class CommentQuerySet(models.QuerySet):
+
+    def with_authors(self):
+        return self.prefetch_related(author_prefetch())
+
+    def attach_threads(self, roots, max_depth=None):
+        """
+        Load the replies below `roots` with a single query and attach them
+        as `replies` lists, nested at most `max_depth` levels deep.
+
+        Replies are found through their materialized `path`, so the whole
+        forest comes back in one round trip whatever its shape.
+        """
+        if max_depth is None:
+            max_depth = settings.COMMENT_THREAD_MAX_DEPTH
+
+        roots = list(roots)
+        replies = list(self.below(
+            [(root.pk, root.path, root.depth) for root in roots],
+            max_depth)) if roots else []
+
+        children = defaultdict(list)
+        for reply in replies:
+            children[reply.parent_id].append(reply)
+        for comment in roots + replies:
+            comment.replies = children[comment.pk]
+
+        return roots
+
+    def below(self, roots, max_depth=None):
+        """
+        Filter the replies at most `max_depth` levels below `roots`, given
+        as (pk, path, depth) triples so that `.values()` rows can be used.
+        """
+        if max_depth is None:
+            max_depth = settings.COMMENT_THREAD_MAX_DEPTH
+
+        descendants = models.Q(pk__in=[])
+        for pk, path, depth in roots:
+            descendants |= models.Q(
+                path__startswith=Comment.make_descendant_path(path, pk),
+                depth__lte=depth + max_depth)
+        return self.filter(descendants)
+
+
 class Comment(TimeModel):
     """ Model to represent a Comment. """
     body = models.TextField()
@@ -56,6 +610,42 @@ class Comment(TimeModel):
         'self', null=True, blank=False, on_delete=models.CASCADE, related_name='thread'
     )
 
+    # Materialized path of the comment's ancestors, root first, e.g.
+    # '0000000007/0000000042/' for a reply to comment 42 which itself
+    # replies to comment 7. Top level comments have an empty path.
+    PATH_MAX_LENGTH = 1024
+    path = models.CharField(
+        db_index=True, max_length=PATH_MAX_LENGTH, blank=True, default='',
+        editable=False)
+    depth = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = CommentQuerySet.as_manager()
+
+    # The deepest reply whose ancestors all fit in `path`.
+    MAX_DEPTH = PATH_MAX_LENGTH // len('{:010d}/'.format(0))
+
+    class Meta(TimeModel.Meta):
+        indexes = [
+            # Serves the keyset pagination of an article's comments.
+            models.Index(fields=['article', '-created_at', '-id']),
+        ]
+
+    @property
+    def descendant_path(self):
+        """ The path prefix shared by every reply below this comment. """
+        return self.make_descendant_path(self.path, self.pk)
+
+    @staticmethod
+    def make_descendant_path(path, pk):
+        return '{}{:010d}/'.format(path, pk)
+
+@receiver(pre_save, sender=Comment)
+def add_path_to_comment(sender, instance, *args, **kwargs):
+    """ create a signal to place new comments below their parent. """
+    if instance.parent_id and not instance.path:
+        instance.path = instance.parent.descendant_path
+        instance.depth = instance.parent.depth + 1
+
 class Rate(models.Model):
     """Ratings model."""
     ratings = models.IntegerField(null=False)
@@ -64,6 +654,14 @@ class Rate(models.Model):
             related_name="rate")
     rater = models.ForeignKey(Profile, on_delete=models.CASCADE)
 
+    class Meta:
+        constraints = [
+            # One rating per reader, so that only its first insert is
+            # folded into the article's rating aggregate.
+            models.UniqueConstraint(
+                fields=['article', 'rater'], name='unique_article_rater'),
+        ]
+
 @receiver(pre_save, sender=Rate)
 def add_one_to_counter(sender, instance, *args, **kwargs):
     """ create a signal to add counter value by one. """
@@ -77,5 +675,87 @@ class Tag(TimeModel):
     tag = models.CharField(max_length=255)
     slug = models.SlugField(db_index=True, unique=True)
 
+    # Number of articles carrying the tag, kept in step with the tagging
+    # by `count_tagged_articles` and `uncount_deleted_article`.
+    articles_count = models.IntegerField(default=0)
+
     def __str__(self):
         return '{}'.format(self.tag)
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def bump_tags_version(sender, *args, **kwargs):
+    """ create a signal to expire the cached validators of the tag list. """
+    expire_version('tags')
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def count_tagged_articles(sender, instance, action, reverse, pk_set, **kwargs):
+    """ create a signal to count the articles tags are added to or removed from. """
+    if action == 'pre_clear':
+        # The cleared side of the relation is not sent with `post_clear`.
+        related = instance.articles if reverse else instance.tags
+        instance._cleared_tagging = list(related.values_list('pk', flat=True))
+        return
+    if action == 'pre_remove':
+        # `post_remove` gets every id passed to `remove()`, tagged or not,
+        # so the taggings about to go are read, and locked, beforehand.
+        related = instance.articles if reverse else instance.tags
+        instance._removed_tagging = list(related.filter(
+            pk__in=pk_set).select_for_update().values_list('pk', flat=True))
+        return
+    if action == 'post_clear':
+        pk_set = instance.__dict__.pop('_cleared_tagging', [])
+    if action == 'post_remove':
+        pk_set = instance.__dict__.pop('_removed_tagging', pk_set)
+    if action not in ('post_add', 'post_remove', 'post_clear') or not pk_set:
+        return
+
+    delta = 1 if action == 'post_add' else -1
+    if reverse:
+        Tag.objects.filter(pk=instance.pk).update(
+            articles_count=models.F('articles_count') + delta * len(pk_set))
+    else:
+        Tag.objects.filter(pk__in=pk_set).update(
+            articles_count=models.F('articles_count') + delta)
+    expire_version('tags')
+
+@receiver(pre_delete, sender=Article)
+def uncount_deleted_article(sender, instance, *args, **kwargs):
+    """ create a signal to uncount the tags of a deleted article. """
+    # The cascade deletes the tagging without sending `m2m_changed`.
+    if Tag.objects.filter(articles=instance).update(
+            articles_count=models.F('articles_count') - 1):
+        expire_version('tags')
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def expire_article(sender, instance, *args, **kwargs):
+    """ create a signal to expire what is cached about a changed article. """
+    expire_version(article_version(instance.pk))
+
+@receiver(post_save, sender=Rate)
+@receiver(post_delete, sender=Rate)
+def expire_rated_article(sender, instance, *args, **kwargs):
+    """ create a signal to expire an article when its ratings change. """
+    expire_version(article_version(instance.article_id))
+
+@receiver(m2m_changed, sender=Article.tags.through)
+@receiver(m2m_changed, sender=Article.likes.through)
+@receiver(m2m_changed, sender=Article.dislikes.through)
+@receiver(m2m_changed, sender=Profile.favorites.through)
+def expire_articles_of_relation(sender, instance, action, pk_set, **kwargs):
+    """ create a signal to expire articles whose many-to-many relations change. """
+    if isinstance(instance, Article):
+        if action.startswith('post_'):
+            expire_version(article_version(instance.pk))
+        return
+
+    # The other side of the relation changed, e.g. `user.likes.add(...)`.
+    if action == 'pre_clear':
+        pk_set = sender.objects.filter(**{
+            '{}_id'.format(instance._meta.model_name): instance.pk
+        }).values_list('article_id', flat=True)
+    elif action not in ('post_add', 'post_remove'):
+        return
+    for pk in pk_set:
+        expire_version(article_version(pk))
@@ -26,6 +26,11 @@ class CommentJSONRenderer(AuthorsJSONRenderer):
     object_label = "comment"
     object_label_plural = 'comments'
 
+class LikesJSONRenderer(AuthorsJSONRenderer):
+    """ renders the profiles that liked an article """
+    object_label = "likes"
+    object_label_plural = "likes"
+
 class FavoriteJSONRenderer(AuthorsJSONRenderer):
     charset = 'utf-8'
     object_label = "favorite"
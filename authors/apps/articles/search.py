@@ -0,0 +1,145 @@
+"""
+Ranked full-text search over articles.
+
+On PostgreSQL articles are matched against their stored `search_vector`
+through a GIN index, ordered by `ts_rank` and highlighted with
+`ts_headline`. Other databases fall back to case-insensitive substring
+matching with a rank weighted like the vector, which keeps the feature
+usable, if slow, under the SQLite test database.
+
+Highlights are HTML: the article text in them is escaped, leaving the
+highlight tags as the only markup.
+"""
+import re
+
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchHeadline, SearchQuery, SearchRank)
+from django.db import connections
+from django.db.models import (
+    Case, Exists, F, FloatField, OuterRef, Q, Value, When)
+from django.utils.html import escape
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Article, Tag
+
+# Ranking weights of the columns in the fallback, mirroring the weights
+# PostgreSQL gives to the labels of `Article.SEARCH_WEIGHTS`.
+LABEL_WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+
+HIGHLIGHT_START = '<b>'
+HIGHLIGHT_STOP = '</b>'
+# `ts_headline` marks matches with these private use characters, which
+# survive escaping and are swapped for the highlight tags afterwards.
+HEADLINE_START = '\ue000'
+HEADLINE_STOP = '\ue001'
+HEADLINE_WORDS = 35
+MAX_TERMS = 10
+
+
+def search_terms(text):
+    """ Split a query into at most `MAX_TERMS` distinct words. """
+    terms = []
+    for term in (text or '').split():
+        if term.lower() not in (known.lower() for known in terms):
+            terms.append(term)
+    return terms[:MAX_TERMS]
+
+
+def highlight(text, terms, max_words=None):
+    """
+    Wrap every occurrence of `terms` in `text` like `ts_headline` does,
+    cutting the text down to `max_words` words around the first match.
+    The rest of the text is HTML escaped.
+    """
+    if not terms:
+        return escape(text)
+    pattern = re.compile(
+        '|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+
+    if max_words is not None:
+        words = text.split()
+        if len(words) > max_words:
+            first = next(
+                (index for index, word in enumerate(words)
+                 if pattern.search(word)), 0)
+            start = max(min(first - max_words // 2, len(words) - max_words), 0)
+            text = ' '.join(words[start:start + max_words])
+
+    parts, end = [], 0
+    for match in pattern.finditer(text):
+        parts.append(escape(text[end:match.start()]))
+        parts.append(HIGHLIGHT_START + escape(match.group(0)) + HIGHLIGHT_STOP)
+        end = match.end()
+    parts.append(escape(text[end:]))
+    return ''.join(parts)
+
+
+def escape_headline(headline):
+    """ HTML escape a `ts_headline` made with the `HEADLINE_*` markers. """
+    if headline is None:
+        return None
+    return escape(headline).replace(
+        HEADLINE_START, HIGHLIGHT_START).replace(HEADLINE_STOP, HIGHLIGHT_STOP)
+
+
+class RankedSearchFilter(BaseFilterBackend):
+    """
+    Filter articles matching the `q` query parameter, most relevant first.
+
+    Matching articles are annotated with `search_rank`, and on PostgreSQL
+    with the `title_headline` and `body_headline` highlights unless the
+    view's field selection leaves `highlight` out. They are ordered by
+    rank so that `KeysetPagination` can page through them.
+    """
+    search_param = 'q'
+
+    def filter_queryset(self, request, queryset, view):
+        terms = search_terms(request.query_params.get(self.search_param))
+        if not terms:
+            return queryset
+
+        if connections[queryset.db].vendor == 'postgresql':
+            selection = getattr(view, 'selection', None)
+            queryset = self.search_postgresql(
+                queryset, ' '.join(terms),
+                headlines=selection is None or selection.wants('highlight'))
+        else:
+            queryset = self.search_fallback(queryset, terms)
+        return queryset.order_by('-search_rank', '-id')
+
+    def search_postgresql(self, queryset, text, headlines=True):
+        config = settings.ARTICLE_SEARCH_CONFIG
+        query = SearchQuery(text, config=config, search_type='websearch')
+        queryset = queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F('search_vector'), query))
+        if not headlines:
+            return queryset
+        return queryset.annotate(
+            title_headline=SearchHeadline(
+                'title', query, config=config, highlight_all=True,
+                start_sel=HEADLINE_START, stop_sel=HEADLINE_STOP),
+            body_headline=SearchHeadline(
+                'body', query, config=config, max_words=HEADLINE_WORDS,
+                min_words=HEADLINE_WORDS // 2,
+                start_sel=HEADLINE_START, stop_sel=HEADLINE_STOP),
+        )
+
+    def search_fallback(self, queryset, terms):
+        rank = Value(0.0, output_field=FloatField())
+        for term in terms:
+            matches = {
+                'title': Q(title__icontains=term),
+                'description': Q(description__icontains=term),
+                'tags': Exists(Tag.objects.filter(
+                    articles=OuterRef('pk'), tag__icontains=term)),
+                'body': Q(body__icontains=term),
+            }
+            queryset = queryset.filter(
+                matches['tags'] | matches['title']
+                | matches['description'] | matches['body'])
+            for field, label in Article.SEARCH_WEIGHTS:
+                rank = rank + Case(
+                    When(matches[field], then=Value(LABEL_WEIGHTS[label])),
+                    default=Value(0.0), output_field=FloatField())
+        return queryset.annotate(search_rank=rank)
@@ -1,4 +1,7 @@
 import re
+from collections import defaultdict
+from datetime import datetime
+
 from django.contrib.auth import authenticate
 from django.core.validators import RegexValidator
 from django.contrib.auth.tokens import default_token_generator
@@ -6,21 +9,23 @@ from django.contrib.auth.tokens import default_token_generator
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 
+from authors.apps.core.compiled import CompiledSerializer
+from authors.apps.core.fields import SparseFieldsMixin
 from authors.apps.profiles.serializers import ProfileSerializer
 from .models import Article, Rate, Comment, Tag
+from .search import (
+    HEADLINE_WORDS, escape_headline, highlight, search_terms)
 from .utils import TagField
 
 
-class RecursiveSerializer(serializers.Serializer):
-    def to_representation(self, value):
-        serializer = self.parent.parent.__class__(value, context=self.context)
-        return serializer.data
-
-
-class ArticleSerializer(serializers.ModelSerializer):
+class ArticleSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer to map the Model format to Json format
     """
+    collapsed_fields = {
+        'author': serializers.CharField(
+            source='author.user.username', read_only=True),
+    }
     title = serializers.CharField(required=True)
     body = serializers.CharField(required=True)
     description = serializers.CharField(required=True)
@@ -29,13 +34,13 @@ class ArticleSerializer(serializers.ModelSerializer):
     created_at = serializers.DateTimeField(read_only=True)
     updated_at = serializers.DateTimeField(read_only=True)
     favorited = serializers.SerializerMethodField(method_name="is_favorited")
-    favoriteCount = serializers.SerializerMethodField(
-        method_name='get_favorite_count')
+    favoriteCount = serializers.IntegerField(
+        source='favorites_count', read_only=True)
     author = ProfileSerializer(read_only=True)
-    likes = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
-    dislikes = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
-    likes_count = serializers.SerializerMethodField()
-    dislikes_count = serializers.SerializerMethodField()
+    liked = serializers.SerializerMethodField(method_name="is_liked")
+    disliked = serializers.SerializerMethodField(method_name="is_disliked")
+    likes_count = serializers.IntegerField(read_only=True)
+    dislikes_count = serializers.IntegerField(read_only=True)
     average_rating = serializers.FloatField(required=False, read_only=True)
     tagList = TagField(many=True, required=False, source='tags')
 
@@ -43,13 +48,13 @@ class ArticleSerializer(serializers.ModelSerializer):
         model = Article
         fields = ['title', 'slug', 'body',
                   'description', 'image_url', 'created_at', 'updated_at',
-                  'author', 'likes', 'dislikes', 'average_rating',
+                  'author', 'liked', 'disliked', 'average_rating',
                   'likes_count', 'dislikes_count', 'favorited', 'favoriteCount', 'tagList',]
 
-    def get_favorite_count(self, instance):
-        return instance.users_favorites.count()
-
     def is_favorited(self, instance):
+        if hasattr(instance, 'is_favorited'):
+            return instance.is_favorited
+
         request = self.context.get('request')
         if not request:
             return False
@@ -59,19 +64,28 @@ class ArticleSerializer(serializers.ModelSerializer):
             return False
         return True
 
-    def get_likes_count(self, obj):
-        return obj.likes.count()
+    def is_liked(self, instance):
+        if hasattr(instance, 'is_liked'):
+            return instance.is_liked
+        return self.has_reacted(instance, Article.likes.through)
 
-    def get_dislikes_count(self, obj):
-        return obj.dislikes.count()
+    def is_disliked(self, instance):
+        if hasattr(instance, 'is_disliked'):
+            return instance.is_disliked
+        return self.has_reacted(instance, Article.dislikes.through)
+
+    def has_reacted(self, instance, through):
+        request = self.context.get('request')
+        if not request or not request.user.is_authenticated:
+            return False
+        return through.objects.filter(
+            article_id=instance.pk, user=request.user).exists()
 
     def create(self, validated_data):
         tags = validated_data.pop('tags', [])
 
         article = Article.objects.create(**validated_data)
-
-        for tag in tags:
-            article.tags.add(tag)
+        article.tags.add(*tags)
 
         return article
 
@@ -83,11 +97,57 @@ class ArticleSerializer(serializers.ModelSerializer):
 
         return data
 
-    def get_likes_count(self, obj):
-        return obj.likes.count()
 
-    def get_dislikes_count(self, obj):
-        return obj.dislikes.count()
+class ArticleSearchSerializer(ArticleSerializer):
+    """
+    Article serializer for ranked search results, adding the relevance
+    and the title and body with the matched words highlighted.
+    """
+    search_rank = serializers.FloatField(read_only=True)
+    highlight = serializers.SerializerMethodField()
+
+    class Meta(ArticleSerializer.Meta):
+        fields = ArticleSerializer.Meta.fields + ['search_rank', 'highlight']
+
+    def get_highlight(self, instance):
+        if hasattr(instance, 'title_headline'):
+            return {
+                'title': escape_headline(instance.title_headline),
+                'body': escape_headline(instance.body_headline),
+            }
+
+        terms = search_terms(self.context['request'].query_params.get('q'))
+        return {
+            'title': highlight(instance.title, terms),
+            'body': highlight(instance.body, terms, max_words=HEADLINE_WORDS),
+        }
+
+class CompiledArticleSerializer(CompiledSerializer):
+    """
+    `ArticleSerializer` for `.values()` rows of
+    `Article.objects.with_serializer_data()`, whose flags are annotated.
+    """
+    serializer_class = ArticleSerializer
+    column_fields = {
+        'favorited': ('is_favorited', None),
+        'liked': ('is_liked', None),
+        'disliked': ('is_disliked', None),
+    }
+    computed_fields = ('tagList',)
+
+    def compute_tagList(self, rows):
+        """ Load the tag names of every row with one query. """
+        # In the order the `tags` prefetch gets from `Tag.Meta.ordering`.
+        ordering = [
+            '-tag__' + name[1:] if name.startswith('-') else 'tag__' + name
+            for name in Tag._meta.ordering]
+        tags = defaultdict(list)
+        for article, tag in Article.tags.through.objects.filter(
+                article_id__in=[row['id'] for row in rows]).order_by(
+                    *ordering).values_list('article_id', 'tag__tag'):
+            tags[article].append(tag)
+        return lambda row: tags[row['id']]
+
 
 class CommentSerializer(serializers.ModelSerializer):
     """Handles serialization and deserialization of Comments objects."""
@@ -95,7 +155,8 @@ class CommentSerializer(serializers.ModelSerializer):
 
     createdAt = serializers.SerializerMethodField(method_name='get_created_at')
     updatedAt = serializers.SerializerMethodField(method_name='get_updated_at')
-    thread = RecursiveSerializer(many=True, read_only=True)
+    thread = serializers.SerializerMethodField()
+
     class Meta:
         model = Comment
         fields = (
@@ -111,9 +172,21 @@ class CommentSerializer(serializers.ModelSerializer):
         article = self.context['article']
         author = self.context['author']
         parent = self.context.get('parent', None)
-        return Comment.objects.create(
+        comment = Comment.objects.create(
             author=author, article=article, parent=parent, **validated_data
         )
+        comment.replies = []
+        return comment
+
+    def get_thread(self, instance):
+        """
+        Render the replies attached by `Comment.objects.attach_threads`,
+        reusing this serializer instead of building one per reply.
+        """
+        if not hasattr(instance, 'replies'):
+            Comment.objects.with_authors().attach_threads([instance])
+
+        return [self.to_representation(reply) for reply in instance.replies]
 
     def get_created_at(self, instance):
         """ return created_time """
@@ -124,6 +197,36 @@ class CommentSerializer(serializers.ModelSerializer):
         return instance.updated_at.isoformat()
 
 
+class CompiledCommentSerializer(CompiledSerializer):
+    """
+    `CommentSerializer` for `.values()` rows of top level comments, with
+    every reply below the page loaded by one more query.
+    """
+    serializer_class = CommentSerializer
+    column_fields = {
+        'createdAt': ('created_at', datetime.isoformat),
+        'updatedAt': ('updated_at', datetime.isoformat),
+    }
+    computed_fields = ('thread',)
+    extra_columns = ('id', 'parent_id', 'path', 'depth')
+
+    def compute_thread(self, rows):
+        replies = Comment.objects.below(
+            [(row['id'], row['path'], row['depth']) for row in rows]
+        ).values(*self.columns) if rows else []
+
+        children = defaultdict(list)
+        for reply in replies:
+            children[reply['parent_id']].append(reply)
+
+        def thread(row):
+            return [self.build(self.plan, reply, computed)
+                    for reply in children[row['id']]]
+
+        computed = {'thread': thread}
+        return thread
+
+
 class RateSerializer(serializers.Serializer):
     """Serializers registration requests and creates a new rate."""
 
@@ -147,7 +250,4 @@ class TagSerializer(serializers.ModelSerializer):
     """
     class Meta:
         model = Tag
-        fields = ('tag',)
-
-    def to_representation(self, obj):
-        return obj.tag
\ No newline at end of file
+        fields = ('tag', 'articles_count')
\ No newline at end of file
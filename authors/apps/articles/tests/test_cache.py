@@ -0,0 +1,123 @@
+from django.core.cache import caches
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase, APIClient
+
+from authors.apps.articles.models import Article, Rate, Tag
+from .utils import create_user
+
+
+class ArticleCacheTestMixin:
+    """
+    Test the cache of article detail payloads
+    """
+
+    def setUp(self):
+        caches['default'].clear()
+        self.author = create_user("author", "author@mail.com")
+        self.reader = create_user("reader", "reader@mail.com")
+        self.article = Article.objects.create(
+            title="Cached", description="description", body="body",
+            author=self.author.profile)
+        self.url = '/api/articles/{}/'.format(self.article.slug)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.reader)
+
+    def get(self, client=None):
+        response = (client or self.client).get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def count_queries(self, client):
+        with CaptureQueriesContext(connection) as context:
+            client.get(self.url)
+        return len(context.captured_queries)
+
+    def test_cached_article_needs_no_queries(self):
+        """ Anonymous reads of a cached article should not hit the database. """
+        client = APIClient()
+        self.get(client)
+
+        self.assertEqual(self.count_queries(client), 0)
+        self.assertEqual(self.count_queries(self.client), 1)
+
+    def test_favorited_is_spliced_per_viewer(self):
+        """ Viewers sharing the cached payload keep their own flag. """
+        self.reader.profile.favorite(self.article)
+        other = APIClient()
+        other.force_authenticate(user=self.author)
+
+        self.assertTrue(self.get()['favorited'])
+        self.assertFalse(self.get(other)['favorited'])
+        self.assertTrue(self.get()['favorited'])
+
+    def test_reactions_and_ratings_expire_the_payload(self):
+        """ Likes, favorites and ratings should show up at once. """
+        self.get()
+        self.article.like(self.reader)
+        self.assertEqual(self.get()['likes_count'], 1)
+
+        self.author.profile.favorite(self.article)
+        self.assertEqual(self.get()['favoriteCount'], 1)
+
+        Rate.objects.create(article=self.article, rater=self.reader.profile, ratings=4)
+        self.article.record_rating(4)
+        self.assertEqual(self.get()['average_rating'], 4)
+
+    def test_edits_expire_the_payload(self):
+        """ Article, tag and author changes should show up at once. """
+        self.get()
+        self.article.body = "edited"
+        self.article.save()
+        self.assertEqual(self.get()['body'], "edited")
+
+        self.article.tags.add(Tag.objects.create(tag="fresh", slug="fresh"))
+        self.assertEqual(self.get()['tagList'], ["fresh"])
+
+        self.author.profile.bio = "new bio"
+        self.author.profile.save()
+        self.assertEqual(self.get()['author']['bio'], "new bio")
+
+        self.author.username = "renamed"
+        self.author.save()
+        self.assertEqual(self.get()['author']['username'], "renamed")
+
+        self.reader.profile.follow(self.author.profile)
+        self.assertEqual(self.get()['author']['followers'], 1)
+
+    def test_retitled_article_leaves_old_slug(self):
+        """ The payload cached under an old slug should not be served. """
+        self.get()
+        self.article.title = "Retitled"
+        self.article.save()
+
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+# The tests run in one process, which shares even a local-memory cache.
+@override_settings(SHARED_CACHE=True)
+class LocalArticleCacheTestCase(ArticleCacheTestMixin, APITestCase):
+    pass
+
+
+@override_settings(CACHES={
+    'default': {
+        'BACKEND': 'authors.apps.core.tests.backends.DictCache',
+        'LOCATION': 'shared',
+    },
+}, SHARED_CACHE=True)
+class SharedArticleCacheTestCase(ArticleCacheTestMixin, APITestCase):
+    pass
+
+
+@override_settings(SHARED_CACHE=False)
+class UnsharedArticleCacheTestCase(ArticleCacheTestMixin, APITestCase):
+
+    def test_cached_article_needs_no_queries(self):
+        """ Without a shared cache every read goes to the database. """
+        client = APIClient()
+        self.get(client)
+
+        self.assertGreater(self.count_queries(client), 0)
+        self.assertIsNone(caches['default'].get('article-detail:' + self.article.slug))
@@ -4,8 +4,10 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 from rest_framework.test import APIClient
 
+from django.db import connection
 from django.urls import reverse
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
 from authors.apps.articles.models import Comment, Article
 
@@ -165,3 +167,79 @@ class CommentViews(APITestCase):
         url = reverse("articles:comments", kwargs={'article_slug':article.slug})
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def create_thread(self, article, depth, parent=None):
+        """ Create a chain of `depth` replies below `parent`. """
+        for level in range(depth):
+            parent = Comment.objects.create(
+                body="Level {}".format(level), author=self.user.profile,
+                article=article, parent=parent)
+        return parent
+
+    def test_comment_path_follows_parent(self):
+        """ Replies should record their ancestors in a materialized path. """
+        article = create_article()
+        leaf = self.create_thread(article, 3)
+        root = Comment.objects.get(parent=None)
+
+        self.assertEqual(leaf.depth, 2)
+        self.assertTrue(leaf.path.startswith(root.descendant_path))
+
+    def test_comment_threads_are_nested(self):
+        """ The comment list should render replies inside their parent. """
+        article = create_article()
+        self.create_thread(article, 3)
+
+        url = reverse("articles:comments", kwargs={'article_slug':article.slug})
+        response = self.client.get(url)
+        root = json.loads(response.content)["comment"]["results"][0]
+
+        self.assertEqual(root["body"], "Level 0")
+        self.assertEqual(root["thread"][0]["body"], "Level 1")
+        self.assertEqual(root["thread"][0]["thread"][0]["body"], "Level 2")
+        self.assertEqual(root["thread"][0]["thread"][0]["thread"], [])
+
+    def test_cannot_reply_below_the_deepest_comment(self):
+        """ Replies whose path would not fit should be refused. """
+        article = create_article()
+        leaf = self.create_thread(article, 2)
+        Comment.objects.filter(pk=leaf.pk).update(depth=Comment.MAX_DEPTH)
+        url = reverse(
+            "articles:comment",
+            kwargs={'article_slug':article.slug, "comment_pk":leaf.pk}
+        )
+
+        response = self.client.post(url, self.sub_comment, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Comment.objects.count(), 2)
+
+    @override_settings(COMMENT_THREAD_MAX_DEPTH=1)
+    def test_comment_threads_respect_depth_cap(self):
+        """ Replies below the configured depth should not be rendered. """
+        article = create_article()
+        self.create_thread(article, 3)
+
+        url = reverse("articles:comments", kwargs={'article_slug':article.slug})
+        response = self.client.get(url)
+        root = json.loads(response.content)["comment"]["results"][0]
+
+        self.assertEqual(root["thread"][0]["body"], "Level 1")
+        self.assertEqual(root["thread"][0]["thread"], [])
+
+    def test_comment_thread_query_count_is_constant(self):
+        """ Deeper threads should not need more queries. """
+        article = create_article()
+        url = reverse("articles:comments", kwargs={'article_slug':article.slug})
+        self.create_thread(article, 2)
+
+        with CaptureQueriesContext(connection) as shallow:
+            self.client.get(url)
+
+        self.create_thread(article, 6)
+        self.create_thread(article, 4, parent=Comment.objects.filter(
+            parent=None).last())
+
+        with CaptureQueriesContext(connection) as deep:
+            self.client.get(url)
+
+        self.assertEqual(len(shallow), len(deep))
@@ -0,0 +1,76 @@
+from unittest import mock
+
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from authors.apps.core.compiled import CompiledListMixin
+from authors.benchmarks import data
+
+
+class CompiledSerializerTestCase(APITestCase):
+    """
+    The compiled serializers must render lists byte for byte like the
+    DRF serializers they replace.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = data.generate(
+            users=5, articles=14, tags=6, follows=3, likes=4, ratings=2,
+            comments=3, depth=4, seed=7)
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.dataset.reader)
+
+    def assertSameContent(self, url, params=None, compiled=True):
+        with override_settings(COMPILED_SERIALIZERS=False):
+            expected = self.client.get(url, params)
+        with override_settings(COMPILED_SERIALIZERS=True), mock.patch.object(
+                CompiledListMixin, 'compiled_list', autospec=True,
+                side_effect=CompiledListMixin.compiled_list) as compiled_list:
+            response = self.client.get(url, params)
+
+        self.assertEqual(expected.status_code, 200, expected.content)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(compiled_list.called, compiled)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response.get('Link'), expected.get('Link'))
+        return response
+
+    def test_article_lists(self):
+        self.assertSameContent('/api/articles/')
+        self.assertSameContent('/api/articles/', {'limit': 5})
+        self.assertSameContent('/api/articles/feed/')
+        self.assertSameContent('/api/articles', {'ordering': '-average_rating'})
+        self.assertSameContent('/api/articles', {'search': 'django'})
+
+    def test_article_pages(self):
+        """ Cursors built from rows should walk the same pages. """
+        url, params = '/api/articles/', {'limit': 4}
+        while url:
+            response = self.assertSameContent(url, params)
+            url, params = response.data['next'], None
+
+    def test_anonymous_article_list(self):
+        self.client.force_authenticate(user=None)
+        self.assertSameContent('/api/articles/')
+
+    def test_sparse_article_lists(self):
+        self.assertSameContent(
+            '/api/articles/', {'fields': 'slug,author.username,tagList'})
+        self.assertSameContent(
+            '/api/articles/', {'fields': 'title,author,liked', 'expand': ''})
+
+    def test_search_results_are_not_compiled(self):
+        self.assertSameContent('/api/articles', {'q': 'django'}, compiled=False)
+
+    def test_comment_threads(self):
+        for slug in self.dataset.slugs[:4]:
+            self.assertSameContent('/api/articles/{}/comments/'.format(slug))
+
+    def test_profile_lists(self):
+        for username in self.dataset.usernames[:3]:
+            self.assertSameContent('/api/profiles/{}/followers/'.format(username))
+            self.assertSameContent('/api/profiles/{}/following/'.format(username))
+        self.assertSameContent(
+            '/api/articles/{}/likes/'.format(self.dataset.slugs[0]))
@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework.test import APITestCase, APIClient
+
+from authors.apps.articles.models import Article, Tag
+from .utils import create_user
+
+
+class ArticleConditionalGetTestCase(APITestCase):
+    """
+    Test the ETag validator of article pages
+    """
+
+    def setUp(self):
+        self.reader = create_user("reader", "reader@mail.com")
+        self.author = create_user("author", "author@mail.com")
+        self.article = Article.objects.create(
+            title="Conditional", description="description", body="body",
+            author=self.author.profile)
+        self.url = '/api/articles/{}/'.format(self.article.slug)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.reader)
+
+    def get(self, **headers):
+        return self.client.get(self.url, **headers)
+
+    def test_article_has_validators(self):
+        """ The article page should send an ETag. """
+        response = self.get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'])
+        self.assertNotIn('Last-Modified', response)
+        self.assertIn('Authorization', response['Vary'])
+
+    def test_matching_etag_is_not_modified(self):
+        """ A current ETag should get an empty 304. """
+        etag = self.get()['ETag']
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+    def test_modified_since_is_not_trusted(self):
+        """ Counter changes keep `updated_at`, so dates cannot get a 304. """
+        self.article.like(self.author)
+        since = http_date(
+            (self.article.updated_at + timedelta(seconds=1)).timestamp())
+        response = self.get(HTTP_IF_MODIFIED_SINCE=since)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['likes_count'], 1)
+
+    def test_changes_give_a_new_etag(self):
+        """ Edits, reactions and favorites should all change the ETag. """
+        etags = [self.get()['ETag']]
+
+        self.article.like(self.author)
+        etags.append(self.get()['ETag'])
+        self.reader.profile.favorite(self.article)
+        etags.append(self.get()['ETag'])
+        self.article.record_rating(3)
+        etags.append(self.get()['ETag'])
+        self.article.body = "new body"
+        self.article.save()
+        etags.append(self.get()['ETag'])
+
+        self.assertEqual(len(set(etags)), len(etags))
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=etags[0]).status_code, 200)
+
+    def test_etag_depends_on_the_viewer(self):
+        """ Viewers seeing a different favorited flag get different ETags. """
+        self.reader.profile.favorite(self.article)
+        other = APIClient()
+        other.force_authenticate(user=self.author)
+
+        self.assertNotEqual(
+            self.get()['ETag'], other.get(self.url)['ETag'])
+
+    def test_missing_article(self):
+        """ Unknown slugs should still be not found. """
+        response = self.client.get('/api/articles/missing/')
+
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(SHARED_CACHE=True)
+class TagConditionalGetTestCase(APITestCase):
+    """
+    Test the version based ETag of the tag list
+    """
+
+    def test_tag_list_etag_follows_tag_changes(self):
+        """ The ETag should hold until a tag is added or removed. """
+        url = reverse("articles:tags")
+        etag = self.client.get(url)['ETag']
+
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        tag = Tag.objects.create(tag="new", slug="new")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data['tags'], [{'tag': 'new', 'articles_count': 0}])
+
+        tag.delete()
+        self.assertNotEqual(self.client.get(url)['ETag'], response['ETag'])
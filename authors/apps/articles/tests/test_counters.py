@@ -0,0 +1,71 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from rest_framework.test import APITestCase
+
+from authors.apps.articles.models import Article, Rate
+from .utils import create_user
+
+
+class ArticleCountersTestCase(APITestCase):
+    """ Tests for the denormalized counters and rating aggregate. """
+
+    def setUp(self):
+        self.author = create_user("author", "author@mail.com")
+        self.reader = create_user("reader", "reader@mail.com")
+        self.article = Article.objects.create(
+            title="Counted", description="description", body="body",
+            author=self.author.profile)
+
+    def test_like_and_dislike_move_counters(self):
+        """ Switching between like and dislike keeps both counters right. """
+        self.article.like(self.reader)
+        self.article.like(self.reader)
+        self.assertEqual(self.article.likes_count, 1)
+        self.assertEqual(self.article.dislikes_count, 0)
+
+        self.article.dislike(self.reader)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes_count, 0)
+        self.assertEqual(self.article.dislikes_count, 1)
+
+    def test_favorite_and_unfavorite_move_counter(self):
+        """ Repeated favorites are only counted once. """
+        self.reader.profile.favorite(self.article)
+        self.reader.profile.favorite(self.article)
+        self.assertEqual(self.article.favorites_count, 1)
+
+        self.reader.profile.unfavorite(self.article)
+        self.reader.profile.unfavorite(self.article)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.favorites_count, 0)
+
+    def test_rebuild_command_fixes_drift(self):
+        """ The management command recounts the join tables. """
+        self.article.likes.add(self.reader)
+        self.article.dislikes.add(self.author)
+        self.author.profile.favorites.add(self.article)
+        Rate.objects.create(
+            article=self.article, rater=self.reader.profile, ratings=3)
+        Rate.objects.create(
+            article=self.article, rater=self.author.profile, ratings=4)
+        Article.objects.update(
+            likes_count=9, dislikes_count=9, favorites_count=9,
+            rating_sum=9, rating_count=9, average_rating=9)
+
+        call_command('rebuild_article_counters', stdout=StringIO())
+
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes_count, 1)
+        self.assertEqual(self.article.dislikes_count, 1)
+        self.assertEqual(self.article.favorites_count, 1)
+        self.assertEqual(self.article.rating_sum, 7)
+        self.assertEqual(self.article.rating_count, 2)
+        self.assertEqual(self.article.average_rating, 3.5)
+
+    def test_rebuild_command_rejects_empty_batches(self):
+        """ A batch size below one would never get through the table. """
+        for size in ('0', '-5'):
+            with self.assertRaisesMessage(CommandError, '--batch-size'):
+                call_command('rebuild_article_counters', '--batch-size', size,
+                             stdout=StringIO())
@@ -0,0 +1,132 @@
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient, APITransactionTestCase
+
+from authors.apps.articles.models import Article, FeedEntry
+from .utils import create_user
+
+
+class FeedTestCase(APITransactionTestCase):
+    """
+    Test the feed of articles by followed authors, committing every write
+    so that articles are fanned out.
+    """
+
+    def setUp(self):
+        self.reader = create_user("reader", "reader@mail.com")
+        self.author = create_user("author", "author@mail.com")
+        self.stranger = create_user("stranger", "stranger@mail.com")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.reader)
+        self.url = reverse("articles:feed")
+
+    def write(self, user, title):
+        return Article.objects.create(
+            title=title, description="description", body="body",
+            author=user.profile)
+
+    def feed_titles(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [article['title'] for article in response.data['results']]
+
+    def test_feed_requires_authentication(self):
+        """ Anonymous users have no feed. """
+        response = APIClient().get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+    def test_feed_lists_followed_authors_newest_first(self):
+        """ Only articles by followed authors should show up. """
+        self.reader.profile.follow(self.author.profile)
+        self.write(self.author, "First")
+        self.write(self.stranger, "Elsewhere")
+        self.write(self.author, "Second")
+
+        self.assertEqual(self.feed_titles(), ["Second", "First"])
+
+    def test_new_articles_are_fanned_out(self):
+        """ Publishing should write the article into followers' feeds. """
+        self.reader.profile.follow(self.author.profile)
+        article = self.write(self.author, "Fresh")
+
+        self.assertTrue(article.fanned_out)
+        entry = FeedEntry.objects.get(owner=self.reader.profile, article=article)
+        self.assertEqual(entry.created_at, article.created_at)
+
+    def test_fan_out_waits_for_the_commit(self):
+        """ Feeds read articles from their author until they are fanned out. """
+        self.reader.profile.follow(self.author.profile)
+        with transaction.atomic():
+            article = self.write(self.author, "Pending")
+            self.assertFalse(FeedEntry.objects.exists())
+            self.assertEqual(
+                list(Article.objects.feed(self.reader.profile)), [article])
+
+        self.assertTrue(FeedEntry.objects.filter(article=article).exists())
+
+    @override_settings(FEED_FANOUT_THRESHOLD=1)
+    def test_popular_authors_are_merged_on_read(self):
+        """ Authors above the threshold are read without timeline entries. """
+        self.reader.profile.follow(self.author.profile)
+        self.stranger.profile.follow(self.author.profile)
+        article = self.write(self.author, "Popular")
+
+        self.assertFalse(article.fanned_out)
+        self.assertFalse(FeedEntry.objects.exists())
+        self.assertEqual(self.feed_titles(), ["Popular"])
+
+    def test_follow_backfills_and_unfollow_clears_the_feed(self):
+        """ Following fills the feed with earlier articles, unfollowing empties it. """
+        self.stranger.profile.follow(self.author.profile)
+        self.write(self.author, "Earlier")
+
+        self.reader.profile.follow(self.author.profile)
+        self.assertEqual(FeedEntry.objects.filter(
+            owner=self.reader.profile).count(), 1)
+        self.assertEqual(self.feed_titles(), ["Earlier"])
+
+        self.reader.profile.unfollow(self.author.profile)
+        self.assertFalse(FeedEntry.objects.filter(
+            owner=self.reader.profile).exists())
+        self.assertEqual(self.feed_titles(), [])
+
+    def test_feed_is_paginated_by_cursor(self):
+        """ The next link should continue where the page stopped. """
+        self.reader.profile.follow(self.author.profile)
+        for index in range(3):
+            self.write(self.author, "Article {}".format(index))
+
+        first = self.client.get(self.url, {'limit': 2}).data
+        second = self.client.get(first['next']).data
+
+        self.assertEqual(
+            [article['title'] for article in first['results'] + second['results']],
+            ["Article 2", "Article 1", "Article 0"])
+        self.assertIsNone(second['next'])
+
+    def test_timeline_is_paged_from_feed_entries(self):
+        """ Fanned out feeds should be read along the reader's entries. """
+        self.reader.profile.follow(self.author.profile)
+        self.write(self.author, "Fanned")
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(self.feed_titles(), ["Fanned"])
+
+        feed_query = next(
+            query['sql'] for query in context.captured_queries
+            if 'ORDER BY' in query['sql'] and 'articles_feedentry' in query['sql'])
+        self.assertIn('"articles_feedentry"."created_at" DESC', feed_query)
+
+    def test_feed_query_count_is_constant(self):
+        """ Reading the feed should not run more queries for more articles. """
+        self.reader.profile.follow(self.author.profile)
+        self.write(self.author, "One")
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.url)
+        for index in range(5):
+            self.write(self.author, "More {}".format(index))
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(self.url)
+
+        self.assertEqual(len(few), len(many))
@@ -0,0 +1,127 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from authors.apps.articles.models import Article, FeedEntry, Tag
+from .utils import create_user
+
+
+class ImportExportTestCase(TestCase):
+    """ Tests for the import_articles and export_articles commands. """
+
+    def setUp(self):
+        self.author = create_user("writer", "writer@mail.com")
+        directory = tempfile.mkdtemp()
+        self.path = os.path.join(directory, 'articles.ndjson')
+        self.addCleanup(os.rmdir, directory)
+        self.addCleanup(lambda: os.path.exists(self.path) and os.remove(self.path))
+
+    def write_rows(self, rows):
+        with open(self.path, 'w', encoding='utf-8') as output:
+            for row in rows:
+                output.write(json.dumps(row) + '\n')
+
+    def rows(self, count, offset=0):
+        return [{
+            'title': 'Imported {}'.format(index),
+            'description': 'description', 'body': 'body',
+            'author': 'writer',
+            'tagList': ['shared', 'tag{}'.format(index), 'Shared'],
+            'created_at': '2019-01-0{}T10:00:00+00:00'.format(index % 9 + 1),
+        } for index in range(offset, offset + count)]
+
+    def import_articles(self, *args):
+        stdout = StringIO()
+        call_command('import_articles', self.path, *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_import_creates_articles_with_tags_and_dates(self):
+        """ Imported rows should become complete articles. """
+        self.write_rows(self.rows(3))
+        output = self.import_articles()
+
+        self.assertIn('Imported 3 articles, skipped 0', output)
+        self.assertIn('rows/sec', output)
+        article = Article.objects.get(title='Imported 1')
+        self.assertTrue(article.slug.startswith('imported-1-'))
+        self.assertEqual(article.created_at.day, 2)
+        self.assertEqual(
+            sorted(tag.tag for tag in article.tags.all()), ['shared', 'tag1'])
+        self.assertEqual(Tag.objects.filter(slug='shared').count(), 1)
+
+    def test_import_query_count_does_not_grow_with_rows(self):
+        """ A batch should cost the same number of queries whatever its size. """
+        self.write_rows(self.rows(2))
+        with CaptureQueriesContext(connection) as few:
+            self.import_articles()
+
+        self.write_rows(self.rows(20, offset=2))
+        with CaptureQueriesContext(connection) as many:
+            self.import_articles()
+
+        self.assertEqual(len(few), len(many))
+
+    def test_import_skips_taken_slugs_and_unknown_authors(self):
+        """ Rows that would clash or have no author should be skipped. """
+        rows = self.rows(2)
+        rows[0]['slug'] = 'fixed-slug'
+        rows[1]['author'] = 'nobody'
+        self.write_rows(rows)
+        self.import_articles()
+
+        output = self.import_articles()
+        self.assertIn('Imported 0 articles, skipped 2', output)
+        self.assertEqual(Article.objects.count(), 1)
+
+    def test_import_stops_at_an_invalid_row(self):
+        """ Rows that cannot be inserted should be reported by line. """
+        for bad in ({'title': None}, {'title': ''},
+                    {'created_at': 'yesterday'}, {'created_at': '2019-13-01'}):
+            rows = self.rows(3)
+            rows[1].update(bad)
+            self.write_rows(rows)
+            with self.assertRaisesMessage(CommandError, 'Line 2:'):
+                self.import_articles()
+        self.assertFalse(Article.objects.exists())
+
+    def test_imported_articles_are_fanned_out(self):
+        """ Imported articles should reach the feeds of their followers. """
+        reader = create_user("reader", "reader@mail.com")
+        reader.profile.follow(self.author.profile)
+        self.write_rows(self.rows(2))
+        self.import_articles()
+
+        self.assertEqual(Article.objects.filter(fanned_out=False).count(), 0)
+        entries = FeedEntry.objects.filter(owner=reader.profile)
+        self.assertEqual(
+            sorted(entry.created_at.day for entry in entries), [1, 2])
+
+    def test_export_round_trips_through_import(self):
+        """ Exported articles should import back unchanged. """
+        self.write_rows(self.rows(3))
+        self.import_articles('--batch-size', '2')
+        before = {
+            article.slug: (article.title, article.created_at,
+                           sorted(tag.tag for tag in article.tags.all()))
+            for article in Article.objects.all()
+        }
+
+        stderr = StringIO()
+        call_command('export_articles', self.path, '--batch-size', '2',
+                     stderr=stderr)
+        self.assertIn('Exported 3 articles', stderr.getvalue())
+        Article.objects.all().delete()
+        self.import_articles()
+
+        after = {
+            article.slug: (article.title, article.created_at,
+                           sorted(tag.tag for tag in article.tags.all()))
+            for article in Article.objects.all()
+        }
+        self.assertEqual(after, before)
@@ -1,4 +1,6 @@
 import json
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
@@ -12,6 +14,7 @@ from authors.apps.authentication.utils import generate_token
 from rest_framework.test import force_authenticate
 from rest_framework.test import APIRequestFactory
 from authors.apps.articles.models import Article
+from .utils import create_user
 
 user = {
     "user": {
@@ -199,3 +202,133 @@ class ArticleCRUDTestCase(APITestCase):
                               )
 
         self.assertEquals(res.status_code, 200)
+
+
+class ReactionTestCase(APITestCase):
+    """ Tests for adding and taking back reactions to an article. """
+
+    def setUp(self):
+        self.author = create_user("author", "author@mail.com")
+        self.reader = create_user("reader", "reader@mail.com")
+        self.article = Article.objects.create(
+            title="Reacted", description="description", body="body",
+            author=self.author.profile)
+        self.client.force_authenticate(user=self.reader)
+
+    def react(self, method, reaction):
+        url = '/api/articles/{}/{}/'.format(self.article.slug, reaction)
+        response = getattr(self.client, method)(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_reaction_returns_counts_only(self):
+        """ Reacting should answer with the counts and the user's reaction. """
+        self.assertEqual(self.react('put', 'like'), {
+            'likes_count': 1, 'dislikes_count': 0,
+            'liked': True, 'disliked': False,
+        })
+        self.assertEqual(self.react('put', 'dislike'), {
+            'likes_count': 0, 'dislikes_count': 1,
+            'liked': False, 'disliked': True,
+        })
+
+    def test_repeated_reaction_writes_nothing(self):
+        """ Liking twice should only read the current reaction. """
+        self.react('put', 'like')
+        with CaptureQueriesContext(connection) as context:
+            data = self.react('put', 'like')
+
+        self.assertEqual(data['likes_count'], 1)
+        writes = [query['sql'] for query in context.captured_queries
+                  if not query['sql'].startswith(('SELECT', 'SAVEPOINT', 'RELEASE'))]
+        self.assertEqual(writes, [])
+
+    def test_delete_takes_back_only_that_reaction(self):
+        """ DELETE on like/ should leave a dislike in place. """
+        self.react('put', 'dislike')
+        self.assertEqual(self.react('delete', 'like')['dislikes_count'], 1)
+
+        data = self.react('delete', 'dislike')
+        self.assertEqual((data['dislikes_count'], data['disliked']), (0, False))
+        self.assertEqual(self.react('delete', 'dislike')['dislikes_count'], 0)
+        self.assertFalse(self.article.dislikes.exists())
+
+    def test_anonymous_users_cannot_react(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.put(
+            '/api/articles/{}/like/'.format(self.article.slug))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ArticleLikesTestCase(APITestCase):
+    """ Tests for the compact likes of an article and the list of likers. """
+
+    def setUp(self):
+        self.author = create_user("author", "author@mail.com")
+        self.article = Article.objects.create(
+            title="Liked", description="description", body="body",
+            author=self.author.profile)
+        self.url = '/api/articles/{}/'.format(self.article.slug)
+
+    def add_likers(self, count):
+        offset = self.article.likes.count()
+        likers = []
+        for index in range(offset, offset + count):
+            liker = create_user(
+                "liker{}".format(index), "liker{}@mail.com".format(index))
+            self.article.like(liker)
+            likers.append(liker)
+        return likers
+
+    def test_article_has_flags_instead_of_liker_ids(self):
+        """ Articles should carry the viewer's flags, not who liked them. """
+        (liker, ) = self.add_likers(1)
+        self.client.force_authenticate(user=liker)
+
+        for response in (self.client.get(self.url), self.client.get(self.url)):
+            article = response.data
+            self.assertNotIn('likes', article)
+            self.assertNotIn('dislikes', article)
+            self.assertEqual(article['likes_count'], 1)
+            self.assertTrue(article['liked'])
+            self.assertFalse(article['disliked'])
+
+        self.client.force_authenticate(user=self.author)
+        self.assertFalse(self.client.get(self.url).data['liked'])
+
+    def test_payload_does_not_grow_with_likes(self):
+        """ More likes should not make the article bigger. """
+        # Both counts have one digit.
+        self.add_likers(2)
+        few = len(self.client.get('/api/articles/').content)
+        self.add_likers(7)
+        many = len(self.client.get('/api/articles/').content)
+        self.assertEqual(few, many)
+
+    def test_likers_are_paginated(self):
+        """ The likers list should page through the profiles. """
+        likers = self.add_likers(3)
+        self.client.force_authenticate(user=self.author)
+        self.author.profile.follow(likers[0].profile)
+
+        response = self.client.get(self.url + 'likes/', {'limit': 2})
+        page = response.data
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [profile['username'] for profile in page['results']],
+            ['liker2', 'liker1'])
+        last = self.client.get(page['next']).data['results']
+        self.assertEqual([profile['username'] for profile in last], ['liker0'])
+        self.assertTrue(last[0]['following'])
+
+    def test_likers_of_missing_article(self):
+        self.client.force_authenticate(user=self.author)
+        response = self.client.get('/api/articles/missing/likes/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_anonymous_users_cannot_list_likers(self):
+        """ Likers' email addresses should not reach anonymous clients. """
+        self.add_likers(1)
+        response = self.client.get(self.url + 'likes/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
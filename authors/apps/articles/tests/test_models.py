@@ -1,7 +1,11 @@
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase
 from authors.apps.authentication.models import User
 
-from authors.apps.articles.models import Article, Tag
+from authors.apps.articles.models import Article, ArticleQuerySet, Tag
 from authors.apps.profiles.models import Profile
 
 class CreateArticle():
@@ -116,3 +120,95 @@ class ModelTestCase(APITestCase):
                 tag = ['django-rest', 'django']
             )
             self.assertIn('django-rest', str(response))
+
+
+class ArticleSlugTestCase(APITestCase):
+    """
+    Test the slug kept in step with the article title
+    """
+
+    def setUp(self):
+        self.article = CreateArticle().create_article()
+
+    def test_saving_same_title_runs_no_select(self):
+        """ Saving a loaded article should not look the row up again. """
+        article = Article.objects.get(pk=self.article.pk)
+        slug = article.slug
+
+        with CaptureQueriesContext(connection) as context:
+            article.body = "edited"
+            article.save()
+
+        # PostgreSQL also updates the search vector after the save.
+        statements = [query['sql'].split(None, 1)[0].upper()
+                      for query in context.captured_queries]
+        self.assertNotIn('SELECT', statements)
+        self.assertIn('UPDATE', statements)
+        self.assertEqual(article.slug, slug)
+
+    def test_new_title_gets_a_new_slug(self):
+        """ Changing the title should regenerate the slug. """
+        slug = self.article.slug
+        self.article.title = "A brand new title"
+        self.article.save()
+
+        self.assertNotEqual(self.article.slug, slug)
+        self.assertTrue(self.article.slug.startswith("a-brand-new-title-"))
+
+        article = Article.objects.get(pk=self.article.pk)
+        article.title = "Loaded and retitled"
+        article.save()
+        self.assertTrue(article.slug.startswith("loaded-and-retitled-"))
+
+    def test_given_slug_is_kept(self):
+        """ A new article created with a slug should keep it. """
+        article = Article.objects.create(
+            slug="chosen-slug", title="Chosen", description="description",
+            body="body", author=self.article.author)
+
+        self.assertEqual(article.slug, "chosen-slug")
+
+    def test_deferred_title_is_left_alone(self):
+        """ Saving without loading the title should not touch the slug. """
+        article = Article.objects.only('pk', 'slug', 'body').get(pk=self.article.pk)
+        article.body = "edited"
+        article.save(update_fields=['body'])
+
+        self.assertEqual(
+            Article.objects.get(pk=self.article.pk).slug, self.article.slug)
+
+
+class ArticleSearchVectorTestCase(APITestCase):
+    """
+    Test that saving only reindexes articles whose text changed
+    """
+
+    def setUp(self):
+        self.article = CreateArticle().create_article()
+        patcher = mock.patch.object(
+            ArticleQuerySet, 'update_search_vectors', autospec=True)
+        self.update_search_vectors = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_unchanged_text_is_not_reindexed(self):
+        """ Saves that keep the text should not touch the vector. """
+        article = Article.objects.get(pk=self.article.pk)
+        article.save()
+        article.image_url = "https://example.com/cover.png"
+        article.save()
+        Article.objects.only('pk', 'slug').get(pk=self.article.pk).save()
+
+        self.update_search_vectors.assert_not_called()
+
+    def test_changed_text_is_reindexed(self):
+        """ Edits to the title, description or body reindex the article. """
+        for field in ('title', 'description', 'body'):
+            article = Article.objects.get(pk=self.article.pk)
+            setattr(article, field, "edited " + field)
+            article.save()
+        self.article.body = "edited again"
+        self.article.save(update_fields=['body'])
+        self.article.save()
+
+        self.assertEqual(self.update_search_vectors.call_count, 4)
+
@@ -1,3 +1,4 @@
+import base64
 import json
 from django.urls import reverse
 from rest_framework.test import APITestCase
@@ -121,3 +122,76 @@ class ArticleCRUDTestCase(APITestCase):
         results = len(json.loads(res.content).get('article').get('results'))
         self.assertEquals(res.status_code, 200)
         self.assertEquals(results, 12)
+
+
+class KeysetPaginationTestCase(APITestCase):
+    """ Walk article lists with the keyset cursor links. """
+
+    def setUp(self):
+        self.user = User.objects.create_user('test', 'info@test.co', 'Test123.')
+        for index in range(30):
+            article = Article.objects.create(
+                title="Article {}".format(index), description="description",
+                body="body", author=self.user.profile)
+            if index % 3:
+                article.record_rating(index % 5 + 1)
+
+    def walk(self, url, key=None):
+        """ Follow `next` links and return every page seen. """
+        pages = []
+        while url:
+            content = json.loads(self.client.get(url).content)
+            page = content[key] if key else content
+            pages.append(page)
+            url = page['next']
+        return pages
+
+    def test_cursor_walks_every_article_once(self):
+        """ Following next links should visit each article exactly once. """
+        pages = self.walk('/api/articles/', key='article')
+        slugs = [item['slug'] for page in pages for item in page['results']]
+
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(len(slugs), 30)
+        self.assertEqual(len(set(slugs)), 30)
+        self.assertEqual(pages[0]['count'], 30)
+        self.assertIsNone(pages[0]['previous'])
+
+    def test_previous_link_returns_previous_page(self):
+        """ The previous link of a page should lead back to the one before. """
+        first = self.walk('/api/articles/', key='article')[0]
+        second = json.loads(self.client.get(first['next']).content)['article']
+        back = json.loads(self.client.get(second['previous']).content)['article']
+
+        self.assertEqual(
+            [item['slug'] for item in back['results']],
+            [item['slug'] for item in first['results']])
+
+    def test_cursor_handles_nullable_ordering(self):
+        """ Ordering by rating should page through unrated articles too. """
+        pages = self.walk('/api/articles?ordering=-average_rating&limit=7')
+        ratings = [item['average_rating'] for page in pages for item in page['results']]
+
+        self.assertEqual(len(ratings), 30)
+        self.assertEqual(ratings[20:], [None] * 10)
+        self.assertEqual(ratings[:20], sorted(ratings[:20], reverse=True))
+
+    def test_invalid_cursor_is_rejected(self):
+        res = self.client.get('/api/articles/?cursor=not-a-cursor')
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_invalid_values_is_rejected(self):
+        """ Cursor values that do not fit their columns are not a 500. """
+        for position in (['yesterday', 1], ['2020-01-01T00:00:00', 'one'],
+                         [{}, []]):
+            cursor = base64.urlsafe_b64encode(
+                json.dumps({'p': position}).encode('utf-8')).decode('ascii')
+            res = self.client.get('/api/articles/?cursor=' + cursor)
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_count_of_a_single_page_is_exact(self):
+        """ A first page holding every row counts them. """
+        page = json.loads(self.client.get('/api/articles/?limit=50').content)
+        self.assertEqual(page['article']['count'], 30)
+        pages = self.walk('/api/articles/?limit=20', key='article')
+        self.assertGreaterEqual(pages[1]['count'], 10)
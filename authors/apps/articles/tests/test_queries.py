@@ -0,0 +1,78 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase, APIClient
+
+from authors.apps.articles.models import Article, Rate, Tag
+from .utils import create_user
+
+
+class ArticleListQueryCountTestCase(APITestCase):
+    """
+    The number of queries needed to list articles must not grow
+    with the number of articles on the page.
+    """
+
+    def setUp(self):
+        self.viewer = create_user("viewer", "viewer@mail.com")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.viewer)
+
+    def create_articles(self, count):
+        """ Create articles with likes, dislikes, tags, ratings and favorites. """
+        offset = Article.objects.count()
+        for index in range(offset, offset + count):
+            author = create_user(
+                "author{}".format(index), "author{}@mail.com".format(index))
+            fan = create_user("fan{}".format(index), "fan{}@mail.com".format(index))
+            author.profile.follow(fan.profile)
+            fan.profile.follow(author.profile)
+
+            article = Article.objects.create(
+                title="Article {}".format(index),
+                description="description", body="body",
+                author=author.profile)
+            article.like(fan)
+            article.like(self.viewer)
+            article.dislike(author)
+            article.tags.add(Tag.objects.create(
+                tag="tag{}".format(index), slug="tag{}".format(index)))
+            Rate.objects.create(article=article, rater=fan.profile, ratings=4)
+            article.record_rating(4)
+            fan.profile.favorite(article)
+            self.viewer.profile.favorite(article)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def assert_constant_queries(self, url):
+        self.create_articles(2)
+        few = self.count_queries(url)
+        self.create_articles(8)
+        many = self.count_queries(url)
+        self.assertEqual(few, many)
+
+    def test_article_list_query_count_is_constant(self):
+        """ Listing more articles should not run more queries. """
+        self.assert_constant_queries('/api/articles/')
+
+    def test_filter_search_query_count_is_constant(self):
+        """ Searching more articles should not run more queries. """
+        self.assert_constant_queries('/api/articles?search=Article')
+
+    def test_article_list_values(self):
+        """ Counts and flags should match what the relations hold. """
+        self.create_articles(1)
+        response = self.client.get('/api/articles/')
+        article = response.data['results'][0]
+
+        self.assertEqual(article['likes_count'], 2)
+        self.assertEqual(article['dislikes_count'], 1)
+        self.assertEqual(article['favoriteCount'], 2)
+        self.assertTrue(article['favorited'])
+        self.assertEqual(article['average_rating'], 4)
+        self.assertEqual(article['tagList'], ['tag0'])
+        self.assertEqual(article['author']['follows'], 1)
+        self.assertEqual(article['author']['followers'], 1)
@@ -1,4 +1,5 @@
 import json
+from django.db import IntegrityError, transaction
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
@@ -115,6 +116,39 @@ class RateTestCase(APITestCase):
         self.assertEquals(res.data["response"]["message"][0], "Successfull.")
         self.assertEquals(res.status_code, 201)
 
+    def test_rating_updates_stored_average(self):
+        """ Rating and re-rating should keep the stored average current. """
+        self.create_a_user("author", "info@author.co", "Test123.")
+        self.create_a_user("test", "info@test.co", "Test123.")
+        auth_user = self.login_user(self.user)
+        article = self.create_article()
+        url = '/api/articles/'+article.slug+'/rate/'
+        token = 'Bearer ' + auth_user["user"]["token"]
+
+        res = self.client.post(url, {"rate": {"rate": 2}},
+                               HTTP_AUTHORIZATION=token, format='json')
+        self.assertEquals(
+            res.data["response"]["avg_ratings"]["ratings__avg"], 2)
+
+        res = self.client.post(url, {"rate": {"rate": 5}},
+                               HTTP_AUTHORIZATION=token, format='json')
+        self.assertEquals(res.data["avg"]["ratings__avg"], 5)
+
+        article.refresh_from_db()
+        self.assertEquals(article.rating_sum, 5)
+        self.assertEquals(article.rating_count, 1)
+        self.assertEquals(article.average_rating, 5)
+
+    def test_one_rating_per_reader(self):
+        """ The database keeps a single rating per reader and article. """
+        self.create_a_user("author", "info@author.co", "Test123.")
+        rater = self.create_a_user("test", "info@test.co", "Test123.")
+        article = self.create_article()
+        Rate.objects.create(article=article, rater=rater.profile, ratings=2)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Rate.objects.create(article=article, rater=rater.profile, ratings=3)
+
     def test_can_not_rate_more_than_3_times(self):
         """ Should only rate for utmost 3 times."""
         author = self.create_a_user("author", "info@author.co", "Test123.")
@@ -4,7 +4,10 @@ from rest_framework.test import APITestCase
 from rest_framework.test import APIClient
 
 from django.urls import reverse
-from authors.apps.articles.models import Article
+from authors.apps.articles.models import Article, Tag
+from authors.apps.articles.search import (
+    HEADLINE_START, HEADLINE_STOP, HEADLINE_WORDS, escape_headline, highlight)
+from .utils import create_user
 
 TEST_USER = {
     "user": {
@@ -224,3 +227,127 @@ class TestSearch(APITestCase):
         empty = results['count']
         self.assertEquals(empty, 0)
         self.assertIsInstance(results, dict)
+
+
+class TestRankedSearch(APITestCase):
+    """
+    Test ranked full-text search with the `q` parameter
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        author = create_user().profile
+        self.title_match = Article.objects.create(
+            title="Dragon riding", description="A guide",
+            body="Hold on tight", author=author)
+        self.body_match = Article.objects.create(
+            title="Pets", description="Caring for animals",
+            body="Feed your dragon twice a day", author=author)
+        self.tag_match = Article.objects.create(
+            title="Myths", description="Old stories",
+            body="Nothing to see", author=author)
+        self.tag_match.tags.add(Tag.objects.create(tag="dragon", slug="dragon"))
+        Article.objects.create(
+            title="Cooking", description="Recipes", body="Boil water",
+            author=author)
+
+    def search(self, query, **params):
+        params['q'] = query
+        response = self.client.get(reverse("articles:filter_search"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_results_are_ordered_by_relevance(self):
+        """
+        Title matches should rank above tag matches, which rank above
+        body matches, and unrelated articles should be left out
+        """
+        results = self.search("dragon")['results']
+
+        self.assertEqual(
+            [result['slug'] for result in results],
+            [self.title_match.slug, self.tag_match.slug, self.body_match.slug])
+        ranks = [result['search_rank'] for result in results]
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+
+    def test_every_word_must_match(self):
+        """
+        Articles should match all the words of the query
+        """
+        results = self.search("dragon twice")['results']
+
+        self.assertEqual(
+            [result['slug'] for result in results], [self.body_match.slug])
+
+    def test_tagged_articles_are_not_duplicated(self):
+        """
+        An article matching through several tags should be listed once
+        """
+        self.tag_match.tags.add(
+            Tag.objects.create(tag="dragons", slug="dragons"))
+        results = self.search("dragon")['results']
+
+        self.assertEqual(len(results), len({result['slug'] for result in results}))
+
+    def test_matches_are_highlighted(self):
+        """
+        Search results should highlight the matched words
+        """
+        results = self.search("DRAGON")['results']
+
+        self.assertEqual(
+            results[0]['highlight']['title'], "<b>Dragon</b> riding")
+        self.assertEqual(
+            results[2]['highlight']['body'], "Feed your <b>dragon</b> twice a day")
+
+    def test_results_are_paginated_by_rank(self):
+        """
+        Following the next link should continue in rank order
+        """
+        first = self.search("dragon", limit=2)
+        second = self.client.get(first['next']).data
+
+        self.assertEqual(
+            [result['slug'] for result in first['results'] + second['results']],
+            [self.title_match.slug, self.tag_match.slug, self.body_match.slug])
+        self.assertIsNone(second['next'])
+
+    def test_search_without_query_lists_articles(self):
+        """
+        Without `q` the endpoint should keep its plain listing
+        """
+        response = self.client.get(reverse("articles:filter_search"))
+
+        self.assertEqual(response.data['count'], 4)
+        self.assertNotIn('highlight', response.data['results'][0])
+
+    def test_highlight_cuts_long_text_around_the_match(self):
+        """
+        Long bodies should be cut down to the words around the match
+        """
+        text = ' '.join(['word'] * 100 + ['dragon'] + ['word'] * 100)
+        excerpt = highlight(text, ['dragon'], max_words=HEADLINE_WORDS)
+
+        self.assertEqual(len(excerpt.split()), HEADLINE_WORDS)
+        self.assertIn('<b>dragon</b>', excerpt)
+
+    def test_highlight_escapes_the_text(self):
+        """
+        Markup written in an article must not come out of the highlight
+        """
+        excerpt = highlight(
+            '<script>alert("dragon")</script> & <b>dragons</b>', ['dragon'])
+
+        self.assertEqual(
+            excerpt,
+            '&lt;script&gt;alert(&quot;<b>dragon</b>&quot;)&lt;/script&gt;'
+            ' &amp; &lt;b&gt;<b>dragon</b>s&lt;/b&gt;')
+
+    def test_headline_keeps_only_its_own_markup(self):
+        """
+        PostgreSQL headlines should be escaped apart from their markers
+        """
+        headline = '<i>A</i> ' + HEADLINE_START + 'dragon' + HEADLINE_STOP
+
+        self.assertEqual(
+            escape_headline(headline), '&lt;i&gt;A&lt;/i&gt; <b>dragon</b>')
@@ -0,0 +1,72 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from authors.apps.articles.models import Article, Tag
+from .utils import create_user
+
+
+class SparseFieldsTestCase(APITestCase):
+    """ Tests for `?fields=` and `?expand=` on article endpoints. """
+
+    def setUp(self):
+        self.author = create_user("author", "author@mail.com")
+        self.reader = create_user("reader", "reader@mail.com")
+        self.article = Article.objects.create(
+            title="Sparse", description="description", body="A long body",
+            author=self.author.profile)
+        self.article.tags.add(Tag.objects.create(tag="cards", slug="cards"))
+        self.client.force_authenticate(user=self.reader)
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        self.queries = [query['sql'] for query in context.captured_queries]
+        return response.data
+
+    def test_fields_prune_the_list(self):
+        """ Only the selected fields should be serialized and loaded. """
+        data = self.get('/api/articles/', fields='slug,title,likes_count')
+        article = data['results'][0]
+
+        self.assertEqual(
+            sorted(article), ['likes_count', 'slug', 'title'])
+        sql = ' '.join(self.queries)
+        self.assertNotIn('"body"', sql)
+        self.assertNotIn('articles_tag', sql)
+        self.assertNotIn('profiles_profile_favorites', sql)
+
+    def test_nested_fields_and_collapsed_embeds(self):
+        """ Dotted names pick author fields, `expand` collapses the rest. """
+        url = '/api/articles/{}/'.format(self.article.slug)
+
+        self.assertEqual(
+            self.get(url, fields='slug,author.username')['author'],
+            {'username': 'author'})
+        self.assertEqual(
+            self.get(url, fields='slug,author', expand='')['author'], 'author')
+        self.assertEqual(
+            self.get(url, fields='author', expand='author')['author']['follows'], 0)
+
+    def test_cached_article_is_pruned(self):
+        """ A cached article should be served pruned, with its own ETag. """
+        url = '/api/articles/{}/'.format(self.article.slug)
+        full = self.client.get(url)
+        data = self.get(url, fields='title,tagList,favorited', expand='')
+        sparse = self.client.get(url, {'fields': 'title'})
+
+        self.assertEqual(data, {
+            'title': 'Sparse', 'tagList': ['cards'], 'favorited': False})
+        self.assertNotEqual(full['ETag'], sparse['ETag'])
+
+    def test_search_results_can_be_pruned(self):
+        data = self.get('/api/articles', q='Sparse', fields='slug,search_rank')
+        self.assertEqual(sorted(data['results'][0]), ['search_rank', 'slug'])
+
+    def test_profile_fields(self):
+        """ Profiles should only load and show the selected fields. """
+        data = self.get('/api/profiles/author/', fields='username,followers')
+
+        self.assertEqual(data, {'username': 'author', 'followers': 0})
+        self.assertNotIn('"bio"', self.queries[-1])
@@ -1,4 +1,7 @@
 import json
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
@@ -11,7 +14,7 @@ from django.utils.encoding import force_bytes
 from authors.apps.authentication.utils import generate_token
 from rest_framework.test import force_authenticate
 from rest_framework.test import APIRequestFactory
-from authors.apps.articles.models import Article
+from authors.apps.articles.models import Article, Tag
 
 user = {
     "user": {
@@ -192,3 +195,173 @@ class TestTags(APITestCase):
                          format='json'
                          )
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestTagResolution(APITestCase):
+    """
+    Tags of an article are resolved and attached in batches.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="tagger", email="tagger@test.co", password="Test123.")
+        self.client.force_authenticate(user=self.user)
+
+    def post_article(self, tags):
+        return self.client.post('/api/articles/', {
+            "article": {
+                "title": "Tagged", "description": "Tags",
+                "body": "Many tags", "tagList": tags,
+            }
+        }, format='json')
+
+    def count_queries(self, tags):
+        with CaptureQueriesContext(connection) as context:
+            response = self.post_article(tags)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return len(context.captured_queries)
+
+    def test_tag_queries_do_not_grow_with_the_list(self):
+        """
+        Twenty new tags should cost as many queries as two
+        """
+        few = self.count_queries(["one", "two"])
+        many = self.count_queries(["tag{}".format(index) for index in range(20)])
+
+        self.assertEqual(few, many)
+
+    def test_existing_tags_are_reused(self):
+        """
+        Tags differing only by case should share one tag
+        """
+        self.post_article(["Python"])
+        response = self.post_article(["python", "Python", "django"])
+
+        self.assertEqual(sorted(response.data['tagList']), ["Python", "django"])
+        self.assertEqual(Tag.objects.count(), 2)
+
+    def test_update_replaces_the_tags(self):
+        """
+        Updating the tag list should attach the new tags only
+        """
+        slug = self.post_article(["old", "kept"]).data['slug']
+        response = self.client.put('/api/articles/{}/'.format(slug), {
+            "article": {"tagList": ["kept", "new"]}
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(Article.objects.get(slug=slug).tags.values_list('tag', flat=True)),
+            ["kept", "new"])
+
+    def test_blank_tags_are_rejected(self):
+        """
+        Tags must be non-empty strings
+        """
+        response = self.post_article(["fine", " "])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+# The tests run in one process, which shares even a local-memory cache.
+@override_settings(SHARED_CACHE=True)
+class TestTagDirectory(APITestCase):
+    """
+    The tag list counts articles and is served from memory.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="tagger", email="tagger@test.co", password="Test123.")
+        self.python = Tag.objects.create(tag="python", slug="python")
+        self.django = Tag.objects.create(tag="django", slug="django")
+        self.pytest = Tag.objects.create(tag="pytest", slug="pytest")
+        self.articles = []
+        for index, tags in enumerate([
+                [self.python, self.django], [self.python], [self.pytest]]):
+            article = Article.objects.create(
+                title="Article {}".format(index), description="description",
+                body="body", author=self.user.profile)
+            article.tags.add(*tags)
+            self.articles.append(article)
+
+    def tags(self, **params):
+        response = self.client.get('/api/tags/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_tags_are_counted_and_sorted_by_popularity(self):
+        """
+        Tags should come with their article counts, most used first
+        """
+        self.assertEqual(self.tags()['tags'], [
+            {'tag': 'python', 'articles_count': 2},
+            {'tag': 'django', 'articles_count': 1},
+            {'tag': 'pytest', 'articles_count': 1},
+        ])
+
+    def test_counts_follow_tagging_changes(self):
+        """
+        Removing tags or deleting articles should lower the counts
+        """
+        self.articles[0].tags.remove(self.python)
+        self.pytest.articles.add(self.articles[0], self.articles[1])
+        self.articles[2].delete()
+        self.django.articles.clear()
+
+        counts = {tag['tag']: tag['articles_count'] for tag in self.tags()['tags']}
+        self.assertEqual(counts, {'python': 1, 'pytest': 2, 'django': 0})
+
+    def test_removing_missing_tags_changes_no_count(self):
+        """
+        Only taggings that existed should be uncounted
+        """
+        self.articles[2].tags.remove(self.python, self.pytest)
+        self.django.articles.remove(self.articles[1], self.articles[0])
+
+        counts = dict(Tag.objects.values_list('tag', 'articles_count'))
+        self.assertEqual(counts, {'python': 2, 'pytest': 0, 'django': 0})
+
+    def test_prefix_autocomplete(self):
+        """
+        `q` should keep the tags starting with it, ignoring case
+        """
+        self.assertEqual(
+            [tag['tag'] for tag in self.tags(q='PY')['tags']],
+            ['python', 'pytest'])
+
+    def test_tags_are_paginated(self):
+        """
+        `limit` and `offset` should page through the tags
+        """
+        page = self.tags(limit=2)
+
+        self.assertEqual(page['count'], 3)
+        self.assertEqual(len(page['tags']), 2)
+        self.assertEqual(
+            [tag['tag'] for tag in self.client.get(page['next']).data['tags']],
+            ['pytest'])
+
+    def test_unchanged_tags_are_served_from_memory(self):
+        """
+        Repeated reads should not query the database
+        """
+        self.tags()
+        with CaptureQueriesContext(connection) as context:
+            self.tags(q='dj')
+
+        self.assertEqual(len(context.captured_queries), 0)
+
+    def test_unshared_directory_expires(self):
+        """
+        Without a shared cache the list is reloaded once it is old enough
+        """
+        with override_settings(SHARED_CACHE=False, TAG_DIRECTORY_TTL=60):
+            self.tags()
+            Tag.objects.create(tag="pyramid", slug="pyramid")
+            self.assertEqual(self.tags(q='pyr')['tags'], [])
+
+        with override_settings(SHARED_CACHE=False, TAG_DIRECTORY_TTL=0):
+            self.assertEqual(
+                self.tags(q='pyr')['tags'],
+                [{'tag': 'pyramid', 'articles_count': 0}])
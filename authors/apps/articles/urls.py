@@ -5,7 +5,8 @@ from .views import RateAPIView, ArticleAPIView
 from .views import (
     LikesAPIView, DislikesAPIView, RateAPIView,
     ArticleAPIView, CommentsListCreateAPIView, CommentsCreateDestroyAPIView,
-    FavoriteAPIView, TagAPIView, FilterSearchAPIView
+    FavoriteAPIView, TagAPIView, FilterSearchAPIView, ArticleFeedAPIView,
+    ArticleLikesAPIView
 )
 
 app_name = "articles"
@@ -14,6 +15,8 @@ router = DefaultRouter()
 router.register('articles', ArticleAPIView)
 
 urlpatterns = [
+    # Registered ahead of the router so "feed" is not taken for a slug.
+    path('articles/feed/', ArticleFeedAPIView.as_view(), name="feed"),
     path('', include(router.urls)),
     path('articles/<article_slug>/comments/', 
         CommentsListCreateAPIView.as_view() , name="comments"),
@@ -21,6 +24,7 @@ urlpatterns = [
         CommentsCreateDestroyAPIView.as_view() , name="comment"),
     path('articles/<slug>/like/', LikesAPIView.as_view(), name="like"),
     path('articles/<slug>/dislike/', DislikesAPIView.as_view(), name="dislike"),
+    path('articles/<slug>/likes/', ArticleLikesAPIView.as_view(), name="likes"),
     path('articles/<slug>/rate/', RateAPIView.as_view(), name="rate"),
     path('articles/<slug>/favorite/',
          FavoriteAPIView.as_view(), name="favorite"),
@@ -1,21 +1,86 @@
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
 
+from authors.apps.core.cache import expire_version
 from .models import Tag
 from django.utils.text import slugify
 
+
+def tag_slug(name):
+    return slugify(name.lower())
+
+
+def resolve_tags(names):
+    """
+    Return the tags named `names`, in order and without duplicates,
+    creating the missing ones.
+
+    Tags are matched on their slug with one SELECT, and any missing ones
+    are inserted with a single `bulk_create` that ignores rows a concurrent
+    request inserted first, then read back.
+    """
+    wanted = {}
+    for name in names:
+        wanted.setdefault(tag_slug(name), name)
+    if not wanted:
+        return []
+
+    tags = {tag.slug: tag for tag in Tag.objects.filter(slug__in=wanted)}
+    missing = [slug for slug in wanted if slug not in tags]
+    if missing:
+        Tag.objects.bulk_create(
+            [Tag(tag=wanted[slug], slug=slug) for slug in missing],
+            ignore_conflicts=True)
+        # `bulk_create` sends no `post_save` to expire the tag list.
+        expire_version('tags')
+        tags.update(
+            (tag.slug, tag) for tag in Tag.objects.filter(slug__in=missing))
+
+    return [tags[slug] for slug in wanted]
+
+
 class TagField(serializers.RelatedField):
     """
     Tag field helper class
     """
+    default_error_messages = {
+        'invalid': 'A tag must be a non-empty string.',
+    }
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return TagListField(**list_kwargs)
+
     def get_queryset(self):
         result = Tag.objects.all()
         return result
 
+    def to_name(self, data):
+        if not isinstance(data, str) or not data.strip():
+            self.fail('invalid')
+        return data
+
     def to_internal_value(self, data):
-        tag, created = Tag.objects.get_or_create(
-            tag=data, slug=slugify(data.lower())
-        )
-        return tag
+        return resolve_tags([self.to_name(data)])[0]
 
     def to_representation(self, value):
         return value.tag
+
+
+class TagListField(serializers.ManyRelatedField):
+    """
+    A list of tags resolved together by `resolve_tags`, in a fixed number
+    of queries however long the list is.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+
+        return resolve_tags([self.child_relation.to_name(item) for item in data])
@@ -1,67 +1,104 @@
 """ Views for django Articles. """
+from collections import OrderedDict
+
 from django.shortcuts import render
-from django.db.models import Avg
+from django.db import transaction
+from django.utils.cache import patch_vary_headers
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, AllowAny
-from rest_framework.exceptions import NotFound, PermissionDenied
+from rest_framework.exceptions import (
+    NotFound, PermissionDenied, ValidationError)
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import status, mixins, viewsets
 from rest_framework.generics import RetrieveAPIView, CreateAPIView
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import LimitOffsetPagination, PageNumberPagination
 from authors import settings
-from .models import Article, Rate, Comment, Tag
-from .serializers import ArticleSerializer, CommentSerializer, RateSerializer, TagSerializer
-from .renderers import ArticleJSONRenderer, CommentJSONRenderer, RateJSONRenderer, FavoriteJSONRenderer
+from authors.apps.core.compiled import CompiledListMixin
+from authors.apps.core.conditional import make_etag, not_modified, set_validators
+from authors.apps.core.fields import SparseFieldsViewMixin
+from authors.apps.core.metrics import SerializerMetricsMixin
+from authors.apps.core.pagination import KeysetPagination
+from authors.apps.profiles.models import Profile
+from authors.apps.profiles.serializers import (
+    CompiledProfileListSerializer, ProfileListSerializer)
+from .cache import article_cache, tag_directory
+from .models import Article, Rate, Comment, Tag, article_validators
+from .search import RankedSearchFilter
+from .serializers import (
+    ArticleSerializer, ArticleSearchSerializer, CommentSerializer,
+    CompiledArticleSerializer, CompiledCommentSerializer, RateSerializer,
+    TagSerializer)
+from .renderers import (
+    ArticleJSONRenderer, CommentJSONRenderer, RateJSONRenderer,
+    FavoriteJSONRenderer, LikesJSONRenderer)
+
+class ReactionAPIView(APIView):
+    """
+    Add (PUT) or take back (DELETE) the user's reaction to an article.
 
-class LikesAPIView(APIView):
-    permission_classes = (IsAuthenticatedOrReadOnly, )
+    Only the article's reaction counts and the user's reaction are sent
+    back, instead of the whole article.
+    """
+    permission_classes = (IsAuthenticated, )
     renderer_classes = (ArticleJSONRenderer, )
-    serializer_class = ArticleSerializer
+    reaction = None
 
     def put(self, request, slug):
-        serializer_context = {'request': request}
+        return self.react(request, slug, active=True)
+
+    def delete(self, request, slug):
+        return self.react(request, slug, active=False)
 
+    def react(self, request, slug, active):
         try:
-            serializer_instance = Article.objects.get(slug=slug)
+            article = Article.objects.only('pk').get(slug=slug)
         except Article.DoesNotExist:
             raise NotFound("An article with this slug does not exist")
 
-        if serializer_instance in Article.objects.filter(dislikes=request.user):
-            serializer_instance.dislikes.remove(request.user)
+        reaction = article.react(request.user, self.reaction, active)
 
-        serializer_instance.likes.add(request.user)
+        return Response({
+            'likes_count': article.likes_count,
+            'dislikes_count': article.dislikes_count,
+            'liked': reaction == 'like',
+            'disliked': reaction == 'dislike',
+        }, status=status.HTTP_200_OK)
 
-        serializer = self.serializer_class(
-            serializer_instance, context=serializer_context, partial=True)
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+class LikesAPIView(ReactionAPIView):
+    reaction = 'like'
 
 
-class DislikesAPIView(APIView):
-    permission_classes = (IsAuthenticatedOrReadOnly, )
-    renderer_classes = (ArticleJSONRenderer, )
-    serializer_class = ArticleSerializer
+class DislikesAPIView(ReactionAPIView):
+    reaction = 'dislike'
 
-    def put(self, request, slug):
-        serializer_context = {'request': request}
-
-        try:
-            serializer_instance = Article.objects.get(slug=slug)
-        except Article.DoesNotExist:
+class ArticleLikesAPIView(SerializerMetricsMixin, CompiledListMixin,
+                          generics.ListAPIView):
+    """
+    Page through the profiles that liked an article, newest profiles
+    first, with whether the viewer follows each of them. Like the
+    follower lists, it is only shown to users who are logged in, since
+    the profiles carry email addresses.
+    """
+    permission_classes = (IsAuthenticated, )
+    serializer_class = ProfileListSerializer
+    compiled_serializer_class = CompiledProfileListSerializer
+    renderer_classes = (LikesJSONRenderer, )
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-id',)
+
+    def get_queryset(self):
+        article = Article.objects.filter(
+            slug=self.kwargs['slug']).values_list('pk', flat=True).first()
+        if article is None:
             raise NotFound("An article with this slug does not exist")
 
-        if serializer_instance in Article.objects.filter(likes=request.user):
-            serializer_instance.likes.remove(request.user)
-
-        serializer_instance.dislikes.add(request.user)
+        return Profile.objects.filter(user__likes=article).select_related(
+            'user').with_following(self.request.user.profile)
 
-        serializer = self.serializer_class(
-            serializer_instance,  context=serializer_context, partial=True)
-
-        return Response(serializer.data, status=status.HTTP_200_OK)
 
 class RateAPIView(CreateAPIView):
     permission_classes = (AllowAny,)
@@ -95,42 +132,55 @@ class RateAPIView(CreateAPIView):
         rate = serializer.data.get('rate')
         # Filter rate table to check if record with given article and user
         # exist.
-        rating = Rate.objects.filter(article=article,
-                rater=request.user.profile).first()
-
-        if not rating:
-            """ If it doesnt exist create an new record."""
-            rating = Rate(article=article, rater=request.user.profile, ratings=rate)
+        with transaction.atomic():
+            # A concurrent first rating by the same user makes the insert
+            # fail on the (article, rater) constraint, and the row it
+            # inserted is then locked and updated below instead.
+            rating, created = Rate.objects.select_for_update().get_or_create(
+                article=article, rater=request.user.profile,
+                defaults={'ratings': rate})
+
+            if created:
+                """ If it doesnt exist create an new record."""
+                # Fold the rating into the article's stored average.
+                article.record_rating(rate)
+                avg_ratings = {"ratings__avg": article.average_rating}
+                return Response({"response":{"message":["Successfull."],
+                    "avg_ratings":avg_ratings
+                    }}, status=status.HTTP_201_CREATED)
+
+            # If exist check if the user has exceed rating counter
+            if rating.counter > 3: 
+                """Allow rating if counter is less than 3."""
+                return Response({"errors":{"message":["You are only allowed to "
+                "rate 3 times"]}}, status=status.HTTP_403_FORBIDDEN)
+
+            previous = rating.ratings
+            rating.ratings = rate
             rating.save()
-            # get the averages ratings of the article.
-            avg_ratings = Rate.objects.filter(article=article).aggregate(Avg('ratings'))
-            return Response({"response":{"message":["Successfull."],
-                "avg_ratings":avg_ratings
-                }}, status=status.HTTP_201_CREATED)
-
-        # If exist check if the user has exceed rating counter
-        if rating.counter > 3: 
-            """Allow rating if counter is less than 3."""
-            return Response({"errors":{"message":["You are only allowed to "
-            "rate 3 times"]}}, status=status.HTTP_403_FORBIDDEN)
-
-        rating.ratings = rate
-        rating.save()
-        # Get the average ratings of the article.
-        avg = Rate.objects.filter(article=article).aggregate(Avg('ratings'))
+            # Replace the previous rating in the article's stored average.
+            article.record_rating(rate, previous)
+        avg = {"ratings__avg": article.average_rating}
         return Response({"avg":avg}, status=status.HTTP_201_CREATED)
 
-class ArticleAPIView(mixins.CreateModelMixin,
+class ArticleAPIView(SerializerMetricsMixin, SparseFieldsViewMixin,
+                     CompiledListMixin, mixins.CreateModelMixin,
                      mixins.ListModelMixin,
                      mixins.RetrieveModelMixin, viewsets.GenericViewSet):
     """
     This class defines the create behavior of our articles.
     """
     lookup_field = 'slug'
-    queryset = Article.objects.annotate(average_rating=Avg("rate__ratings"))
+    queryset = Article.objects.all()
     permission_classes = (IsAuthenticatedOrReadOnly, )
     serializer_class = ArticleSerializer
+    compiled_serializer_class = CompiledArticleSerializer
     renderer_classes = (ArticleJSONRenderer, )
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        return Article.objects.with_serializer_data(
+            self.request.user, self.selection)
 
     def create(self, request):
         """
@@ -149,19 +199,53 @@ class ArticleAPIView(mixins.CreateModelMixin,
         """
         Get one article
         """
-        serializer_context = {'request': request}
-        try:
-            serializer_instance = self.queryset.get(slug=slug)
-        except Article.DoesNotExist:
-            raise NotFound('Article not found')
-
-        serializer = self.serializer_class(
-            serializer_instance,
-            context=serializer_context
-
-        )
-
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        selection = self.selection
+        entry = article_cache.get(slug)
+        if entry is not None:
+            flags = Article.objects.filter(pk=entry['pk']).viewer_flags(request.user)
+            validators = article_cache.validators(entry, flags)
+        else:
+            state = Article.objects.filter(slug=slug).validator_state(request.user)
+            if state is None:
+                raise NotFound('Article not found')
+            fields = len(Article.VALIDATOR_FIELDS)
+            validators = article_validators(state[:fields], state[fields:])
+        if selection is not None:
+            validators['etag'] = make_etag(validators['etag'], selection.key())
+
+        response = not_modified(request, **validators)
+        if response is None and entry is not None:
+            data = article_cache.payload(entry, flags)
+            if selection is not None:
+                data = selection.prune(data, collapsed={'author': 'username'})
+            response = set_validators(
+                Response(data, status=status.HTTP_200_OK), **validators)
+        elif response is None:
+            # Read before loading the article, see `ArticleDetailCache.set`.
+            versions = article_cache.versions(state[0], state[fields - 1])
+
+            try:
+                serializer_instance = self.get_queryset().get(slug=slug)
+            except Article.DoesNotExist:
+                raise NotFound('Article not found')
+
+            serializer = self.get_serializer(serializer_instance)
+            if selection is None:
+                # Only complete articles are cached, and their validators
+                # are taken from the very rows that were serialized.
+                article_cache.set(
+                    slug, serializer_instance, versions, serializer.data)
+                validators = article_validators(
+                    serializer_instance.validator_state(),
+                    [getattr(serializer_instance, flag)
+                     for flag in Article.VIEWER_FLAGS])
+            response = set_validators(
+                Response(serializer.data, status=status.HTTP_200_OK),
+                **validators)
+
+        # The validators include the viewer's flags.
+        patch_vary_headers(response, ('Authorization', ))
+        return response
 
     def update(self, request, slug):
         """
@@ -208,22 +292,40 @@ class ArticleAPIView(mixins.CreateModelMixin,
 
         return Response(None, status=status.HTTP_204_NO_CONTENT)
 
-class CommentsListCreateAPIView(generics.ListCreateAPIView):
+class CommentsListCreateAPIView(SerializerMetricsMixin, CompiledListMixin,
+                                generics.ListCreateAPIView):
     lookup_field = 'article__slug'
     lookup_url_kwarg = 'article_slug'
     permission_classes = (IsAuthenticated,)
     serializer_class = CommentSerializer
+    compiled_serializer_class = CompiledCommentSerializer
     renderer_classes = (CommentJSONRenderer,)
+    pagination_class = KeysetPagination
 
-    queryset = Comment.objects.select_related(
-        'article', 'article__author', 'article__author__user',
-        'author', 'author__user'
-    )
+    queryset = Comment.objects.with_authors()
 
     def filter_queryset(self, queryset):
         filters = {self.lookup_field: self.kwargs[self.lookup_url_kwarg]}
         return queryset.filter(**filters).filter(parent=None)
 
+    def list(self, request, article_slug=None):
+        """
+        Page through the top level comments and load every reply below
+        the page with one more query.
+        """
+        if self.use_compiled():
+            return self.compiled_list()
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        roots = Comment.objects.with_authors().attach_threads(
+            queryset if page is None else page)
+
+        serializer = self.get_serializer(roots, many=True)
+        if page is None:
+            return Response(serializer.data)
+        return self.get_paginated_response(serializer.data)
+
     def create(self, request,  article_slug=None):
         data = request.data.get('comment', {})
         context = {'author': request.user.profile}
@@ -239,10 +341,12 @@ class CommentsListCreateAPIView(generics.ListCreateAPIView):
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-class CommentsCreateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView, generics.CreateAPIView):
+class CommentsCreateDestroyAPIView(SerializerMetricsMixin,
+                                   generics.RetrieveUpdateDestroyAPIView,
+                                   generics.CreateAPIView):
     permission_classes = (IsAuthenticated,)
     lookup_url_kwarg = 'comment_pk'
-    queryset = Comment.objects.all()
+    queryset = Comment.objects.with_authors()
     serializer_class = CommentSerializer
     renderer_classes = (CommentJSONRenderer,)
 
@@ -271,6 +375,9 @@ class CommentsCreateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView, generi
         except Comment.DoesNotExist:
             raise NotFound('A comment with this ID does not exist.')
 
+        if comment.depth >= Comment.MAX_DEPTH:
+            raise ValidationError('This thread is too deep to reply to.')
+
         serializer = self.serializer_class(data=data, context=context)
         serializer.is_valid(raise_exception=True)
         serializer.save()
@@ -319,24 +426,77 @@ class FavoriteAPIView(APIView):
         )
         return Response(serializer.data,  status=status.HTTP_200_OK)
 
+class TagPagination(LimitOffsetPagination):
+    default_limit = 100
+    max_limit = 1000
+
+
 class TagAPIView(generics.ListAPIView):
+    """
+    List tags with their article counts, most used first. `?q=` keeps
+    the tags starting with the given text, for autocompletion.
+    """
     queryset = Tag.objects.all()
     permission_classes = (AllowAny,)
     serializer_class = TagSerializer
+    pagination_class = TagPagination
 
     def list(self, request):
-        serializer_data = self.get_queryset()
-        serializer = self.serializer_class(serializer_data, many=True)
+        etag = tag_directory.etag()
+        response = not_modified(request, etag=etag)
+        if response is not None:
+            return response
+
+        # Served from the in-memory directory, not from the database.
+        tags = self.paginate_queryset(
+            tag_directory.search(request.query_params.get('q', '')))
+
+        return set_validators(Response(OrderedDict([
+            ('count', self.paginator.count),
+            ('next', self.paginator.get_next_link()),
+            ('previous', self.paginator.get_previous_link()),
+            ('tags', tags),
+        ]), status.HTTP_200_OK), etag=etag)
+
+class ArticleFeedAPIView(SerializerMetricsMixin, SparseFieldsViewMixin,
+                         CompiledListMixin, generics.ListAPIView):
+    """
+    List the articles of the authors the current user follows.
+    """
+    permission_classes = (IsAuthenticated, )
+    serializer_class = ArticleSerializer
+    compiled_serializer_class = CompiledArticleSerializer
+    renderer_classes = (ArticleJSONRenderer, )
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        return Article.objects.feed(
+            self.request.user.profile
+        ).with_serializer_data(self.request.user, self.selection)
 
-        return Response({'tags': serializer.data}, status.HTTP_200_OK)
 
-class FilterSearchAPIView(generics.ListAPIView):
+class FilterSearchAPIView(SerializerMetricsMixin, SparseFieldsViewMixin,
+                          CompiledListMixin, generics.ListAPIView):
     permission_classes = (IsAuthenticatedOrReadOnly, )
     search_list = ['title', 'body',
                    'description', 'author__user__username', 'tags__tag']
     filter_list = ['title', 'author__id', 'tags__tag']
     queryset = Article.objects.all()
     serializer_class = ArticleSerializer
-    filter_backends = (DjangoFilterBackend, SearchFilter, )
+    compiled_serializer_class = CompiledArticleSerializer
+    filter_backends = (
+        DjangoFilterBackend, SearchFilter, RankedSearchFilter, OrderingFilter, )
     filter_fields = filter_list
     search_fields = search_list
+    ordering_fields = ['average_rating', 'created_at']
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        return Article.objects.with_serializer_data(
+            self.request.user, self.selection)
+
+    def get_serializer_class(self):
+        # `?q=` switches to ranked full-text search, see `RankedSearchFilter`.
+        if self.request.query_params.get(RankedSearchFilter.search_param):
+            return ArticleSearchSerializer
+        return self.serializer_class
@@ -1,13 +1,140 @@
 """ Implements jwt.  """
 
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
 import jwt
 
 from django.conf import settings
+from django.core.cache import caches
 
 from rest_framework import authentication, exceptions
 
+from authors.apps.core.cache import expire_version, get_version
+
 from .models import User
 
+
+def user_version(pk):
+    """ Name of the version counter of a cached user and their profile. """
+    return 'user:{}'.format(pk)
+
+
+class LRUCache:
+    """ A small thread safe least-recently-used cache whose entries expire. """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        if ttl <= 0 or self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class UserCache:
+    """
+    Resolve JWTs to users without touching the database in steady state.
+
+    Decoded payloads are kept per token until they expire, and users are
+    kept per id together with their profile. Users live in a per-process
+    LRU and, when `JWT_USER_CACHE_ALIAS` names a Django cache, in that
+    shared cache as well, next to the version of the user they were read
+    at. `invalidate` moves that version whenever a user or profile is
+    saved or deleted, so a copy is only used while its version is current
+    in every process. Without a shared default cache, see `SHARED_CACHE`,
+    users are not cached at all.
+    """
+    key_prefix = 'jwt-user:'
+
+    def __init__(self):
+        self.tokens = LRUCache(settings.JWT_USER_CACHE_SIZE)
+        self.users = LRUCache(settings.JWT_USER_CACHE_SIZE)
+
+    @property
+    def ttl(self):
+        return settings.JWT_USER_CACHE_TTL
+
+    @property
+    def shared(self):
+        alias = settings.JWT_USER_CACHE_ALIAS
+        return caches[alias] if alias else None
+
+    def decode(self, token):
+        """ Return the token payload, decoding it only on a cache miss. """
+        payload = self.tokens.get(token)
+        if payload is None:
+            payload = jwt.decode(token, settings.JWT_SECRET_KEY)
+            remaining = payload.get('exp', 0) - time.time()
+            self.tokens.set(token, payload, min(self.ttl, remaining))
+        elif payload.get('exp', 0) <= time.time():
+            self.tokens.delete(token)
+            raise jwt.ExpiredSignature('Signature has expired')
+        return payload
+
+    def get_user(self, user_id):
+        """ Return the user and their profile, hitting the database on a miss. """
+        if not settings.SHARED_CACHE:
+            return User.objects.select_related('profile').get(pk=user_id)
+
+        key = self.key_prefix + str(user_id)
+        version = get_version(user_version(user_id))
+        entry = self.users.get(key)
+
+        if entry is None and self.shared is not None:
+            entry = self.shared.get(key)
+            if entry is not None:
+                self.users.set(key, entry, self.ttl)
+
+        if entry is None or entry[0] != version:
+            user = User.objects.select_related('profile').get(pk=user_id)
+            entry = (version, pickle.dumps(user))
+            self.users.set(key, entry, self.ttl)
+            if self.shared is not None:
+                self.shared.set(key, entry, self.ttl)
+            return user
+
+        # Hand out a fresh copy so views can modify `request.user` freely.
+        return pickle.loads(entry[1])
+
+    def invalidate(self, user_id):
+        key = self.key_prefix + str(user_id)
+        self.users.delete(key)
+        if self.shared is not None:
+            self.shared.delete(key)
+        expire_version(user_version(user_id))
+
+
+user_cache = UserCache()
+
+
 class JWTAuthentication(authentication.BaseAuthentication):
     """ JWTAuthentication implement jwt authentication. """
     authentication_header_prefix='Bearer'
@@ -40,7 +167,7 @@ class JWTAuthentication(authentication.BaseAuthentication):
     def authenticate_user(self, request, token):
         """  Returns an active user that matches the payload's user id and email. """
         try:
-            payload = jwt.decode(token, settings.JWT_SECRET_KEY)
+            payload = user_cache.decode(token)
         except jwt.ExpiredSignature:
             msg = 'Signature has expired.'
             raise exceptions.AuthenticationFailed(msg)
@@ -50,7 +177,7 @@ class JWTAuthentication(authentication.BaseAuthentication):
         except jwt.InvalidTokenError:
             raise exceptions.AuthenticationFailed()
         try:
-            user = User.objects.get(pk=payload['id'])
+            user = user_cache.get_user(payload['id'])
         except User.DoesNotExist:
             msg = 'No user matching this token was found.'
             raise exceptions.AuthenticationFailed(msg)
@@ -58,4 +185,3 @@ class JWTAuthentication(authentication.BaseAuthentication):
             msg = 'User account is disabled.'
             raise exceptions.AuthenticationFailed(msg)
         return (user, token)
-
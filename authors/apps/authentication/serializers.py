@@ -230,7 +230,11 @@ class UserSerializer(serializers.ModelSerializer):
         for (key, value) in profile_data.items():
             setattr(instance.profile, key, value)
 
-        instance.profile.save()
+        # Only the edited columns are written: the profile may come from
+        # the token authentication cache, with outdated follow counters.
+        if profile_data:
+            instance.profile.save(
+                update_fields=[*profile_data, 'updated_at'])
 
         return instance
 
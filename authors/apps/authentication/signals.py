@@ -1,8 +1,10 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
-from authors.apps.profiles.models import Profile
+from authors.apps.core.cache import expire_version
+from authors.apps.profiles.models import Profile, profile_version
 
+from .backends import user_cache
 from .models import User
 
 
@@ -14,3 +16,39 @@ def create_related_profile(sender, instance, created, *args, **kwargs):
     # has a profile.
     if instance and created:
         instance.profile = Profile.objects.create(user=instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, *args, **kwargs):
+    # Saving a user may deactivate them, so the copy cached for token
+    # authentication must be dropped for the change to take effect.
+    user_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def expire_user_profile(sender, instance, created, *args, **kwargs):
+    # Profiles are shown with their user's username and email.
+    if not created:
+        for pk in Profile.objects.filter(
+                user=instance).values_list('pk', flat=True):
+            expire_version(profile_version(pk))
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_cached_profile(sender, instance, *args, **kwargs):
+    # Cached users carry their profile along, so refresh them together.
+    user_cache.invalidate(instance.user_id)
+
+
+@receiver(m2m_changed, sender=Profile.follows.through)
+def invalidate_cached_follows(sender, instance, action, pk_set, *args, **kwargs):
+    # Following someone updates the stored counters of both profiles
+    # without saving them, so drop both of their cached users.
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    user_cache.invalidate(instance.user_id)
+    for user_id in Profile.objects.filter(
+            pk__in=pk_set or ()).values_list('user_id', flat=True):
+        user_cache.invalidate(user_id)
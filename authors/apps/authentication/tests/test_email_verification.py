@@ -1,4 +1,7 @@
 """ This is a test file for the login feature. """
+from io import StringIO
+
+from django.core.management import call_command
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
@@ -27,6 +30,10 @@ class TestLogin(APITestCase):
         """ Tests that a verification email is sent on signup """
         self.register_user(TEST_USER)
 
+        # The message is queued rather than sent during the request.
+        self.assertEqual(len(mail.outbox), 0)
+        call_command('send_queued_mail', '--once', stdout=StringIO())
+
         # Test that one message has been sent.
         self.assertEqual(len(mail.outbox), 1)
 
@@ -1,12 +1,17 @@
 """ Test jwt """
 import json
-from rest_framework import status
+from rest_framework import exceptions, status
 from rest_framework.test import APITestCase
 from rest_framework.test import APIClient
 
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.test import override_settings
 
+from authors.apps.core.cache import bump_version
+from authors.apps.profiles.models import Profile
+
+from ..backends import JWTAuthentication, user_cache, user_version
 from .utils import TEST_USER
 
 class TestJWT(APITestCase):
@@ -92,4 +97,91 @@ class TestJWT(APITestCase):
         )
 
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-        
\ No newline at end of file
+        
+
+    @override_settings(SHARED_CACHE=True)
+    def test_cached_user_needs_no_queries(self):
+        """ Test that repeated authentication is served from the cache. """
+        token = self.register_user(TEST_USER).get("user").get("token")
+        backend = JWTAuthentication()
+        backend.authenticate_user(None, token)
+
+        with self.assertNumQueries(0):
+            user, _ = backend.authenticate_user(None, token)
+            self.assertEqual(user.profile.user_id, user.pk)
+
+    def test_deactivated_user_is_not_served_from_cache(self):
+        """ Test that deactivating a cached user takes effect at once. """
+        token = self.register_user(TEST_USER).get("user").get("token")
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
+        response = client.get(reverse("authentication:user"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        user = get_user_model().objects.get()
+        user.is_active = False
+        user.save()
+
+        response = client.get(reverse("authentication:user"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(SHARED_CACHE=True)
+    def test_change_in_another_process_drops_cached_user(self):
+        """ Test that a moved user version outdates the per-process copy. """
+        token = self.register_user(TEST_USER).get("user").get("token")
+        backend = JWTAuthentication()
+        backend.authenticate_user(None, token)
+
+        # Another process deactivates the user, which only shows here
+        # through the shared version counter.
+        user = get_user_model().objects.get()
+        get_user_model().objects.filter(pk=user.pk).update(is_active=False)
+        bump_version(user_version(user.pk))
+
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            backend.authenticate_user(None, token)
+
+    def test_no_caching_without_shared_cache(self):
+        """ Test that users are read every time when processes cannot agree. """
+        token = self.register_user(TEST_USER).get("user").get("token")
+        backend = JWTAuthentication()
+        backend.authenticate_user(None, token)
+
+        with self.assertNumQueries(1):
+            backend.authenticate_user(None, token)
+
+    @override_settings(SHARED_CACHE=True)
+    def test_profile_update_keeps_follow_counters(self):
+        """ Test that editing the bio does not write back cached counters. """
+        token = self.register_user(TEST_USER).get("user").get("token")
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
+        client.get(reverse("authentication:user"))
+
+        # A follow recorded while the user sits in the cache.
+        Profile.objects.update(followers_count=3)
+
+        response = client.put(
+            reverse("authentication:user"),
+            {"user": {"bio": "Writer"}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        profile = Profile.objects.get()
+        self.assertEqual(profile.bio, "Writer")
+        self.assertEqual(profile.followers_count, 3)
+
+    @override_settings(JWT_USER_CACHE_ALIAS='default', SHARED_CACHE=True)
+    def test_shared_cache_tier(self):
+        """ Test that users are shared through the configured cache. """
+        token = self.register_user(TEST_USER).get("user").get("token")
+        backend = JWTAuthentication()
+        backend.authenticate_user(None, token)
+        user_cache.users.clear()
+
+        with self.assertNumQueries(0):
+            user, _ = backend.authenticate_user(None, token)
+        self.assertEqual(user.username, TEST_USER["user"]["username"])
+
+        user.profile.save()
+        self.assertIsNone(user_cache.shared.get(
+            user_cache.key_prefix + str(user.pk)))
@@ -0,0 +1,50 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def version_key(name):
+    return 'version:{}'.format(name)
+
+
+def get_version(name):
+    """
+    Return the current version of `name`, a counter that `bump_version`
+    increments whenever the data it stands for changes.
+
+    Counters start from the current time in milliseconds, so a counter
+    evicted from the cache never goes back to a version handed out before.
+    """
+    key = version_key(name)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_versions(*names):
+    """ Return the current versions of `names` in one cache round trip. """
+    found = cache.get_many([version_key(name) for name in names])
+    return tuple(
+        found.get(version_key(name)) or get_version(name) for name in names)
+
+
+def bump_version(name):
+    """ Move `name` to a new version. """
+    try:
+        return cache.incr(version_key(name))
+    except ValueError:
+        return get_version(name)
+
+
+def expire_version(name):
+    """
+    Bump `name` now, and again once the current transaction commits.
+
+    The second bump discards anything cached from a concurrent request
+    that read the new version but still saw the uncommitted old data.
+    """
+    bump_version(name)
+    transaction.on_commit(lambda: bump_version(name))
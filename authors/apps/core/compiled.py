@@ -0,0 +1,146 @@
+"""
+Compiled, read-only list serializers.
+
+A DRF serializer walks its fields for every object it renders: it looks
+each attribute up through its dotted source, builds an `OrderedDict` and
+runs nested serializers the same way. For long lists of rows that walk
+costs more than the queries behind them.
+
+`CompiledSerializer` walks the fields of a DRF serializer once per
+request instead, into a plan of (key, column, converter) entries, and
+then builds plain dicts straight from `.values()` rows by following it.
+Plain fields read the column named after their source and keep the
+field's own `to_representation`, nested serializers read the columns of
+the joined rows, and the few fields computed from other rows or tables
+are filled in by `compute_<field>()` hooks, with one query per page.
+
+The output is the same as the DRF serializer's, key for key and byte for
+byte once rendered, which the tests check for every compiled serializer.
+`CompiledListMixin` switches list views to it while the
+`COMPILED_SERIALIZERS` setting is on.
+"""
+from django.conf import settings
+from rest_framework import fields
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
+
+from .metrics import serializer_timer
+
+# `.values()` rows already hold these fields' Python types, so their
+# `to_representation` can be skipped.
+UNCONVERTED_FIELDS = (fields.CharField, fields.IntegerField)
+
+
+class CompiledSerializer:
+    """
+    Render `.values()` rows the way `serializer_class` renders instances.
+
+    `column_fields` maps fields that are not read from their source, e.g.
+    method fields returning an annotation, to a (column, converter) pair;
+    `computed_fields` lists the fields filled in by `compute_<field>()`,
+    which receives the page of rows and returns a function of one row.
+    `extra_columns` are loaded for those hooks without being rendered.
+    """
+    serializer_class = None
+    column_fields = {}
+    computed_fields = ()
+    extra_columns = ('id',)
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        self.plan = self.compile(self.serializer_class(context=self.context))
+        self.columns = list(self.extra_columns)
+        self.collect_columns(self.plan)
+
+    def compile(self, serializer, prefix=''):
+        plan = []
+        for key, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if not prefix and key in self.computed_fields:
+                plan.append((key, None, getattr(self, 'compute_' + key), None))
+            elif not prefix and key in self.column_fields:
+                column, convert = self.column_fields[key]
+                plan.append((key, column, convert, None))
+            elif isinstance(field, BaseSerializer):
+                plan.append((key, None, None, self.compile(
+                    field, prefix + field.source.replace('.', '__') + '__')))
+            else:
+                convert = field.to_representation
+                if isinstance(field, UNCONVERTED_FIELDS):
+                    convert = None
+                plan.append((
+                    key, prefix + field.source.replace('.', '__'), convert, None))
+        return plan
+
+    def collect_columns(self, plan):
+        for _, column, _, nested in plan:
+            if nested is not None:
+                self.collect_columns(nested)
+            elif column is not None and column not in self.columns:
+                self.columns.append(column)
+
+    def values(self, queryset, columns=()):
+        """ Narrow `queryset` to the rows the plan reads, plus `columns`. """
+        columns = self.columns + [
+            column for column in columns if column not in self.columns]
+        return queryset.prefetch_related(None).values(*columns)
+
+    def represent(self, rows):
+        rows = list(rows)
+        with serializer_timer():
+            computed = {
+                key: compute(rows) for key, column, compute, nested in self.plan
+                if column is None and nested is None}
+            return [self.build(self.plan, row, computed) for row in rows]
+
+    def build(self, plan, row, computed):
+        data = {}
+        for key, column, convert, nested in plan:
+            if nested is not None:
+                data[key] = self.build(nested, row, computed)
+            elif column is None:
+                data[key] = computed[key](row)
+            else:
+                value = row[column]
+                if value is not None and convert is not None:
+                    value = convert(value)
+                data[key] = value
+        return data
+
+
+class CompiledListMixin:
+    """
+    List view mixin rendering its pages with `compiled_serializer_class`
+    when `COMPILED_SERIALIZERS` is on and the view would otherwise use the
+    serializer it compiles, e.g. not for search results.
+    """
+    compiled_serializer_class = None
+
+    def use_compiled(self):
+        compiled = self.compiled_serializer_class
+        return (settings.COMPILED_SERIALIZERS and compiled is not None and
+                self.get_serializer_class() is compiled.serializer_class)
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_compiled():
+            return super().list(request, *args, **kwargs)
+        return self.compiled_list()
+
+    def compiled_list(self):
+        compiled = self.compiled_serializer_class(
+            context=self.get_serializer_context())
+        queryset = self.filter_queryset(self.get_queryset())
+
+        # Keyset pagination reads its position from the ordering columns.
+        columns = ()
+        if hasattr(self.paginator, 'get_ordering'):
+            columns = ['id' if field == 'pk' else field for field, _, _ in
+                       self.paginator.get_ordering(queryset, self)]
+        rows = compiled.values(queryset, columns)
+
+        page = self.paginate_queryset(rows)
+        data = compiled.represent(rows if page is None else page)
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
@@ -0,0 +1,39 @@
+"""
+Helpers for answering conditional GET requests.
+
+Views compute an ETag, and a Last-Modified date where one column tracks
+every change, from a cheap query or a version counter, before loading
+and serializing anything, and return early with a 304 when the client's
+copy is still current.
+"""
+from hashlib import md5
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def make_etag(*parts):
+    """ Build a strong ETag from the values a representation depends on. """
+    return '"{}"'.format(md5(repr(parts).encode('utf-8')).hexdigest())
+
+
+def set_validators(response, etag=None, last_modified=None):
+    """ Send the ETag and Last-Modified validators with `response`. """
+    if etag is not None:
+        response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+def not_modified(request, etag=None, last_modified=None):
+    """
+    Return the 304 (or 412) response the request's preconditions call for,
+    or None when the view should build the full response.
+    """
+    response = get_conditional_response(
+        request, etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
@@ -0,0 +1,15 @@
+"""
+Database backends keeping connections open across requests.
+
+`authors.apps.core.db.postgresql` and `authors.apps.core.db.sqlite3`
+wrap Django's backends of the same name with `PersistentConnectionMixin`,
+which adds two settings to each `DATABASES` entry:
+
+- `CONN_HEALTH_CHECKS`: check that a connection kept open by
+  `CONN_MAX_AGE` still answers before a new request uses it, instead of
+  failing that request when the server dropped it in between.
+- `POOL`: a dict of `SIZE`, `TIMEOUT` and `MAX_AGE` handing connections
+  back to an in-process `ConnectionPool` when Django closes them, so the
+  threads of a worker share `SIZE` connections instead of opening one
+  per request or keeping one each.
+"""
@@ -0,0 +1,144 @@
+import threading
+import time
+from collections import Counter
+
+from django.db import OperationalError
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+class ConnectionPool:
+    """
+    Open DB-API connections shared by the threads of one process.
+
+    At most `size` connections are open at a time, idle or in use, and
+    callers wait up to `timeout` seconds for one to be released once they
+    all are. Idle connections are handed out most recently released
+    first, so that the ones left over after a burst grow old and are
+    replaced once they are `max_age` seconds old. With `check`, an idle
+    connection must answer `SELECT 1` before it is handed out again.
+    """
+
+    def __init__(self, size, timeout=30, max_age=None, check=True):
+        self.size = size
+        self.timeout = timeout
+        self.max_age = max_age
+        self.check = check
+        self.condition = threading.Condition()
+        self.idle = []
+        self.opened = 0
+        self.born = {}
+        self.stats = Counter()
+
+    def acquire(self, connect):
+        """ Return an idle connection, or one opened with `connect()`. """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self.condition:
+                connection = self.take(deadline)
+            if connection is None:
+                return self.open(connect)
+            if self.usable(connection):
+                self.stats['reused'] += 1
+                return connection
+            self.discard(connection)
+
+    def take(self, deadline):
+        """
+        Pop an idle connection, or return None after reserving room for a
+        new one. Must be called holding the condition.
+        """
+        while True:
+            if self.idle:
+                return self.idle.pop()
+            if self.opened < self.size:
+                self.opened += 1
+                return None
+            self.stats['waited'] += 1
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.condition.wait(remaining):
+                raise PoolTimeout(
+                    'No database connection was released within {} seconds.'
+                    .format(self.timeout))
+
+    def open(self, connect):
+        try:
+            connection = connect()
+        except Exception:
+            with self.condition:
+                self.opened -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.born[id(connection)] = time.monotonic()
+            self.stats['opened'] += 1
+        return connection
+
+    def usable(self, connection):
+        born = self.born.get(id(connection), 0)
+        if self.max_age is not None and time.monotonic() - born >= self.max_age:
+            return False
+        if not self.check:
+            return True
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute('SELECT 1')
+            finally:
+                cursor.close()
+        except Exception:
+            return False
+        return True
+
+    def release(self, connection, discard=False):
+        """ Hand `connection` back, or close it for good with `discard`. """
+        if discard:
+            self.discard(connection)
+            return
+        with self.condition:
+            self.idle.append(connection)
+            self.condition.notify()
+
+    def discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self.condition:
+            self.opened -= 1
+            self.born.pop(id(connection), None)
+            self.stats['discarded'] += 1
+            self.condition.notify()
+
+    def close(self):
+        """ Close every idle connection. """
+        with self.condition:
+            idle, self.idle = self.idle, []
+        for connection in idle:
+            self.discard(connection)
+
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+def get_pool(key, **options):
+    """
+    Return the pool stored under `key`, an (alias, connection parameters)
+    pair, creating it from `options`.
+    """
+    with pools_lock:
+        if key not in pools:
+            pools[key] = ConnectionPool(**options)
+        return pools[key]
+
+
+def close_pools(alias=None):
+    """ Close the idle connections of every pool, or only those of `alias`. """
+    with pools_lock:
+        keys = [key for key in pools if alias is None or key[0] == alias]
+        closed = [pools.pop(key) for key in keys]
+    for pool in closed:
+        pool.close()
@@ -0,0 +1,11 @@
+from django.db.backends.postgresql import base
+
+from ..wrapper import PersistentConnectionMixin
+
+
+class DatabaseWrapper(PersistentConnectionMixin, base.DatabaseWrapper):
+
+    def init_pooled_connection(self, connection):
+        # Django's `get_new_connection()` only sets this on new connections.
+        self.isolation_level = self.settings_dict['OPTIONS'].get(
+            'isolation_level', connection.isolation_level)
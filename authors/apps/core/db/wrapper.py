@@ -0,0 +1,78 @@
+import time
+from functools import partial
+
+from .pool import get_pool
+
+
+class PersistentConnectionMixin:
+    """
+    `DatabaseWrapper` mixin adding the `CONN_HEALTH_CHECKS` and `POOL`
+    settings described in `authors.apps.core.db`.
+
+    Django calls `close_if_unusable_or_obsolete()` when every request
+    starts and finishes; the first query after that re-checks a reused
+    connection. With a pool, closing the wrapper releases its connection
+    to the pool, which happens at the end of every request when
+    `CONN_MAX_AGE` is 0.
+    """
+    health_check_done = False
+    pool = None
+    # Connections opened by this wrapper and the time spent opening them,
+    # as opposed to those taken from the pool.
+    connections_opened = 0
+    connect_seconds = 0.0
+
+    def connect(self):
+        # `connect()` sets autocommit through `ensure_connection()`, when a
+        # check would open a transaction on the brand new connection.
+        self.health_check_done = True
+        super().connect()
+
+    def ensure_connection(self):
+        if (self.connection is not None and not self.health_check_done and
+                self.settings_dict.get('CONN_HEALTH_CHECKS')):
+            self.health_check_done = True
+            if not self.in_atomic_block and not self.is_usable():
+                self.close()
+        super().ensure_connection()
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def get_pool(self, conn_params):
+        options = self.settings_dict.get('POOL')
+        if not options or not options.get('SIZE'):
+            return None
+        key = (self.alias, repr(sorted(conn_params.items())))
+        return get_pool(
+            key, size=options['SIZE'], timeout=options.get('TIMEOUT', 30),
+            max_age=options.get('MAX_AGE'),
+            check=bool(self.settings_dict.get('CONN_HEALTH_CHECKS')))
+
+    def get_new_connection(self, conn_params):
+        self.pool = self.get_pool(conn_params)
+        if self.pool is None:
+            return self.open_connection(conn_params)
+        connection = self.pool.acquire(partial(self.open_connection, conn_params))
+        self.init_pooled_connection(connection)
+        return connection
+
+    def open_connection(self, conn_params):
+        start = time.perf_counter()
+        connection = super().get_new_connection(conn_params)
+        self.connect_seconds += time.perf_counter() - start
+        self.connections_opened += 1
+        return connection
+
+    def init_pooled_connection(self, connection):
+        """ Restore the wrapper state tied to a reused connection. """
+
+    def _close(self):
+        if self.pool is None or self.connection is None:
+            return super()._close()
+        pool, self.pool = self.pool, None
+        # Connections left mid-transaction or after errors are not reused.
+        reusable = (not self.in_atomic_block and not self.errors_occurred and
+                    self.autocommit == self.settings_dict['AUTOCOMMIT'])
+        pool.release(self.connection, discard=not reusable)
@@ -1,6 +1,7 @@
 """ Core mail sender"""
 from django.template.loader import render_to_string
-from django.core.mail import EmailMessage
+
+from .models import OutboundEmail
 
 
 class SendMail:
@@ -14,11 +15,12 @@ class SendMail:
         self.request = request
 
     def send(self):
-        """ Send mail. """
+        """
+        Queue the mail in the outbox. It is delivered by the
+        `send_queued_mail` management command.
+        """
         message = render_to_string(
             self.template_name, context=self.context, request=self.request)
-        mail = EmailMessage(
-            subject=self.subject, body=message, to=self.to
+        return OutboundEmail.objects.create(
+            subject=self.subject, body=message, to=list(self.to)
         )
-        mail.content_subtype = "html"
-        mail.send()
@@ -0,0 +1,146 @@
+"""
+Sparse fieldsets and embed control.
+
+`?fields=title,slug,author.username` keeps only the listed fields of a
+representation, with dotted names reaching into embedded objects, and
+`?expand=author` lists the embedded objects to send in full. When
+`expand` is given, embeds left out of it are collapsed to their key,
+e.g. the author's username; without it every embed is sent in full as
+before.
+
+Views put the `FieldSelection` of the request in the serializer context
+and also use it to narrow their queries, so that columns, annotations
+and prefetches nobody asked for are not loaded either.
+"""
+import copy
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def split_names(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+class FieldSelection:
+
+    def __init__(self, fields=None, expand=None):
+        # Field names mapped to the selection of their own fields, or to
+        # None for all of them. None selects every field.
+        self.fields = fields
+        # Names of the embeds to send in full, or None for all of them.
+        self.expand = expand
+
+    @classmethod
+    def from_request(cls, request):
+        """ Return the selection of `request`, or None if it has none. """
+        params = request.query_params
+        if FIELDS_PARAM not in params and EXPAND_PARAM not in params:
+            return None
+
+        fields = None
+        if FIELDS_PARAM in params:
+            fields = {}
+            for name in split_names(params[FIELDS_PARAM]):
+                name, _, nested = name.partition('.')
+                if nested:
+                    if fields.get(name, {}) is not None:
+                        fields.setdefault(name, {})[nested] = None
+                else:
+                    fields[name] = None
+
+        expand = None
+        if EXPAND_PARAM in params:
+            expand = set(split_names(params[EXPAND_PARAM]))
+        return cls(fields, expand)
+
+    def wants(self, name):
+        return self.fields is None or name in self.fields
+
+    def expands(self, name):
+        """ Whether the embed `name` is sent in full rather than collapsed. """
+        return self.expand is None or name in self.expand or bool(
+            self.fields and self.fields.get(name))
+
+    def nested(self, name):
+        """ The selection within the embed `name`, or None for all of it. """
+        if self.fields is None or self.fields.get(name) is None:
+            return None
+        return FieldSelection(self.fields[name])
+
+    def key(self):
+        """ A stable text form of the selection, e.g. for ETags. """
+        fields = None if self.fields is None else sorted(
+            (name, sorted(nested or ())) for name, nested in self.fields.items())
+        return repr((fields, None if self.expand is None else sorted(self.expand)))
+
+    def prune(self, data, collapsed=None):
+        """
+        Apply the selection to an already serialized `data` dict, where
+        `collapsed` maps each embed to the key it collapses to.
+        """
+        pruned = {}
+        for name, value in data.items():
+            if not self.wants(name):
+                continue
+            if collapsed and name in collapsed and not self.expands(name):
+                value = value[collapsed[name]] if value is not None else None
+            elif isinstance(value, dict) and self.nested(name) is not None:
+                value = self.nested(name).prune(value)
+            pruned[name] = value
+        return pruned
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin dropping the fields left out of the `selection` in
+    its context. Nested serializers using it follow the dotted part of the
+    selection for their own field name.
+
+    `collapsed_fields` maps each embed to the field that replaces it when
+    it is collapsed.
+    """
+    collapsed_fields = {}
+
+    def get_selection(self):
+        path = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                path.append(node.field_name)
+            node = node.parent
+
+        selection = node.context.get('selection')
+        for name in reversed(path):
+            if selection is None:
+                break
+            selection = selection.nested(name)
+        return selection
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selection = self.get_selection()
+        if selection is None:
+            return fields
+
+        for name in list(fields):
+            if not selection.wants(name):
+                del fields[name]
+            elif name in self.collapsed_fields and not selection.expands(name):
+                fields[name] = copy.deepcopy(self.collapsed_fields[name])
+        return fields
+
+
+class SparseFieldsViewMixin:
+    """ View mixin handing the request's `FieldSelection` to serializers. """
+
+    @property
+    def selection(self):
+        if not hasattr(self, '_selection'):
+            self._selection = FieldSelection.from_request(self.request)
+        return self._selection
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['selection'] = self.selection
+        return context
@@ -0,0 +1,135 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    override_settings, setup_databases, setup_test_environment,
+    teardown_databases, teardown_test_environment)
+
+from authors.benchmarks import data, report
+from authors.benchmarks.runner import (
+    COMPILED_ENDPOINTS, ENDPOINTS, ClientTransport, HttpTransport, run)
+
+
+class Command(BaseCommand):
+    help = ('Benchmark the API endpoints on generated data and write, or '
+            'compare against, a JSON baseline of their latency percentiles '
+            'and query counts.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--articles', type=int, default=200)
+        parser.add_argument(
+            '--iterations', type=int, default=50,
+            help='Timed requests per endpoint.')
+        parser.add_argument(
+            '--warmup', type=int, default=5,
+            help='Untimed requests sent to each endpoint first.')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument(
+            '--endpoint', action='append', dest='endpoints',
+            choices=[endpoint.name for endpoint in ENDPOINTS],
+            help='Only benchmark this endpoint; may be repeated.')
+        parser.add_argument(
+            '--output', default='-',
+            help='File to write the results to, or - for standard output.')
+        parser.add_argument(
+            '--compare', metavar='BASELINE',
+            help='Fail if the results regress against this baseline file.')
+        parser.add_argument(
+            '--tolerance', type=float, default=0.25,
+            help='Allowed relative growth of p95 latencies with --compare.')
+        parser.add_argument(
+            '--base-url',
+            help='Benchmark the server at this URL, e.g. a local gunicorn '
+                 'using the same database, instead of the test client.')
+        parser.add_argument(
+            '--generate', action='store_true',
+            help='With --base-url, generate the data into the configured '
+                 'database first.')
+        parser.add_argument(
+            '--serializer-speedup', action='store_true',
+            help='Also time the list endpoints with the DRF and with the '
+                 'compiled serializers, and report the speedup.')
+
+    def handle(self, *args, **options):
+        endpoints = [
+            endpoint for endpoint in ENDPOINTS
+            if not options['endpoints'] or endpoint.name in options['endpoints']]
+        sizes = {key: options[key] for key in ('users', 'articles', 'seed')}
+        if options['serializer_speedup'] and options['base_url']:
+            raise CommandError(
+                '--serializer-speedup switches serializers in process and '
+                'cannot be used with --base-url.')
+
+        speedup = None
+        if options['base_url']:
+            dataset = data.generate(**sizes) if options['generate'] else data.load()
+            transport = HttpTransport(options['base_url'])
+            samples = self.run(dataset, transport, endpoints, options)
+        else:
+            # The test client runs against a throwaway copy of the database
+            # so the generated data never reaches the configured one.
+            setup_test_environment()
+            old_config = setup_databases(verbosity=0, interactive=False)
+            try:
+                dataset = data.generate(**sizes)
+                transport = ClientTransport()
+                samples = self.run(dataset, transport, endpoints, options)
+                if options['serializer_speedup']:
+                    speedup = self.compare_serializers(
+                        dataset, transport, endpoints, options)
+            finally:
+                teardown_databases(old_config, verbosity=0)
+                teardown_test_environment()
+
+        results = report.build(
+            samples, transport=transport.name, iterations=options['iterations'],
+            **sizes)
+        if speedup is not None:
+            results['serializers'] = speedup
+        self.write(results, options['output'])
+
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as baseline:
+                regressions = report.compare(
+                    json.load(baseline), results, options['tolerance'])
+            if regressions:
+                raise CommandError('Regressed against {}:\n  {}'.format(
+                    options['compare'], '\n  '.join(regressions)))
+            self.stderr.write('No regressions against {}.'.format(
+                options['compare']))
+
+    def run(self, dataset, transport, endpoints, options):
+        self.stderr.write('Benchmarking {} endpoints over {} articles.'.format(
+            len(endpoints), len(dataset.slugs)))
+        return run(dataset, transport, options['iterations'],
+                   options['warmup'], endpoints, options['seed'])
+
+    def compare_serializers(self, dataset, transport, endpoints, options):
+        endpoints = [
+            endpoint for endpoint in endpoints
+            if endpoint.name in COMPILED_ENDPOINTS]
+        summaries = []
+        for compiled in (False, True):
+            with override_settings(COMPILED_SERIALIZERS=compiled):
+                samples = self.run(dataset, transport, endpoints, options)
+            summaries.append({
+                name: report.summarise(endpoint_samples)
+                for name, endpoint_samples in samples.items()})
+
+        speedup = report.speedup(*summaries)
+        for name, entry in sorted(speedup.items()):
+            self.stderr.write(
+                '{}: p50 {:.1f}ms with DRF serializers, {:.1f}ms compiled '
+                '({:.2f}x)'.format(name, entry['drf_p50_ms'],
+                                   entry['compiled_p50_ms'], entry['speedup']))
+        return speedup
+
+    def write(self, results, output):
+        if output == '-':
+            report.dump(results, sys.stdout)
+            return
+        with open(output, 'w', encoding='utf-8') as target:
+            report.dump(results, target)
+        self.stderr.write('Wrote {}.'.format(output))
@@ -0,0 +1,49 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from authors.apps.core.db.wrapper import PersistentConnectionMixin
+from authors.benchmarks import connections as benchmark, report
+
+
+class Command(BaseCommand):
+    help = ('Compare opening a database connection per request with '
+            'persistent and pooled connections, and write the connections '
+            'opened and request latencies of each as JSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument(
+            '--requests', type=int, default=200,
+            help='Request cycles run by each thread.')
+        parser.add_argument('--threads', type=int, default=4)
+        parser.add_argument(
+            '--output', default='-',
+            help='File to write the results to, or - for standard output.')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if not isinstance(connection, PersistentConnectionMixin):
+            raise CommandError(
+                'The {} database does not use a backend from '
+                'authors.apps.core.db.'.format(options['database']))
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            raise CommandError(
+                'In-memory SQLite databases are never closed; use a file.')
+
+        results = benchmark.run(
+            options['database'], options['requests'], options['threads'])
+        for name, entry in results.items():
+            self.stderr.write(
+                '{}: {} connections for {} requests, {:.3f}ms connecting and '
+                '{:.3f}ms p50 per request'.format(
+                    name, entry['connections_opened'], entry['requests'],
+                    entry['connect_ms_per_request'], entry['p50_ms']))
+
+        if options['output'] == '-':
+            report.dump(results, sys.stdout)
+            return
+        with open(options['output'], 'w', encoding='utf-8') as target:
+            report.dump(results, target)
+        self.stderr.write('Wrote {}.'.format(options['output']))
@@ -0,0 +1,94 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from authors.apps.core.models import OutboundEmail
+
+
+class Command(BaseCommand):
+    help = 'Deliver the mail queued in the outbox over a reused SMTP connection.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.EMAIL_QUEUE_BATCH_SIZE,
+            help='Number of messages claimed and sent per batch.')
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Seconds to sleep when the outbox is empty.')
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Drain the messages that are due and exit.')
+
+    def handle(self, *args, **options):
+        connection = get_connection()
+        try:
+            while True:
+                sent = self.send_batch(connection, options['batch_size'])
+                if sent:
+                    continue
+                if options['once']:
+                    break
+                # Do not hold the relay connection open while idle.
+                connection.close()
+                time.sleep(options['interval'])
+        finally:
+            connection.close()
+
+    def send_batch(self, connection, batch_size):
+        """
+        Claim up to `batch_size` due messages and try to send them.
+
+        Rows stay locked until the batch is done, and locked rows are
+        skipped, so several workers can drain the same outbox.
+        """
+        with transaction.atomic():
+            batch = list(OutboundEmail.objects.select_for_update(
+                skip_locked=True
+            ).filter(
+                status=OutboundEmail.PENDING,
+                next_attempt_at__lte=timezone.now()
+            ).order_by('next_attempt_at', 'pk')[:batch_size])
+
+            if not batch:
+                return 0
+
+            try:
+                connection.open()
+            except Exception as error:
+                # The relay is unreachable: the whole batch waits for a retry.
+                self.stderr.write('Could not connect: {}'.format(error))
+                for email in batch:
+                    self.record_failure(email, error)
+                    email.attempts += 1
+                    email.save()
+                return len(batch)
+
+            for email in batch:
+                try:
+                    email.to_message(connection).send()
+                except Exception as error:
+                    self.record_failure(email, error)
+                else:
+                    email.status = OutboundEmail.SENT
+                    email.sent_at = timezone.now()
+                    email.last_error = ''
+                email.attempts += 1
+                email.save()
+
+        self.stdout.write('Processed {} queued emails.'.format(len(batch)))
+        return len(batch)
+
+    def record_failure(self, email, error):
+        """ Schedule a retry with exponential backoff, or give up. """
+        email.last_error = str(error)
+        if email.attempts + 1 >= settings.EMAIL_QUEUE_MAX_ATTEMPTS:
+            email.status = OutboundEmail.FAILED
+            return
+
+        delay = settings.EMAIL_QUEUE_RETRY_DELAY * 2 ** email.attempts
+        email.next_attempt_at = timezone.now() + timedelta(seconds=delay)
@@ -0,0 +1,296 @@
+"""
+Per-route request metrics.
+
+`MetricsMiddleware` times every request and, while it runs, counts the
+SQL queries sent on each database connection together with the time
+spent in them and in rendering the response. Views using
+`SerializerMetricsMixin`, and compiled serializers, also add the time
+spent building serializer data. The numbers feed histograms kept per
+route, which `render_metrics()` exposes in the Prometheus text format.
+
+Requests running the same SQL statement at least
+`METRICS_DUPLICATE_QUERY_THRESHOLD` times, the usual sign of an N+1
+loop, are counted and logged with the view that ran them.
+
+Histograms live in the memory of each process, so every worker of a
+multi-process server reports its own share of the traffic.
+"""
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, HttpResponse
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+HISTOGRAMS = OrderedDict([
+    ('authors_request_duration_seconds',
+     ('Time taken to answer the request.', DURATION_BUCKETS)),
+    ('authors_request_queries',
+     ('Number of SQL queries run by the request.', QUERY_BUCKETS)),
+    ('authors_request_sql_seconds',
+     ('Time spent running SQL queries.', DURATION_BUCKETS)),
+    ('authors_request_serializer_seconds',
+     ('Time spent building serializer data.', DURATION_BUCKETS)),
+    ('authors_request_render_seconds',
+     ('Time spent rendering the response.', DURATION_BUCKETS)),
+])
+DUPLICATES = 'authors_request_duplicate_queries_total'
+# Any other method a client makes up is labelled 'other', so that it does
+# not start new series.
+METHODS = frozenset((
+    'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS', 'TRACE'))
+
+current_metrics = ContextVar('current_metrics', default=None)
+
+
+class RequestMetrics:
+    """ What a single request spent its time on. """
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self.render_time = 0.0
+        self.statements = Counter()
+        self.serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """ Run a query through `connection.execute_wrapper()`. """
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.queries += 1
+            self.statements[sql] += 1
+
+    def duplicates(self, threshold):
+        """ Return the statements that ran at least `threshold` times. """
+        return [(sql, count) for sql, count in self.statements.most_common()
+                if count >= threshold]
+
+
+class Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.total += 1
+        self.sum += value
+
+    def samples(self):
+        """ Yield (le, cumulative count) pairs, ending with `+Inf`. """
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield format_value(bound), cumulative
+        yield '+Inf', self.total
+
+
+class MetricsRegistry:
+    """ Histograms and duplicate query counters keyed by route labels. """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {name: {} for name in HISTOGRAMS}
+            self.duplicates = {}
+
+    def record(self, labels, duration, metrics, threshold):
+        values = {
+            'authors_request_duration_seconds': duration,
+            'authors_request_queries': metrics.queries,
+            'authors_request_sql_seconds': metrics.sql_time,
+            'authors_request_serializer_seconds': metrics.serializer_time,
+            'authors_request_render_seconds': metrics.render_time,
+        }
+        duplicates = metrics.duplicates(threshold)
+        with self.lock:
+            for name, value in values.items():
+                series = self.histograms[name]
+                if labels not in series:
+                    series[labels] = Histogram(HISTOGRAMS[name][1])
+                series[labels].observe(value)
+            if duplicates:
+                self.duplicates[labels] = self.duplicates.get(labels, 0) + 1
+        return duplicates
+
+    def render(self):
+        """ Return every metric in the Prometheus text exposition format. """
+        lines = []
+        with self.lock:
+            for name, (help_text, _) in HISTOGRAMS.items():
+                lines.append('# HELP {} {}'.format(name, help_text))
+                lines.append('# TYPE {} histogram'.format(name))
+                for labels, histogram in sorted(self.histograms[name].items()):
+                    for bound, count in histogram.samples():
+                        lines.append('{}_bucket{} {}'.format(
+                            name, format_labels(labels + (('le', bound),)), count))
+                    lines.append('{}_sum{} {}'.format(
+                        name, format_labels(labels), format_value(histogram.sum)))
+                    lines.append('{}_count{} {}'.format(
+                        name, format_labels(labels), histogram.total))
+
+            lines.append('# HELP {} Requests that repeated a SQL statement '
+                         'at least the duplicate threshold.'.format(DUPLICATES))
+            lines.append('# TYPE {} counter'.format(DUPLICATES))
+            for labels, count in sorted(self.duplicates.items()):
+                lines.append('{}{} {}'.format(
+                    DUPLICATES, format_labels(labels), count))
+        return '\n'.join(lines) + '\n'
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def format_labels(labels):
+    return '{' + ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\')
+                         .replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels) + '}'
+
+
+registry = MetricsRegistry()
+
+
+def render_metrics():
+    return registry.render()
+
+
+@contextmanager
+def serializer_timer():
+    """
+    Add the time spent in the block to the serializer time of the current
+    request, unless the block runs within another timed serializer.
+    """
+    metrics = current_metrics.get()
+    if metrics is None or metrics.serializer_depth:
+        yield
+        return
+    metrics.serializer_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serializer_time += time.perf_counter() - start
+        metrics.serializer_depth -= 1
+
+
+class TimedDataMixin:
+    """ Serializer mixin timing `.data` with `serializer_timer()`. """
+
+    @property
+    def data(self):
+        with serializer_timer():
+            return super().data
+
+
+timed_classes = {}
+
+
+def timed_serializer(serializer):
+    """ Make `serializer`, a list serializer or not, time its `.data`. """
+    cls = type(serializer)
+    if not issubclass(cls, TimedDataMixin):
+        if cls not in timed_classes:
+            timed_classes[cls] = type(
+                cls.__name__, (TimedDataMixin, cls),
+                {'__module__': cls.__module__})
+        serializer.__class__ = timed_classes[cls]
+    return serializer
+
+
+class SerializerMetricsMixin:
+    """
+    Generic view mixin adding the time spent building the data of the
+    serializers from `get_serializer()` to the request's metrics.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        return timed_serializer(super().get_serializer(*args, **kwargs))
+
+
+class MetricsMiddleware:
+    """
+    Record the metrics of every request against the route that served it.
+
+    Requests that do not resolve to a view are grouped under the
+    `unmatched` route, so scanners cannot grow the number of series.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        duration = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        if match is not None and match.func is metrics_view:
+            return response
+        labels = route_labels(request, match)
+        duplicates = registry.record(
+            labels, duration, metrics, settings.METRICS_DUPLICATE_QUERY_THRESHOLD)
+        for sql, count in duplicates:
+            logger.warning(
+                'Possible N+1 queries in %s (%s %s): %d runs of %s',
+                dict(labels)['view'], request.method, request.path, count, sql)
+        return response
+
+    def process_template_response(self, request, response):
+        """ Time the rendering that follows this hook. """
+        metrics = current_metrics.get()
+        if metrics is not None:
+            start = time.perf_counter()
+
+            def rendered(response):
+                metrics.render_time += time.perf_counter() - start
+
+            response.add_post_render_callback(rendered)
+        return response
+
+
+def route_labels(request, match):
+    if match is None:
+        route, view = 'unmatched', 'unmatched'
+    else:
+        route, view = match.route, match._func_path
+    method = request.method if request.method in METHODS else 'other'
+    return (('method', method), ('route', route), ('view', view))
+
+
+def metrics_view(request):
+    """ Expose the metrics to the addresses listed in `INTERNAL_IPS`. """
+    if request.META.get('REMOTE_ADDR') not in settings.INTERNAL_IPS:
+        raise Http404
+    return HttpResponse(
+        render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
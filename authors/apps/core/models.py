@@ -1,4 +1,6 @@
+from django.core.mail import EmailMessage
 from django.db import models
+from django.utils import timezone
 
 
 class TimeModel(models.Model):
@@ -16,3 +18,58 @@ class TimeModel(models.Model):
         # per-model basis as needed, but reverse-chronological is a good
         # default ordering for most models.
         ordering = ['-created_at', '-updated_at']
+
+
+class SubqueryCount(models.Subquery):
+    """
+    Count the rows of a correlated subquery.
+
+    Unlike `Count()` this does not join the related table into the outer
+    query, so several counts can be annotated on the same queryset without
+    multiplying rows or adding a GROUP BY.
+    """
+    template = '(SELECT COUNT(*) FROM (%(subquery)s) _count)'
+    output_field = models.IntegerField()
+
+
+class OutboundEmail(TimeModel):
+    """
+    A message waiting in the outbox for the `send_queued_mail` worker.
+
+    Requests only insert rows here, so they never wait on the SMTP relay.
+    """
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'Pending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    )
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    content_subtype = models.CharField(max_length=20, default='html')
+    to = models.JSONField()
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta(TimeModel.Meta):
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return '{} to {}'.format(self.subject, ', '.join(self.to))
+
+    def to_message(self, connection=None):
+        message = EmailMessage(
+            subject=self.subject, body=self.body, to=self.to,
+            connection=connection
+        )
+        message.content_subtype = self.content_subtype
+        return message
@@ -0,0 +1,235 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from datetime import date, datetime
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination that seeks straight to the next page.
+
+    Pages are selected with a `WHERE (created_at, id) < (...)` style
+    condition on the ordering columns instead of an OFFSET, so every page
+    costs the same however deep the client has scrolled, as long as an
+    index covers the ordering. The ordering comes from an explicit
+    `order_by()` on the queryset (e.g. from `OrderingFilter`), from the
+    view's `keyset_ordering` or from `ordering` below, and is always made
+    unique by ending it with the primary key.
+
+    The envelope matches `LimitOffsetPagination` but `count` is an
+    estimate: the planner's row estimate on PostgreSQL, and a count capped
+    at `count_cap` rows elsewhere. It is exact when the first page holds
+    every row, and never less than the rows the page has seen.
+    """
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 100
+    page_size_query_param = 'limit'
+    cursor_query_param = 'cursor'
+    ordering = ('-created_at', '-id')
+    count_cap = 1000
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_page_size(request)
+        self.model = queryset.model
+        self.annotations = queryset.query.annotations
+        self.keys = self.get_ordering(queryset, view)
+
+        position, reverse = self.decode_cursor(request)
+        page = queryset.order_by(*self.order_by(reverse))
+        if position is not None:
+            page = page.filter(self.seek(position, reverse))
+
+        results = list(page[:self.limit + 1])
+        has_more = len(results) > self.limit
+        results = results[:self.limit]
+
+        if position is None and not has_more:
+            self.count = len(results)
+        else:
+            self.count = max(
+                self.estimate_count(queryset), len(results) + has_more)
+
+        if reverse:
+            results.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous, self.has_next = position is not None, has_more
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def get_ordering(self, queryset, view):
+        """ Return (field, descending, nullable) for each ordering key. """
+        ordering = list(queryset.query.order_by)
+        if not ordering or not all(isinstance(name, str) for name in ordering):
+            ordering = list(getattr(view, 'keyset_ordering', self.ordering))
+        pk_name = queryset.model._meta.pk.name
+        if ordering[-1].lstrip('-') not in ('pk', 'id', pk_name):
+            ordering.append(('-' if ordering[-1].startswith('-') else '') + 'id')
+
+        keys = []
+        for name in ordering:
+            field = name.lstrip('-')
+            try:
+                nullable = queryset.model._meta.get_field(field).null
+            except FieldDoesNotExist:
+                nullable = False
+            keys.append((field, name.startswith('-'), nullable))
+        return keys
+
+    def order_by(self, reverse):
+        """
+        Order by the keys, walking them backwards for previous pages.
+
+        Nullable keys always keep their NULLs after the values when going
+        forward so that the seek condition is the same on every database.
+        """
+        expressions = []
+        for field, descending, nullable in self.keys:
+            expression = F(field)
+            order = expression.desc if descending != reverse else expression.asc
+            if nullable:
+                expressions.append(order(nulls_first=reverse, nulls_last=not reverse))
+            else:
+                expressions.append(order())
+        return expressions
+
+    def seek(self, position, reverse):
+        """ Build the condition selecting rows past `position`. """
+        condition = Q(pk__in=[])
+        preceding = Q()
+        for (field, descending, nullable), value in zip(self.keys, position):
+            lookup = '{}__{}'.format(field, 'lt' if descending != reverse else 'gt')
+            if value is None:
+                beyond = Q(**{field + '__isnull': False}) if reverse else Q(pk__in=[])
+                same = Q(**{field + '__isnull': True})
+            else:
+                beyond = Q(**{lookup: value})
+                if nullable and not reverse:
+                    beyond |= Q(**{field + '__isnull': True})
+                same = Q(**{field: value})
+            condition |= preceding & beyond
+            preceding &= same
+        return condition
+
+    def estimate_count(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql':
+            sql, params = queryset.query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+                plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+        return queryset.order_by()[:self.count_cap].count()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            position, reverse = cursor['p'], bool(cursor.get('r'))
+            if not isinstance(position, list) or len(position) != len(self.keys):
+                raise ValueError
+            position = [self.to_python(field, value)
+                        for (field, _, _), value in zip(self.keys, position)]
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error,
+                ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def to_python(self, field, value):
+        """ Convert a cursor value the way its model field would. """
+        if value is None:
+            return None
+        if field in self.annotations:
+            model_field = self.annotations[field].output_field
+        elif field == 'pk':
+            model_field = self.model._meta.pk
+        else:
+            try:
+                model_field = self.model._meta.get_field(field)
+            except FieldDoesNotExist:
+                # A related column, compared as it was encoded.
+                return value
+        return model_field.to_python(value)
+
+    def encode_cursor(self, item, reverse):
+        position = []
+        for field, _, _ in self.keys:
+            if isinstance(item, dict):
+                # A `.values()` row, see `authors.apps.core.compiled`.
+                value = item['id' if field == 'pk' else field]
+            else:
+                value = getattr(item, 'pk' if field in ('id', 'pk') else field)
+            if isinstance(value, (date, datetime)):
+                value = value.isoformat()
+            position.append(value)
+
+        cursor = {'p': position}
+        if reverse:
+            cursor['r'] = 1
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(cursor, separators=(',', ':')).encode('utf-8'))
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encoded.decode('ascii'))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(
+                self.request.build_absolute_uri(), self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+
+class LinkHeaderKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination that leaves the response body a plain list and
+    sends the page links in a `Link` header instead, for endpoints whose
+    list responses predate pagination.
+    """
+
+    def get_paginated_response(self, data):
+        links = [
+            '<{}>; rel="{}"'.format(url, rel)
+            for url, rel in ((self.get_next_link(), 'next'),
+                             (self.get_previous_link(), 'prev'))
+            if url is not None
+        ]
+        headers = {'Link': ', '.join(links)} if links else None
+        return Response(data, headers=headers)
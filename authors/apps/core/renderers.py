@@ -1,10 +1,18 @@
-import json
-
 from rest_framework.renderers import JSONRenderer
-from rest_framework.utils.serializer_helpers import ReturnList
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - the C encoder is optional
+    orjson = None
 
 
 class AuthorsJSONRenderer(JSONRenderer):
+    """
+    Render data wrapped in a `{label: data}` envelope.
+
+    The envelope is built around the serialized data and encoded once,
+    using orjson when it is installed and DRF's encoder otherwise.
+    """
     charset = 'utf-8'
     object_label = 'object'
     object_label_plural = 'objects'
@@ -12,24 +20,23 @@ class AuthorsJSONRenderer(JSONRenderer):
     def render(self, data, media_type=None, renderer_context=None):
         if data is None:
             return
-        if isinstance(data, ReturnList):
-            _data = json.loads(
-                super(AuthorsJSONRenderer, self).render(data).decode('utf-8')
-            )
-
-            return json.dumps({
-                self.object_label_plural: _data
-            })
-        else:
-            # If the view throws an error (such as the user can't be authenticated
-            # or something similar), `data` will contain an `errors` key. We want
-            # the default JSONRenderer to handle rendering errors, so we need to
-            # check for this case.
-            errors = data.get('errors', None)
-
-            if errors is not None:
-                return super(AuthorsJSONRenderer, self).render(data)
-
-            return json.dumps({
-                self.object_label: data
-            })
+        if isinstance(data, list):
+            data = {self.object_label_plural: data}
+        # If the view throws an error (such as the user can't be authenticated
+        # or something similar), `data` will contain an `errors` key. We want
+        # to render errors as they are, without the envelope.
+        elif data.get('errors', None) is None:
+            data = {self.object_label: data}
+
+        return self.encode(data, media_type, renderer_context)
+
+    def encode(self, data, media_type=None, renderer_context=None):
+        """ Encode `data` to JSON bytes in a single pass. """
+        indent = self.get_indent(media_type, renderer_context or {})
+        if orjson is None or indent:
+            return super(AuthorsJSONRenderer, self).render(
+                data, media_type, renderer_context)
+
+        # Anything orjson cannot encode natively (lazy strings, decimals,
+        # querysets...) is handed to DRF's encoder.
+        return orjson.dumps(data, default=self.encoder_class().default)
@@ -0,0 +1,160 @@
+"""
+Read replica routing.
+
+`ReplicaRouter` sends the reads of requests to one of the
+`DATABASE_REPLICAS`, picked per request, and every write to the primary
+`default` database. Replicas lag behind the primary, so a client that
+just wrote would not see its own new article or comment on the next
+page it loads: `PrimaryStickinessMiddleware` pins such clients to the
+primary for `PRIMARY_STICKINESS_SECONDS` after the write.
+
+The pin follows the user in the JWT the API's clients send with every
+request, recorded in the default cache, which must therefore be shared
+by all workers: unless `SHARED_CACHE` is on, every read goes to the
+primary and the replicas are left unused. Cross-origin clients do not send cookies, since
+`CORS_ALLOW_CREDENTIALS` is off, so the signed cookie also set on the
+response to a write only serves same-origin and session clients.
+
+Requests that may write (POST, PUT, PATCH, DELETE) read from the primary
+throughout, as do transactions and code running outside of requests,
+such as management commands.
+"""
+import random
+from contextvars import ContextVar
+
+import jwt
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.authentication import get_authorization_header
+
+from authors.apps.authentication.backends import user_cache
+
+PRIMARY_COOKIE = 'primary_pin'
+PRIMARY_COOKIE_SALT = 'authors.apps.core.routers'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+current_routing = ContextVar('current_routing', default=None)
+
+
+class RoutingState:
+    """ Where the reads of the current request go. """
+
+    def __init__(self, replica=None):
+        # The replica alias for this request's reads, or None to read from
+        # the primary.
+        self.replica = replica
+        self.wrote = False
+        # Transactions the primary was already in when the request began,
+        # e.g. those of a test case.
+        self.atomic_depth = atomic_depth()
+
+    def in_transaction(self):
+        return atomic_depth() > self.atomic_depth
+
+
+def atomic_depth():
+    """ How many `atomic()` blocks the primary's connection is in. """
+    connection = connections[DEFAULT_DB_ALIAS]
+    if not connection.in_atomic_block:
+        return 0
+    # Every block within the outermost one pushes an entry, savepoint or not.
+    return 1 + len(connection.savepoint_ids)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        state = current_routing.get()
+        if state is None or state.replica is None:
+            return DEFAULT_DB_ALIAS
+        # Reads inside a transaction must see what it wrote.
+        if state.in_transaction():
+            return DEFAULT_DB_ALIAS
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = current_routing.get()
+        if state is not None:
+            state.wrote = True
+            state.replica = None
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class PrimaryStickinessMiddleware:
+    """
+    Route the reads of each request and pin clients that wrote to the
+    primary for a while, see the module docstring.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        replica = None
+        if (replicas_enabled() and request.method in SAFE_METHODS and
+                not self.is_pinned(request)):
+            replica = random.choice(settings.DATABASE_REPLICAS)
+
+        state = RoutingState(replica)
+        token = current_routing.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_routing.reset(token)
+
+        if state.wrote and replicas_enabled():
+            self.pin(request, response)
+        return response
+
+    def pin(self, request, response):
+        window = settings.PRIMARY_STICKINESS_SECONDS
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            cache.set(pin_key(user.pk), True, window)
+        response.set_signed_cookie(
+            PRIMARY_COOKIE, '1', salt=PRIMARY_COOKIE_SALT, max_age=window,
+            httponly=True, samesite='Lax', secure=request.is_secure())
+
+    def is_pinned(self, request):
+        user_id = token_user_id(request)
+        if user_id is not None and cache.get(pin_key(user_id)):
+            return True
+        return request.get_signed_cookie(
+            PRIMARY_COOKIE, default=None, salt=PRIMARY_COOKIE_SALT,
+            max_age=settings.PRIMARY_STICKINESS_SECONDS) is not None
+
+
+def replicas_enabled():
+    """
+    Whether reads may go to the replicas: only with a cache shared by
+    all workers could a pin set by one worker keep another off them.
+    """
+    return bool(settings.DATABASE_REPLICAS) and settings.SHARED_CACHE
+
+
+def pin_key(user_id):
+    return 'primary-pin:{}'.format(user_id)
+
+
+def token_user_id(request):
+    """
+    Return the user id in the request's JWT, or None. The user is not
+    loaded, since that read would itself need routing.
+    """
+    header = get_authorization_header(request).split()
+    if len(header) != 2 or header[0].lower() != b'bearer':
+        return None
+    try:
+        return user_cache.decode(header[1].decode('utf-8')).get('id')
+    except (jwt.InvalidTokenError, UnicodeError):
+        return None
@@ -0,0 +1,60 @@
+import pickle
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+# Shared by every `DictCache`, like a cache server shared by processes.
+STORE = {}
+
+
+class DictCache(BaseCache):
+    """
+    An in-process stand-in for a shared cache such as Redis or Memcached.
+
+    Values are pickled like a network cache would, so callers only ever
+    get copies back, and every instance sees the same entries.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self.store = STORE.setdefault(location, {})
+
+    def _expiry(self, timeout):
+        timeout = self.get_backend_timeout(timeout)
+        return None if timeout is None else time.time() + timeout
+
+    def _live(self, key):
+        value, expiry = self.store.get(key, (None, None))
+        if expiry is not None and expiry <= time.time():
+            self.store.pop(key, None)
+            return None
+        return value
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_key(key, version)
+        if self._live(key) is not None:
+            return False
+        self.store[key] = (pickle.dumps(value), self._expiry(timeout))
+        return True
+
+    def get(self, key, default=None, version=None):
+        value = self._live(self.make_key(key, version))
+        return default if value is None else pickle.loads(value)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_key(key, version)
+        self.store[key] = (pickle.dumps(value), self._expiry(timeout))
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_key(key, version)
+        value = self._live(key)
+        if value is None:
+            return False
+        self.store[key] = (value, self._expiry(timeout))
+        return True
+
+    def delete(self, key, version=None):
+        return self.store.pop(self.make_key(key, version), None) is not None
+
+    def clear(self):
+        self.store.clear()
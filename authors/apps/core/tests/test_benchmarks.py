@@ -0,0 +1,67 @@
+from django.test import SimpleTestCase, TestCase
+
+from authors.benchmarks import data, report
+from authors.benchmarks.runner import ENDPOINTS, ClientTransport, Sample, run
+
+
+def baseline(**endpoint):
+    summary = {'errors': 0, 'p95_ms': 10.0, 'queries_max': 5}
+    summary.update(endpoint)
+    return {'endpoints': {'articles': summary}}
+
+
+class BenchmarkReportTestCase(SimpleTestCase):
+    """ Tests for the summaries and comparisons of benchmark runs. """
+
+    def test_percentiles_use_the_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(report.percentile(values, 50), 50)
+        self.assertEqual(report.percentile(values, 99), 99)
+        self.assertEqual(report.percentile([7], 95), 7)
+
+    def test_summary(self):
+        samples = [Sample(200, 0.001 * index, 3) for index in range(1, 21)]
+        samples.append(Sample(500, 0.5, 4))
+        summary = report.summarise(samples)
+
+        self.assertEqual(summary['requests'], 21)
+        self.assertEqual(summary['errors'], 1)
+        self.assertEqual(summary['p50_ms'], 11.0)
+        self.assertEqual(summary['p99_ms'], 500.0)
+        self.assertEqual(summary['queries_p50'], 3)
+        self.assertEqual(summary['queries_max'], 4)
+
+    def test_extra_queries_are_regressions(self):
+        regressions = report.compare(baseline(), baseline(queries_max=6))
+        self.assertEqual(regressions, ['articles: 6 queries, baseline 5'])
+
+    def test_latency_within_tolerance_is_accepted(self):
+        self.assertEqual(
+            report.compare(baseline(), baseline(p95_ms=12.0), 0.25), [])
+        self.assertEqual(len(
+            report.compare(baseline(), baseline(p95_ms=13.0), 0.25)), 1)
+
+    def test_serializer_speedup(self):
+        speedup = report.speedup(
+            {'articles': {'p50_ms': 12.0}, 'tags': {'p50_ms': 1.0}},
+            {'articles': {'p50_ms': 4.0}})
+        self.assertEqual(speedup, {'articles': {
+            'drf_p50_ms': 12.0, 'compiled_p50_ms': 4.0, 'speedup': 3.0}})
+
+
+class BenchmarkRunTestCase(TestCase):
+    """ A small benchmark run against generated data. """
+
+    def test_every_endpoint_answers(self):
+        dataset = data.generate(users=4, articles=6, seed=3)
+        samples = run(dataset, ClientTransport(), iterations=2, warmup=1)
+        results = report.build(samples, seed=3)
+
+        self.assertEqual(len(dataset.slugs), 6)
+        self.assertEqual(
+            sorted(results['endpoints']),
+            sorted(endpoint.name for endpoint in ENDPOINTS))
+        for name, summary in results['endpoints'].items():
+            self.assertEqual(summary['errors'], 0, name)
+            self.assertEqual(summary['requests'], 2)
+        self.assertEqual(report.compare(results, results), [])
@@ -0,0 +1,136 @@
+import os
+import shutil
+import tempfile
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.db.utils import load_backend
+from django.test import SimpleTestCase
+
+from authors.apps.core.db.pool import ConnectionPool, PoolTimeout
+from authors.apps.core.db.sqlite3.base import DatabaseWrapper
+from authors.benchmarks.connections import MODES, mode_settings, simulate
+
+
+class FakeConnection:
+
+    def __init__(self, alive=True):
+        self.alive = alive
+        self.closed = False
+
+    def cursor(self):
+        if not self.alive:
+            raise OSError('server closed the connection')
+        return mock.Mock()
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTestCase(SimpleTestCase):
+    """ Tests for the in-process connection pool. """
+
+    def test_released_connections_are_reused(self):
+        pool = ConnectionPool(size=2)
+        first = pool.acquire(FakeConnection)
+        second = pool.acquire(FakeConnection)
+        pool.release(first)
+        pool.release(second)
+
+        self.assertIs(pool.acquire(FakeConnection), second)
+        self.assertIs(pool.acquire(FakeConnection), first)
+        self.assertEqual(pool.stats['opened'], 2)
+
+    def test_full_pool_times_out(self):
+        pool = ConnectionPool(size=1, timeout=0.01)
+        pool.acquire(FakeConnection)
+        with self.assertRaises(PoolTimeout):
+            pool.acquire(FakeConnection)
+
+    def test_dead_and_old_connections_are_replaced(self):
+        pool = ConnectionPool(size=1)
+        dead = pool.acquire(FakeConnection)
+        dead.alive = False
+        pool.release(dead)
+        self.assertIsNot(pool.acquire(FakeConnection), dead)
+        self.assertTrue(dead.closed)
+
+        pool = ConnectionPool(size=1, max_age=0)
+        old = pool.acquire(FakeConnection)
+        pool.release(old)
+        self.assertIsNot(pool.acquire(FakeConnection), old)
+
+    def test_failed_connects_free_their_slot(self):
+        pool = ConnectionPool(size=1, timeout=0.01)
+        with self.assertRaises(OSError):
+            pool.acquire(mock.Mock(side_effect=OSError))
+        self.assertIsInstance(pool.acquire(FakeConnection), FakeConnection)
+
+
+class ConnectionReuseTestCase(SimpleTestCase):
+    """ Connections kept across request cycles on an SQLite file. """
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.settings_dict = dict(
+            connection.settings_dict,
+            ENGINE='authors.apps.core.db.sqlite3',
+            NAME=os.path.join(directory, 'db.sqlite3'))
+
+    def test_connections_opened_per_mode(self):
+        opened = {}
+        for name, overrides in MODES:
+            opened[name], _, durations = simulate(
+                mode_settings(self.settings_dict, overrides, 2), 5, 2)
+            self.assertEqual(len(durations), 10)
+
+        self.assertEqual(opened['per-request'], 10)
+        self.assertEqual(opened['persistent'], 2)
+        self.assertLessEqual(opened['pooled'], 2)
+
+    def test_health_checks_replace_broken_connections(self):
+        wrapper = DatabaseWrapper(dict(
+            self.settings_dict, CONN_MAX_AGE=600, CONN_HEALTH_CHECKS=True))
+        self.addCleanup(wrapper.close)
+        wrapper.ensure_connection()
+        first = wrapper.connection
+
+        wrapper.close_if_unusable_or_obsolete()
+        with mock.patch.object(wrapper, 'is_usable', return_value=False):
+            wrapper.ensure_connection()
+        self.assertIsNot(wrapper.connection, first)
+        self.assertEqual(wrapper.connections_opened, 2)
+
+        # Only the first use in a request cycle is checked.
+        with mock.patch.object(wrapper, 'is_usable') as is_usable:
+            wrapper.ensure_connection()
+        is_usable.assert_not_called()
+
+    def test_new_connections_are_not_checked(self):
+        wrapper = DatabaseWrapper(dict(
+            self.settings_dict, CONN_MAX_AGE=600, CONN_HEALTH_CHECKS=True))
+        self.addCleanup(wrapper.close)
+        with mock.patch.object(wrapper, 'is_usable', side_effect=AssertionError):
+            wrapper.ensure_connection()
+        self.assertTrue(wrapper.get_autocommit())
+
+
+@skipUnless(connection.vendor == 'postgresql', 'PostgreSQL backend')
+class PostgresConnectionTestCase(SimpleTestCase):
+    """ Connections opened by the PostgreSQL backend with health checks. """
+
+    def test_connect_with_health_checks(self):
+        backend = load_backend('authors.apps.core.db.postgresql')
+        wrapper = backend.DatabaseWrapper(dict(
+            connection.settings_dict, CONN_MAX_AGE=600,
+            CONN_HEALTH_CHECKS=True, POOL=None))
+        self.addCleanup(wrapper.close)
+
+        wrapper.ensure_connection()
+        self.assertTrue(wrapper.get_autocommit())
+        wrapper.close_if_unusable_or_obsolete()
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            self.assertEqual(cursor.fetchone(), (1,))
+        self.assertEqual(wrapper.connections_opened, 1)
@@ -0,0 +1,128 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from authors.apps.core.email import SendMail
+from authors.apps.core.models import OutboundEmail
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    """ An email backend whose relay always refuses the message. """
+
+    def send_messages(self, email_messages):
+        raise ConnectionRefusedError('relay unavailable')
+
+
+class UnreachableEmailBackend(BaseEmailBackend):
+    """ An email backend whose relay cannot be connected to. """
+
+    def open(self):
+        raise ConnectionRefusedError('relay unreachable')
+
+    def send_messages(self, email_messages):
+        raise AssertionError('sent without a connection')
+
+
+def queue_mail():
+    return SendMail(
+        "reset_password_email.html",
+        {"verification_url": "http://localhost/", "username": "jake"},
+        to=["jake@jake.jake"], subject="Queued"
+    ).send()
+
+
+def drain_outbox():
+    call_command('send_queued_mail', '--once', stdout=StringIO())
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class OutboxTestCase(TestCase):
+    """ Tests for the outbound email queue and its worker. """
+
+    def test_send_queues_without_delivering(self):
+        """ SendMail should only store the rendered message. """
+        email = queue_mail()
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(email.status, OutboundEmail.PENDING)
+        self.assertIn("http://localhost/", email.body)
+
+    def test_worker_delivers_pending_mail(self):
+        """ The worker should send every due message and mark it sent. """
+        queue_mail()
+        queue_mail()
+        drain_outbox()
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[0].subject, "Queued")
+        self.assertEqual(mail.outbox[0].content_subtype, "html")
+        self.assertEqual(OutboundEmail.objects.filter(
+            status=OutboundEmail.SENT).count(), 2)
+
+    def test_worker_skips_mail_that_is_not_due(self):
+        """ Messages waiting for a retry should be left alone. """
+        email = queue_mail()
+        OutboundEmail.objects.filter(pk=email.pk).update(
+            next_attempt_at=timezone.now() + timedelta(minutes=5))
+        drain_outbox()
+
+        self.assertEqual(len(mail.outbox), 0)
+
+    @override_settings(
+        EMAIL_BACKEND='authors.apps.core.tests.test_email.FailingEmailBackend',
+        EMAIL_QUEUE_MAX_ATTEMPTS=2, EMAIL_QUEUE_RETRY_DELAY=60)
+    def test_failed_mail_is_retried_with_backoff(self):
+        """ Failures should back off and eventually give up. """
+        email = queue_mail()
+        drain_outbox()
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertIn("relay unavailable", email.last_error)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+
+        OutboundEmail.objects.update(next_attempt_at=timezone.now())
+        drain_outbox()
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.FAILED)
+        self.assertEqual(email.attempts, 2)
+
+    @override_settings(
+        EMAIL_BACKEND='authors.apps.core.tests.test_email.UnreachableEmailBackend',
+        EMAIL_QUEUE_MAX_ATTEMPTS=3, EMAIL_QUEUE_RETRY_DELAY=60)
+    def test_unreachable_relay_reschedules_the_batch(self):
+        """ A failed connection should back off every claimed message. """
+        queue_mail()
+        queue_mail()
+        call_command('send_queued_mail', '--once',
+                     stdout=StringIO(), stderr=StringIO())
+
+        for email in OutboundEmail.objects.all():
+            self.assertEqual(email.status, OutboundEmail.PENDING)
+            self.assertEqual(email.attempts, 1)
+            self.assertIn("relay unreachable", email.last_error)
+            self.assertGreater(email.next_attempt_at, timezone.now())
+
+    def test_worker_with_file_backend(self):
+        """ The worker should work with any connection based backend. """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        queue_mail()
+
+        with self.settings(
+                EMAIL_BACKEND='django.core.mail.backends.filebased.EmailBackend',
+                EMAIL_FILE_PATH=directory):
+            drain_outbox()
+
+        self.assertEqual(len(os.listdir(directory)), 1)
+        self.assertTrue(OutboundEmail.objects.get().sent_at)
@@ -0,0 +1,101 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import resolve
+from rest_framework.serializers import BaseSerializer
+
+from authors.apps.authentication.models import User
+from authors.apps.core.metrics import MetricsMiddleware, RequestMetrics, registry
+
+
+class MetricsTestCase(TestCase):
+    """ Tests for the request metrics middleware and endpoint. """
+
+    def setUp(self):
+        registry.reset()
+        self.addCleanup(registry.reset)
+
+    def test_requests_are_recorded_per_route(self):
+        """ Each request should add to the histograms of its route. """
+        self.client.get('/api/articles/')
+        self.client.get('/api/articles/')
+
+        response = self.client.get('/metrics')
+        text = response.content.decode()
+        labels = '{method="GET",route="%s",view="%s"}' % (
+            resolve('/api/articles/').route,
+            'authors.apps.articles.views.ArticleAPIView')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn('# TYPE authors_request_queries histogram', text)
+        self.assertIn('authors_request_queries_count' + labels + ' 2', text)
+        self.assertIn('authors_request_render_seconds_count' + labels + ' 2', text)
+        self.assertIn(
+            'authors_request_duration_seconds_bucket'
+            + labels[:-1] + ',le="+Inf"} 2', text)
+        self.assertNotIn('route="^metrics$"', text)
+
+    def test_query_and_serializer_work_is_measured(self):
+        """ Queries and serializer time should be attributed to the request. """
+        self.client.get('/api/articles/')
+
+        series = registry.histograms['authors_request_queries']
+        (histogram,) = series.values()
+        self.assertGreater(histogram.sum, 0)
+        (histogram,) = registry.histograms[
+            'authors_request_serializer_seconds'].values()
+        self.assertGreater(histogram.sum, 0)
+
+    def test_view_serializers_are_timed(self):
+        """ Serializers from `get_serializer()` time their data. """
+        user = User.objects.create_user('timed', 'timed@mail.com', 'Test123.')
+        response = self.client.get(
+            '/api/profiles/timed/', HTTP_AUTHORIZATION='Bearer ' + user.token)
+        self.assertEqual(response.status_code, 200)
+
+        (histogram,) = registry.histograms[
+            'authors_request_serializer_seconds'].values()
+        self.assertGreater(histogram.sum, 0)
+        self.assertFalse(hasattr(BaseSerializer.data.fget, 'timed'))
+
+    def test_unknown_methods_share_a_label(self):
+        """ Made up methods should not create series of their own. """
+        self.client.generic('BREW', '/api/articles/')
+        self.client.generic('PROPFIND', '/api/articles/')
+
+        text = self.client.get('/metrics').content.decode()
+        self.assertIn('authors_request_queries_count{method="other"', text)
+        self.assertNotIn('BREW', text)
+        self.assertNotIn('PROPFIND', text)
+
+    def test_metrics_are_internal(self):
+        """ Addresses outside INTERNAL_IPS should not see the metrics. """
+        response = self.client.get('/metrics', REMOTE_ADDR='10.1.2.3')
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(METRICS_DUPLICATE_QUERY_THRESHOLD=3)
+    def test_repeated_queries_are_flagged(self):
+        """ A statement repeated in a loop should be reported with its view. """
+        def view(request):
+            for pk in range(3):
+                User.objects.filter(pk=pk).exists()
+            return HttpResponse()
+
+        request = RequestFactory().get('/api/articles/')
+        request.resolver_match = resolve('/api/articles/')
+        with self.assertLogs('authors.apps.core.metrics', 'WARNING') as logs:
+            MetricsMiddleware(view)(request)
+
+        self.assertIn('authors.apps.articles.views.ArticleAPIView', logs.output[0])
+        self.assertIn('3 runs of', logs.output[0])
+        self.assertIn(
+            'authors_request_duplicate_queries_total{method="GET"',
+            registry.render())
+
+    def test_distinct_queries_are_not_flagged(self):
+        """ Different statements should not count as duplicates. """
+        metrics = RequestMetrics()
+        metrics.statements.update(['SELECT 1', 'SELECT 2', 'SELECT 1'])
+
+        self.assertEqual(metrics.duplicates(3), [])
+        self.assertEqual(metrics.duplicates(2), [('SELECT 1', 2)])
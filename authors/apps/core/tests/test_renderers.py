@@ -0,0 +1,62 @@
+import json
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from authors.apps.core import renderers
+from authors.apps.core.renderers import AuthorsJSONRenderer
+
+
+class LabelledRenderer(AuthorsJSONRenderer):
+    object_label = 'thing'
+    object_label_plural = 'things'
+
+
+class AuthorsJSONRendererTestCase(SimpleTestCase):
+    """ Tests for the enveloping JSON renderer. """
+
+    def render(self, data):
+        return json.loads(LabelledRenderer().render(data))
+
+    def test_renders_lists_under_plural_label(self):
+        data = ReturnList([{'name': 'café'}], serializer=None)
+        self.assertEqual(self.render(data), {'things': [{'name': 'café'}]})
+
+    def test_renders_objects_under_singular_label(self):
+        data = ReturnDict({'name': 'one'}, serializer=None)
+        self.assertEqual(self.render(data), {'thing': {'name': 'one'}})
+
+    def test_renders_errors_without_envelope(self):
+        data = {'errors': {'name': ['This field is required.']}}
+        self.assertEqual(self.render(data), data)
+
+    def test_encodes_without_reparsing(self):
+        """ The payload should be encoded once, never decoded again. """
+        with mock.patch('json.loads') as loads:
+            LabelledRenderer().render(ReturnList([1, 2], serializer=None))
+        loads.assert_not_called()
+
+    def encode(self):
+        data = ReturnList([{
+            'name': 'café', 'rating': Decimal('3.5'),
+            'label': gettext_lazy('one'),
+        }], serializer=None)
+        return LabelledRenderer().render(data)
+
+    def test_falls_back_without_c_encoder(self):
+        """ DRF's encoder should write the same compact document. """
+        with mock.patch.object(renderers, 'orjson', None):
+            fallback = self.encode()
+        self.assertEqual(
+            fallback,
+            '{"things":[{"name":"café","rating":3.5,"label":"one"}]}'.encode())
+
+    @skipUnless(renderers.orjson, 'orjson is not installed')
+    def test_c_encoder_matches_fallback(self):
+        """ orjson should write the document byte for byte like DRF. """
+        with mock.patch.object(renderers, 'orjson', None):
+            fallback = self.encode()
+        self.assertEqual(self.encode(), fallback)
@@ -0,0 +1,138 @@
+from django.core.cache import cache
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article
+from authors.apps.articles.tests.utils import create_user
+from authors.apps.core.routers import (
+    PRIMARY_COOKIE, ReplicaRouter, RoutingState, current_routing)
+
+REPLICA = 'replica'
+
+
+# The tests run in one process, which shares even a local-memory cache.
+@override_settings(DATABASE_REPLICAS=[REPLICA], PRIMARY_STICKINESS_SECONDS=10,
+                   SHARED_CACHE=True)
+class ReplicaRoutingTestCase(TestCase):
+    """ Tests for reading from replicas with read-your-writes stickiness. """
+
+    @classmethod
+    def setUpClass(cls):
+        # A second database standing in for a replica that has not caught
+        # up with the primary: rows written to `default` never reach it.
+        # It only exists while this test case runs, so the test runner
+        # neither checks nor creates it.
+        cls.databases = {'default', REPLICA}
+        primary = connections['default'].settings_dict
+        connections.databases[REPLICA] = dict(
+            primary, NAME=primary['NAME'] + '_replica', TEST={})
+        cls.replica_name = connections[REPLICA].settings_dict['NAME']
+        connections[REPLICA].creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            super().tearDownClass()
+        finally:
+            connections[REPLICA].creation.destroy_test_db(
+                cls.replica_name, verbosity=0)
+            del connections[REPLICA]
+            del connections.databases[REPLICA]
+
+    def setUp(self):
+        cache.clear()
+        self.author = create_user('author', 'author@mail.com')
+        self.client = APIClient()
+
+    def get(self, url):
+        with CaptureQueriesContext(connections[REPLICA]) as replica:
+            response = self.client.get(url)
+        return response, len(replica.captured_queries)
+
+    def create_article(self):
+        self.client.force_authenticate(user=self.author)
+        response = self.client.post('/api/articles/', {'article': {
+            'title': 'Fresh', 'description': 'Just written', 'body': 'Body'}},
+            format='json')
+        self.assertEqual(response.status_code, 201)
+        return response
+
+    def test_reads_go_to_the_replica(self):
+        Article.objects.create(
+            title='Primary only', description='d', body='b',
+            author=self.author.profile)
+
+        response, replica_queries = self.get('/api/articles/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], [])
+        self.assertGreater(replica_queries, 0)
+
+    @override_settings(SHARED_CACHE=False)
+    def test_replicas_are_unused_without_a_shared_cache(self):
+        """ Pins kept per process could not stop other workers. """
+        response = self.create_article()
+        self.assertNotIn(PRIMARY_COOKIE, response.cookies)
+
+        self.client.force_authenticate(user=None)
+        response, replica_queries = self.get('/api/articles/')
+        self.assertEqual(response.data['results'][0]['title'], 'Fresh')
+        self.assertEqual(replica_queries, 0)
+
+    def test_writers_read_from_the_primary(self):
+        response = self.create_article()
+        self.assertIn(PRIMARY_COOKIE, response.cookies)
+        self.assertEqual(response.cookies[PRIMARY_COOKIE]['max-age'], 10)
+        url = '/api/articles/{}/'.format(response.data['slug'])
+
+        response, replica_queries = self.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(replica_queries, 0)
+
+        # Other clients keep reading from the lagging replica.
+        self.client = APIClient()
+        response, replica_queries = self.get('/api/articles/')
+        self.assertEqual(response.data['results'], [])
+        self.assertGreater(replica_queries, 0)
+
+    def test_token_clients_read_from_the_primary(self):
+        """ Clients that do not send cookies are pinned through their JWT. """
+        token = 'Bearer ' + self.author.token
+        self.client.credentials(HTTP_AUTHORIZATION=token)
+        self.client.force_authenticate(user=self.author)
+        response = self.create_article()
+
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=token)
+        url = '/api/articles/{}/'.format(response.data['slug'])
+        response, replica_queries = self.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(replica_queries, 0)
+
+    def test_forged_pins_are_ignored(self):
+        self.client.cookies[PRIMARY_COOKIE] = '1'
+        _, replica_queries = self.get('/api/articles/')
+        self.assertGreater(replica_queries, 0)
+
+    @override_settings(PRIMARY_STICKINESS_SECONDS=-1)
+    def test_pins_expire(self):
+        self.create_article()
+        _, replica_queries = self.get('/api/articles/')
+        self.assertGreater(replica_queries, 0)
+
+    def test_router(self):
+        router = ReplicaRouter()
+        # Outside of requests, and after a write, reads use the primary.
+        self.assertEqual(router.db_for_read(Article), 'default')
+        token = current_routing.set(RoutingState(REPLICA))
+        try:
+            self.assertEqual(router.db_for_read(Article), REPLICA)
+            self.assertEqual(router.db_for_write(Article), 'default')
+            self.assertEqual(router.db_for_read(Article), 'default')
+        finally:
+            current_routing.reset(token)
+        self.assertIs(router.allow_migrate(REPLICA, 'articles'), False)
+        self.assertIsNone(router.allow_migrate('default', 'articles'))
@@ -0,0 +1,47 @@
+# Generated by Django 3.1.14 on 2026-10-18 17:05
+
+from django.db import migrations, models
+
+from authors.apps.core.models import SubqueryCount
+
+
+def populate_counters(apps, schema_editor):
+    Profile = apps.get_model('profiles', 'Profile')
+    follows = Profile.follows.through.objects
+    profile = models.OuterRef('pk')
+
+    Profile.objects.update(
+        following_count=SubqueryCount(
+            follows.filter(from_profile_id=profile).values('pk')),
+        followers_count=SubqueryCount(
+            follows.filter(to_profile_id=profile).values('pk')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0003_profile_favorites'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='following_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+        # Lets follower lists seek through the follows of a profile in
+        # follower order, as the unique (from, to) index does for
+        # following lists.
+        migrations.RunSQL(
+            'CREATE INDEX profiles_profile_follows_to_from '
+            'ON profiles_profile_follows (to_profile_id, from_profile_id)',
+            'DROP INDEX profiles_profile_follows_to_from',
+        ),
+    ]
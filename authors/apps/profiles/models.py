@@ -1,9 +1,49 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
 
+from authors.apps.core.cache import expire_version
+from authors.apps.core.conditional import make_etag
 from authors.apps.core.models import TimeModel
 from django.conf import settings
 
 
+def profile_version(pk):
+    """ Name of the version counter of a profile's data. """
+    return 'profile:{}'.format(pk)
+
+
+class ProfileQuerySet(models.QuerySet):
+
+    def validators(self):
+        """
+        Return the ETag of the profile's representation, or None if there
+        is no such profile. The follow counters change without touching
+        `updated_at`, which therefore makes no Last-Modified date.
+        """
+        state = self.values_list(
+            'pk', 'updated_at', 'following_count', 'followers_count',
+            'user__username', 'user__email',
+        ).first()
+        if state is None:
+            return None
+
+        return {'etag': make_etag('profile', *state)}
+
+    def with_following(self, profile):
+        """
+        Annotate whether `profile` follows each of the profiles, for
+        `ProfileListSerializer`, in the same query as the profiles.
+        """
+        if profile is None:
+            return self.annotate(
+                is_following=models.Value(False, models.BooleanField()))
+
+        return self.annotate(is_following=models.Exists(
+            Profile.follows.through.objects.filter(
+                from_profile=profile, to_profile_id=models.OuterRef('pk'))))
+
+
 class Profile(TimeModel):
     # There is an inherent relationship between the Profile and
     # User models. By creating a one-to-one relationship between the two, we
@@ -27,6 +67,12 @@ class Profile(TimeModel):
     favorites = models.ManyToManyField(
         'articles.Article', symmetrical=False, related_name='users_favorites')
 
+    # Denormalized sizes of `follows` and `followed_by`, kept in step with
+    # the relation by `update_follow_counters`.
+    following_count = models.IntegerField(default=0)
+    followers_count = models.IntegerField(default=0)
+
+    objects = ProfileQuerySet.as_manager()
 
     def __str__(self):
         return self.user.username
@@ -35,7 +81,19 @@ class Profile(TimeModel):
         self.follows.add(profile)
 
     def unfollow(self, profile):
-        self.follows.remove(profile)
+        """
+        Stop following `profile`. The counters and the feed only change
+        when a follow was actually deleted.
+        """
+        through = Profile.follows.through
+        with transaction.atomic():
+            deleted, _ = through.objects.filter(
+                from_profile=self, to_profile=profile).delete()
+            if deleted:
+                m2m_changed.send(
+                    sender=through, instance=self, action='post_remove',
+                    reverse=False, model=Profile, pk_set={profile.pk},
+                    using=self._state.db)
 
     def get_followers(self, profile):
         return profile.followed_by.all()
@@ -44,7 +102,57 @@ class Profile(TimeModel):
         return profile.follows.all()
 
     def favorite(self, article):
-        self.favorites.add(article)
+        with transaction.atomic():
+            if Profile.favorites.through.objects.get_or_create(
+                    profile=self, article=article)[1]:
+                article.update_counters(favorites_count=1)
 
     def unfavorite(self, article):
-        self.favorites.remove(article)
+        with transaction.atomic():
+            if Profile.favorites.through.objects.filter(
+                    profile=self, article=article).delete()[0]:
+                article.update_counters(favorites_count=-1)
+
+
+@receiver(m2m_changed, sender=Profile.follows.through)
+def update_follow_counters(sender, instance, action, reverse, pk_set, **kwargs):
+    """ create a signal to count the follows added to or removed from a profile. """
+    own, other = 'following_count', 'followers_count'
+    if reverse:
+        own, other = other, own
+
+    if action == 'pre_clear':
+        # The cleared profiles are not sent along with `post_clear`.
+        related = instance.followed_by if reverse else instance.follows
+        instance._cleared_follow_ids = list(
+            related.values_list('pk', flat=True))
+        return
+    if action == 'pre_remove':
+        # `post_remove` gets every id passed to `remove()`, followed or not,
+        # so the follows about to go are read, and locked, beforehand.
+        related = instance.followed_by if reverse else instance.follows
+        instance._removed_follow_ids = list(related.filter(
+            pk__in=pk_set).select_for_update().values_list('pk', flat=True))
+        return
+    if action == 'post_clear':
+        pk_set = instance.__dict__.pop('_cleared_follow_ids', [])
+    if action == 'post_remove':
+        pk_set = instance.__dict__.pop('_removed_follow_ids', pk_set)
+    if action not in ('post_add', 'post_remove', 'post_clear') or not pk_set:
+        return
+
+    delta = 1 if action == 'post_add' else -1
+    Profile.objects.filter(pk=instance.pk).update(
+        **{own: models.F(own) + delta * len(pk_set)})
+    Profile.objects.filter(pk__in=pk_set).update(
+        **{other: models.F(other) + delta})
+    instance.refresh_from_db(fields=[own])
+
+    for pk in [instance.pk, *pk_set]:
+        expire_version(profile_version(pk))
+
+
+@receiver(post_save, sender=Profile)
+def expire_profile(sender, instance, *args, **kwargs):
+    """ create a signal to expire what is cached about a changed profile. """
+    expire_version(profile_version(instance.pk))
@@ -1,15 +1,17 @@
 from rest_framework import serializers
 
+from authors.apps.core.compiled import CompiledSerializer
+from authors.apps.core.fields import SparseFieldsMixin
 from .models import Profile
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     username = serializers.CharField(source='user.username')
     email = serializers.CharField(source='user.email')
     bio = serializers.CharField(allow_blank=True, required=False)
     image = serializers.CharField(allow_blank=True, required=False)
-    follows = serializers.SerializerMethodField(method_name="follows_count")
-    followers = serializers.SerializerMethodField(method_name="followers_count")
+    follows = serializers.IntegerField(source='following_count', read_only=True)
+    followers = serializers.IntegerField(source='followers_count', read_only=True)
 
     class Meta:
         model = Profile
@@ -22,8 +24,19 @@ class ProfileSerializer(serializers.ModelSerializer):
 
         return 'https://static.productionready.io/images/smiley-cyrus.jpg'
 
-    def follows_count(self, obj):
-        return obj.follows.count()
 
-    def followers_count(self, obj):
-        return obj.get_followers(obj).count()
+class ProfileListSerializer(ProfileSerializer):
+    """
+    Profile serializer for lists of profiles, telling whether the viewer
+    follows each of them from the `is_following` annotation of
+    `ProfileQuerySet.with_following`.
+    """
+    following = serializers.BooleanField(source='is_following', read_only=True)
+
+    class Meta(ProfileSerializer.Meta):
+        fields = ProfileSerializer.Meta.fields + ('following',)
+
+
+class CompiledProfileListSerializer(CompiledSerializer):
+    """ `ProfileListSerializer` for `.values()` rows. """
+    serializer_class = ProfileListSerializer
@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from ...authentication.models import User
 from rest_framework.test import APITestCase, APIClient
 from django.urls import reverse, resolve
@@ -96,3 +98,142 @@ class TestFollowAPI(APITestCase):
                                        args=[user.username]))
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestFollowListsAPI(APITestCase):
+    ''' Tests the followers and following lists. '''
+
+    def setUp(self):
+        self.star = User.objects.create_user(
+            username="star", password="myCoolP@$$W0rd", email="star@mail.io")
+        self.fans = [
+            User.objects.create_user(
+                username="fan{}".format(index), password="myCoolP@$$W0rd",
+                email="fan{}@mail.io".format(index))
+            for index in range(3)
+        ]
+        for fan in self.fans:
+            fan.profile.follow(self.star.profile)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.fans[0])
+
+    def test_follow_counters_are_stored(self):
+        ''' Following and unfollowing should keep both counters in step. '''
+        self.star.profile.refresh_from_db()
+        self.assertEqual(self.star.profile.followers_count, 3)
+        self.assertEqual(self.fans[0].profile.following_count, 1)
+
+        self.fans[0].profile.unfollow(self.star.profile)
+        self.star.profile.refresh_from_db()
+        self.assertEqual(self.star.profile.followers_count, 2)
+        self.assertEqual(self.fans[0].profile.following_count, 0)
+
+    def test_removing_missing_follows_changes_no_counter(self):
+        ''' Only follows that existed should be uncounted. '''
+        stranger = User.objects.create_user(
+            username="stranger", password="myCoolP@$$W0rd",
+            email="stranger@mail.io")
+        self.fans[0].profile.unfollow(stranger.profile)
+        self.fans[0].profile.follows.remove(stranger.profile, self.star.profile)
+
+        stranger.profile.refresh_from_db()
+        self.star.profile.refresh_from_db()
+        self.fans[0].profile.refresh_from_db()
+        self.assertEqual(stranger.profile.followers_count, 0)
+        self.assertEqual(self.star.profile.followers_count, 2)
+        self.assertEqual(self.fans[0].profile.following_count, 0)
+
+        response = self.client.delete(reverse(
+            "profiles:follow_profile", args=[self.star.username]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.fans[0].profile.refresh_from_db()
+        self.assertEqual(self.fans[0].profile.following_count, 0)
+
+    def test_follow_response_shows_updated_counts(self):
+        ''' The follow response should count the new follow. '''
+        response = self.client.post(reverse(
+            "profiles:follow_profile", args=[self.fans[1].username]))
+
+        self.assertEqual(response.data['follows'], 2)
+
+    def test_followers_are_paginated_with_link_header(self):
+        ''' Lists should be split in pages linked from the Link header. '''
+        url = reverse("profiles:followers", args=[self.star.username])
+        response = self.client.get(url, {'limit': 2})
+
+        self.assertEqual(
+            [profile['username'] for profile in response.data],
+            ["fan2", "fan1"])
+        next_url = response['Link'].split(';')[0].strip('<>')
+
+        response = self.client.get(next_url)
+        self.assertEqual(
+            [profile['username'] for profile in response.data], ["fan0"])
+        self.assertNotIn('rel="next"', response['Link'])
+        self.assertIn('profiles', json.loads(response.content))
+
+    def test_lists_tell_whether_the_viewer_follows(self):
+        ''' Each listed profile should say if the viewer follows it. '''
+        self.fans[0].profile.follow(self.fans[1].profile)
+        response = self.client.get(
+            reverse("profiles:followers", args=[self.star.username]))
+
+        following = {
+            profile['username']: profile['following'] for profile in response.data}
+        self.assertEqual(
+            following, {"fan0": False, "fan1": True, "fan2": False})
+
+        response = self.client.get(
+            reverse("profiles:following", args=[self.fans[0].username]))
+        self.assertEqual(
+            [(profile['username'], profile['following'])
+             for profile in response.data],
+            [("fan1", True), ("star", True)])
+
+    def test_list_query_count_is_constant(self):
+        ''' Listing more followers should not run more queries. '''
+        url = reverse("profiles:followers", args=[self.star.username])
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(url)
+        for index in range(3, 8):
+            User.objects.create_user(
+                username="fan{}".format(index), password="myCoolP@$$W0rd",
+                email="fan{}@mail.io".format(index)
+            ).profile.follow(self.star.profile)
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(url)
+
+        self.assertEqual(len(few), len(many))
+
+    def test_unknown_profile_lists(self):
+        ''' Listing the followers of a missing profile should fail cleanly. '''
+        response = self.client.get(
+            reverse("profiles:followers", args=["nobody"]))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestProfileConditionalGet(APITestCase):
+    ''' Tests the ETag of profile pages. '''
+
+    def test_profile_etag_follows_changes(self):
+        ''' The ETag should hold until the profile changes. '''
+        user = User.objects.create_user(
+            username="cooluser", password="myCoolP@$$W0rd",
+            email="cooluser@mail.io")
+        fan = User.objects.create_user(
+            username="cooluser1", password="myCoolP@$$W0rd",
+            email="cooluser1@mail.io")
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = reverse("profiles:view_profile", args=[user.username])
+
+        etag = client.get(url)['ETag']
+        self.assertEqual(
+            client.get(url, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_304_NOT_MODIFIED)
+
+        fan.profile.follow(user.profile)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['followers'], 1)
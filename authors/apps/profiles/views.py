@@ -1,34 +1,67 @@
-from rest_framework.generics import RetrieveAPIView
+from rest_framework.generics import ListAPIView, RetrieveAPIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import serializers, status
 from rest_framework.views import APIView
 from rest_framework.exceptions import NotFound
+from authors.apps.core.compiled import CompiledListMixin
+from authors.apps.core.conditional import make_etag, not_modified, set_validators
+from authors.apps.core.fields import SparseFieldsViewMixin
+from authors.apps.core.metrics import SerializerMetricsMixin
+from authors.apps.core.pagination import LinkHeaderKeysetPagination
 from .models import Profile
 from .renderers import ProfileJSONRenderer
-from .serializers import ProfileSerializer
+from .serializers import (
+    CompiledProfileListSerializer, ProfileListSerializer, ProfileSerializer)
 from .exceptions import ProfileDoesNotExist
 
 import json
 
 
-class ProfileRetrieveAPIView(RetrieveAPIView):
+class ProfileRetrieveAPIView(SerializerMetricsMixin, SparseFieldsViewMixin,
+                             RetrieveAPIView):
     permission_classes = (IsAuthenticated,)
     renderer_classes = (ProfileJSONRenderer,)
     serializer_class = ProfileSerializer
 
     def retrieve(self, request, username, *args, **kwargs):
+        validators = Profile.objects.filter(
+            user__username=username).validators()
+        if validators is None:
+            raise ProfileDoesNotExist
+        if self.selection is not None:
+            validators['etag'] = make_etag(
+                validators['etag'], self.selection.key())
+        response = not_modified(request, **validators)
+        if response is not None:
+            return response
+
+        serializer = self.get_serializer()
         try:
-            profile = Profile.objects.select_related('user').get(
+            profile = self.get_profiles(serializer).get(
                 user__username=username
             )
 
         except Profile.DoesNotExist:
             raise ProfileDoesNotExist
 
-        serializer = self.serializer_class(profile)
+        serializer.instance = profile
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return set_validators(
+            Response(serializer.data, status=status.HTTP_200_OK), **validators)
+
+    def get_profiles(self, serializer):
+        """ Profiles loading only the columns `serializer` will show. """
+        if self.selection is None:
+            return Profile.objects.select_related('user')
+
+        columns = [
+            field.source.replace('.', '__')
+            for field in serializer.fields.values()] or ['pk']
+        queryset = Profile.objects.only(*columns)
+        if any(column.startswith('user__') for column in columns):
+            queryset = queryset.select_related('user')
+        return queryset
 
 class ProfileFollowAPIView(APIView):
     permission_classes = (IsAuthenticated,)
@@ -76,29 +109,30 @@ class ProfileFollowAPIView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class FollowersAPIView(APIView):
+class FollowersAPIView(SerializerMetricsMixin, CompiledListMixin,
+                       ListAPIView):
     permission_classes = (IsAuthenticated,)
     renderer_classes = (ProfileJSONRenderer,)
-    serializer_class = ProfileSerializer
-
-    def get(self, request, username):
-        user = request.user.profile
-        profile = Profile.objects.get(user__username=username)
+    serializer_class = ProfileListSerializer
+    compiled_serializer_class = CompiledProfileListSerializer
+    pagination_class = LinkHeaderKeysetPagination
+    keyset_ordering = ('-id',)
 
-        followers = user.get_followers(profile)
-        serializer = self.serializer_class(followers, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    def get_profile(self):
+        try:
+            return Profile.objects.get(user__username=self.kwargs['username'])
+        except Profile.DoesNotExist:
+            raise ProfileDoesNotExist
 
+    def get_queryset(self):
+        profile = self.get_profile()
+        return self.request.user.profile.get_followers(profile).select_related(
+            'user').with_following(self.request.user.profile)
 
-class FollowingAPIView(APIView):
-    permission_classes = (IsAuthenticated,)
-    renderer_classes = (ProfileJSONRenderer,)
-    serializer_class = ProfileSerializer
 
-    def get(self, request, username):
-        user = request.user.profile
-        profile = Profile.objects.get(user__username=username)
+class FollowingAPIView(FollowersAPIView):
 
-        following = user.get_following(profile)
-        serializer = self.serializer_class(following, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    def get_queryset(self):
+        profile = self.get_profile()
+        return self.request.user.profile.get_following(profile).select_related(
+            'user').with_following(self.request.user.profile)
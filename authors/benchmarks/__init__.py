@@ -0,0 +1,18 @@
+"""
+Reproducible benchmarks of the API.
+
+`data.generate()` fills the database with a seeded, deterministic set of
+users, articles, tags, follows, likes, ratings, favorites and comment
+threads through the models, so every counter and signal driven table is
+populated the way real traffic would populate it. `runner.run()` then
+drives the URL routes with Django's test client, or over HTTP against a
+running server, and `report` summarises each endpoint's latency
+percentiles and query counts into a JSON baseline that later runs are
+compared against.
+
+Run it with `python manage.py benchmark_api`.
+
+`connections.run()`, behind `python manage.py benchmark_connections`,
+compares opening a database connection per request with the persistent
+and pooled connections of `authors.apps.core.db`.
+"""
@@ -0,0 +1,89 @@
+import threading
+import time
+
+from django.db import connections
+from django.db.utils import load_backend
+
+from authors.apps.core.db.pool import close_pools
+
+from .report import percentile
+
+# The connection settings compared, applied over the database's own.
+MODES = (
+    ('per-request', {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False,
+                     'POOL': None}),
+    ('persistent', {'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True,
+                    'POOL': None}),
+    ('pooled', {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': True,
+                'POOL': {'SIZE': None, 'TIMEOUT': 30, 'MAX_AGE': None}}),
+)
+
+
+def mode_settings(settings_dict, overrides, threads):
+    settings_dict = dict(settings_dict, **overrides)
+    if settings_dict['POOL']:
+        settings_dict['POOL'] = dict(settings_dict['POOL'], SIZE=threads)
+    return settings_dict
+
+
+def simulate(settings_dict, requests, threads, query='SELECT 1'):
+    """
+    Run `requests` request cycles on each of `threads` threads against a
+    database configured by `settings_dict`, and return how many
+    connections were opened, the time spent opening them and the
+    duration of every request.
+
+    A cycle is what Django does around a view that runs one query:
+    `close_if_unusable_or_obsolete()` on `request_started`, the query,
+    and the same again on `request_finished`.
+    """
+    backend = load_backend(settings_dict['ENGINE'])
+    wrappers, durations = [], []
+    lock = threading.Lock()
+
+    def worker():
+        wrapper = backend.DatabaseWrapper(settings_dict, alias='benchmark')
+        timings = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            wrapper.close_if_unusable_or_obsolete()
+            with wrapper.cursor() as cursor:
+                cursor.execute(query)
+                cursor.fetchall()
+            wrapper.close_if_unusable_or_obsolete()
+            timings.append(time.perf_counter() - start)
+        wrapper.close()
+        with lock:
+            wrappers.append(wrapper)
+            durations.extend(timings)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    close_pools('benchmark')
+    return (sum(wrapper.connections_opened for wrapper in wrappers),
+            sum(wrapper.connect_seconds for wrapper in wrappers), durations)
+
+
+def run(alias='default', requests=200, threads=4):
+    """ Compare the connection `MODES` on the database `alias`. """
+    results = {}
+    for name, overrides in MODES:
+        settings_dict = mode_settings(
+            connections[alias].settings_dict, overrides, threads)
+        opened, connect_seconds, durations = simulate(
+            settings_dict, requests, threads)
+        milliseconds = [seconds * 1000 for seconds in durations]
+        results[name] = {
+            'requests': len(durations),
+            'connections_opened': opened,
+            'connections_per_request': round(opened / len(durations), 3),
+            'connect_ms_per_request': round(
+                connect_seconds * 1000 / len(durations), 3),
+            'p50_ms': round(percentile(milliseconds, 50), 3),
+            'p95_ms': round(percentile(milliseconds, 95), 3),
+        }
+    return results
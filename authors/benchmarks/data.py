@@ -0,0 +1,105 @@
+import random
+from collections import namedtuple
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from authors.apps.articles.models import Article, Comment, Rate
+from authors.apps.articles.utils import resolve_tags
+from authors.apps.authentication.models import User
+
+# The reader the benchmark acts as. It writes no articles, so it may rate
+# and favorite any of them.
+READER = 'benchmark-reader'
+PASSWORD = 'Benchmark123.'
+
+WORDS = (
+    'django', 'python', 'postgres', 'cache', 'query', 'index', 'latency',
+    'render', 'token', 'profile', 'follow', 'article', 'comment', 'thread',
+    'search', 'feed', 'rating', 'tag', 'signal', 'migration', 'serializer',
+    'router', 'cursor', 'worker', 'pool', 'replica', 'benchmark', 'payload',
+)
+
+Dataset = namedtuple('Dataset', 'reader usernames slugs words')
+
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def generate(users=50, articles=200, tags=30, follows=5, likes=5, ratings=3,
+             comments=4, depth=3, seed=1):
+    """
+    Create `users` authors and `articles` articles spread over them, plus
+    the benchmark reader, and return the `Dataset` the runner works from.
+
+    Each article gets up to three of `tags` tags, up to `likes` likes or
+    dislikes, `ratings` ratings, and `comments` top level comments with
+    replies nested up to `depth` levels. Every user follows up to
+    `follows` others. The same arguments always produce the same data.
+    """
+    rng = random.Random(seed)
+    password = make_password(PASSWORD)
+
+    with transaction.atomic():
+        reader = User(username=READER, email=READER + '@example.com',
+                      password=password)
+        reader.save()
+        authors = []
+        for index in range(users):
+            user = User(username='bench{}'.format(index),
+                        email='bench{}@example.com'.format(index),
+                        password=password)
+            user.save()
+            authors.append(user)
+
+        for user in [reader] + authors:
+            for followed in rng.sample(authors, min(follows, len(authors))):
+                if followed != user:
+                    user.profile.follow(followed.profile)
+
+        tag_names = ['{}-{}'.format(rng.choice(WORDS), index)
+                     for index in range(tags)]
+        for index in range(articles):
+            author = rng.choice(authors)
+            article = Article.objects.create(
+                title=sentence(rng, 6), description=sentence(rng, 12),
+                body='\n\n'.join(sentence(rng, 60) for _ in range(5)),
+                author=author.profile)
+            article.tags.add(*resolve_tags(
+                rng.sample(tag_names, rng.randint(0, min(3, tags)))))
+
+            others = [user for user in authors if user != author]
+            for user in rng.sample(others, min(likes, len(others))):
+                if rng.random() < 0.8:
+                    article.like(user)
+                else:
+                    article.dislike(user)
+                if rng.random() < 0.3:
+                    user.profile.favorite(article)
+            for user in rng.sample(others, min(ratings, len(others))):
+                value = rng.randint(1, 5)
+                Rate.objects.create(
+                    article=article, rater=user.profile, ratings=value)
+                article.record_rating(value)
+
+            for _ in range(comments):
+                parent = None
+                for _ in range(rng.randint(1, depth)):
+                    parent = Comment.objects.create(
+                        body=sentence(rng, 20), article=article,
+                        author=rng.choice(authors).profile, parent=parent)
+
+    return load()
+
+
+def load():
+    """ Return the `Dataset` of data generated earlier. """
+    reader = User.objects.get(username=READER)
+    usernames = list(User.objects.filter(
+        username__startswith='bench').exclude(pk=reader.pk).order_by(
+            'pk').values_list('username', flat=True))
+    slugs = list(Article.objects.filter(
+        author__user__username__in=usernames).order_by(
+            'pk').values_list('slug', flat=True))
+    return Dataset(reader, usernames, slugs, WORDS)
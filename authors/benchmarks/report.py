@@ -0,0 +1,100 @@
+import json
+import platform
+
+import django
+from django.db import connection
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values, percent):
+    """ Return the nearest-rank `percent` percentile of `values`. """
+    ordered = sorted(values)
+    rank = max(-(-percent * len(ordered) // 100), 1)
+    return ordered[rank - 1]
+
+
+def summarise(samples):
+    """ Reduce the samples of one endpoint to its baseline entry. """
+    milliseconds = [sample.seconds * 1000 for sample in samples]
+    summary = {
+        'requests': len(samples),
+        'errors': sum(1 for sample in samples if sample.status >= 400),
+        'mean_ms': round(sum(milliseconds) / len(milliseconds), 3),
+    }
+    for percent in PERCENTILES:
+        summary['p{}_ms'.format(percent)] = round(
+            percentile(milliseconds, percent), 3)
+
+    queries = [sample.queries for sample in samples]
+    if None in queries:
+        summary['queries_p50'] = summary['queries_max'] = None
+    else:
+        summary['queries_p50'] = percentile(queries, 50)
+        summary['queries_max'] = max(queries)
+    return summary
+
+
+def build(samples, **settings):
+    """ Return the JSON baseline of a run, with what it ran on. """
+    return {
+        'meta': dict(
+            settings,
+            python=platform.python_version(),
+            django=django.get_version(),
+            database=connection.vendor,
+        ),
+        'endpoints': {
+            name: summarise(endpoint_samples)
+            for name, endpoint_samples in samples.items()
+        },
+    }
+
+
+def compare(baseline, current, tolerance=0.25):
+    """
+    Return a description of every regression of `current` against
+    `baseline`.
+
+    An endpoint regresses when it runs more queries than it used to, when
+    it starts failing requests, or when its p95 latency grew by more than
+    `tolerance`. Query counts are exact, so they are the dependable
+    signal on shared CI machines; latencies only catch large slowdowns.
+    """
+    regressions = []
+    for name, before in sorted(baseline['endpoints'].items()):
+        after = current['endpoints'].get(name)
+        if after is None:
+            continue
+        if None not in (before['queries_max'], after['queries_max']) and \
+                after['queries_max'] > before['queries_max']:
+            regressions.append('{}: {} queries, baseline {}'.format(
+                name, after['queries_max'], before['queries_max']))
+        if after['errors'] > before['errors']:
+            regressions.append('{}: {} failed requests, baseline {}'.format(
+                name, after['errors'], before['errors']))
+        if after['p95_ms'] > before['p95_ms'] * (1 + tolerance):
+            regressions.append('{}: p95 {:.1f}ms, baseline {:.1f}ms'.format(
+                name, after['p95_ms'], before['p95_ms']))
+    return regressions
+
+
+def speedup(plain, compiled):
+    """
+    Compare the summaries of the same endpoints run with the DRF
+    serializers, `plain`, and with the compiled ones.
+    """
+    return {
+        name: {
+            'drf_p50_ms': before['p50_ms'],
+            'compiled_p50_ms': compiled[name]['p50_ms'],
+            'speedup': round(
+                before['p50_ms'] / max(compiled[name]['p50_ms'], 0.001), 2),
+        }
+        for name, before in plain.items() if name in compiled
+    }
+
+
+def dump(report, target):
+    json.dump(report, target, indent=2, sort_keys=True)
+    target.write('\n')
@@ -0,0 +1,125 @@
+import json
+import random
+import time
+import urllib.error
+import urllib.request
+from collections import namedtuple
+from contextlib import ExitStack
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+# `path` is formatted with a `slug`, a `username` and a search `word`
+# picked at random from the dataset for every request.
+Endpoint = namedtuple('Endpoint', 'name method path body authenticated')
+
+ENDPOINTS = (
+    Endpoint('articles', 'GET', '/api/articles/', None, False),
+    Endpoint('article', 'GET', '/api/articles/{slug}/', None, False),
+    Endpoint('search', 'GET', '/api/articles?q={word}', None, False),
+    Endpoint('feed', 'GET', '/api/articles/feed/', None, True),
+    Endpoint('comments', 'GET', '/api/articles/{slug}/comments/', None, True),
+    Endpoint('comment', 'POST', '/api/articles/{slug}/comments/',
+             {'comment': {'body': 'Benchmark comment on {word}.'}}, True),
+    Endpoint('rate', 'POST', '/api/articles/{slug}/rate/',
+             {'rate': {'rate': 4}}, True),
+    Endpoint('favorite', 'POST', '/api/articles/{slug}/favorite/', None, True),
+    Endpoint('like', 'PUT', '/api/articles/{slug}/like/', None, True),
+    Endpoint('likers', 'GET', '/api/articles/{slug}/likes/', None, True),
+    Endpoint('profile', 'GET', '/api/profiles/{username}/', None, True),
+    Endpoint('followers', 'GET', '/api/profiles/{username}/followers/',
+             None, True),
+    Endpoint('tags', 'GET', '/api/tags/', None, False),
+)
+
+# Endpoints whose lists `COMPILED_SERIALIZERS` switches to the compiled
+# serializers of `authors.apps.core.compiled`.
+COMPILED_ENDPOINTS = ('articles', 'feed', 'comments', 'likers', 'followers')
+
+Sample = namedtuple('Sample', 'status seconds queries')
+
+
+class ClientTransport:
+    """ Send requests in process with the test client, counting queries. """
+    name = 'client'
+
+    def __init__(self):
+        self.client = APIClient()
+
+    def send(self, method, path, body, headers):
+        with ExitStack() as stack:
+            contexts = [
+                stack.enter_context(CaptureQueriesContext(connection))
+                for connection in connections.all()]
+            start = time.perf_counter()
+            response = getattr(self.client, method.lower())(
+                path, body, format='json', **{
+                    'HTTP_' + name.upper().replace('-', '_'): value
+                    for name, value in headers.items()})
+            seconds = time.perf_counter() - start
+        queries = sum(len(context.captured_queries) for context in contexts)
+        return Sample(response.status_code, seconds, queries)
+
+
+class HttpTransport:
+    """
+    Send requests to a running server such as a local gunicorn. Query
+    counts are not visible from here; the server's /metrics has them.
+    """
+    name = 'http'
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def send(self, method, path, body, headers):
+        data = None
+        headers = dict(headers)
+        if body is not None:
+            data = json.dumps(body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        request = urllib.request.Request(
+            self.base_url + path, data=data, headers=headers, method=method)
+
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as error:
+            error.read()
+            status = error.code
+        return Sample(status, time.perf_counter() - start, None)
+
+
+def format_request(endpoint, rng, dataset):
+    values = {
+        'slug': rng.choice(dataset.slugs),
+        'username': rng.choice(dataset.usernames),
+        'word': rng.choice(dataset.words),
+    }
+    body = endpoint.body
+    if body is not None:
+        body = json.loads(json.dumps(body).replace(
+            '{word}', values['word']))
+    return endpoint.path.format(**values), body
+
+
+def run(dataset, transport, iterations=50, warmup=5, endpoints=ENDPOINTS,
+        seed=1):
+    """
+    Send `warmup` untimed and then `iterations` timed requests to every
+    endpoint, and return the timed `Sample`s of each endpoint by name.
+    """
+    rng = random.Random(seed)
+    token = {'Authorization': 'Bearer ' + dataset.reader.token}
+    samples = {}
+    for endpoint in endpoints:
+        headers = token if endpoint.authenticated else {}
+        timed = samples[endpoint.name] = []
+        for index in range(warmup + iterations):
+            path, body = format_request(endpoint, rng, dataset)
+            sample = transport.send(endpoint.method, path, body, headers)
+            if index >= warmup:
+                timed.append(sample)
+    return samples
@@ -68,6 +68,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'authors.apps.core.metrics.MetricsMiddleware',
+    'authors.apps.core.routers.PrimaryStickinessMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -108,6 +110,60 @@ DATABASES = {
     'default': env.db()
 }
 
+# Read replicas of the default database, as a comma separated list of
+# URLs. Reads of GET requests go to one of them, except for clients that
+# wrote in the last PRIMARY_STICKINESS_SECONDS, see
+# authors.apps.core.routers. They are only used when SHARED_CACHE is on.
+DATABASE_REPLICAS = []
+for index, url in enumerate(env.list('DATABASE_REPLICA_URLS', default=[])):
+    alias = 'replica{}'.format(index + 1)
+    DATABASES[alias] = dict(env.db_url_config(url), TEST={'MIRROR': 'default'})
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ['authors.apps.core.routers.ReplicaRouter']
+PRIMARY_STICKINESS_SECONDS = env.int('PRIMARY_STICKINESS_SECONDS', default=10)
+
+# Connections stay open for CONN_MAX_AGE seconds, and are checked before a
+# new request reuses them while CONN_HEALTH_CHECKS is on. DB_POOL_SIZE > 0
+# shares that many connections between the threads of each worker instead,
+# released at the end of every request: a request waits up to
+# DB_POOL_TIMEOUT seconds for one, and connections are replaced once
+# DB_POOL_MAX_AGE seconds old. See authors.apps.core.db.
+DB_POOL_SIZE = env.int('DB_POOL_SIZE', default=0)
+DATABASE_ENGINES = {
+    'django.db.backends.postgresql': 'authors.apps.core.db.postgresql',
+    'django.db.backends.postgresql_psycopg2': 'authors.apps.core.db.postgresql',
+    'django.db.backends.sqlite3': 'authors.apps.core.db.sqlite3',
+}
+for database in DATABASES.values():
+    database['ENGINE'] = DATABASE_ENGINES.get(
+        database['ENGINE'], database['ENGINE'])
+    database['CONN_MAX_AGE'] = env.int(
+        'CONN_MAX_AGE', default=0 if DB_POOL_SIZE else 60)
+    database['CONN_HEALTH_CHECKS'] = env.bool('CONN_HEALTH_CHECKS', default=True)
+    database['POOL'] = {
+        'SIZE': DB_POOL_SIZE,
+        'TIMEOUT': env.int('DB_POOL_TIMEOUT', default=30),
+        'MAX_AGE': env.int('DB_POOL_MAX_AGE', default=1800),
+    } if DB_POOL_SIZE else None
+
+# The default cache holds the version counters behind the article cache
+# and the tag list's ETag. They are only used when it is shared between
+# processes (e.g. CACHE_URL=rediscache://...): with a cache local to each
+# worker, one worker would keep serving what another one has changed.
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://')
+}
+SHARED_CACHE = env.bool('SHARED_CACHE', default=not CACHES['default'][
+    'BACKEND'].endswith(('.LocMemCache', '.DummyCache')))
+
+# Cache holding rendered article detail payloads, and for how long.
+ARTICLE_CACHE_ALIAS = env('ARTICLE_CACHE_ALIAS', default='default')
+ARTICLE_CACHE_TTL = env.int('ARTICLE_CACHE_TTL', default=3600)
+
+# How long each process serves its copy of the tag list when the default
+# cache is not shared.
+TAG_DIRECTORY_TTL = env.int('TAG_DIRECTORY_TTL', default=5)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/1.11/ref/settings/#auth-password-validators
@@ -176,6 +232,31 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 12
 }
 
+# Replies nested deeper than this below a comment are not rendered.
+COMMENT_THREAD_MAX_DEPTH = env.int('COMMENT_THREAD_MAX_DEPTH', default=10)
+
+# PostgreSQL text search configuration used to index and query articles.
+ARTICLE_SEARCH_CONFIG = env('ARTICLE_SEARCH_CONFIG', default='english')
+
+# New articles are copied into the feed of each follower of their author,
+# unless the author has more followers than FEED_FANOUT_THRESHOLD, in which
+# case readers pull them in when loading their feed. Following someone
+# copies their latest FEED_BACKFILL_SIZE articles into the follower's feed.
+FEED_FANOUT_THRESHOLD = env.int('FEED_FANOUT_THRESHOLD', default=1000)
+FEED_BACKFILL_SIZE = env.int('FEED_BACKFILL_SIZE', default=100)
+
+# Addresses allowed to read the request metrics at /metrics.
+INTERNAL_IPS = env.list('INTERNAL_IPS', default=['127.0.0.1'])
+
+# Requests running one SQL statement this many times are reported as
+# likely N+1 query loops.
+METRICS_DUPLICATE_QUERY_THRESHOLD = env.int(
+    'METRICS_DUPLICATE_QUERY_THRESHOLD', default=5)
+
+# Article, comment and profile lists are built straight from `.values()`
+# rows by the compiled serializers of `authors.apps.core.compiled`.
+COMPILED_SERIALIZERS = env.bool('COMPILED_SERIALIZERS', default=True)
+
 # Email configurations
 EMAIL_HOST = 'smtp.sendgrid.net'
 EMAIL_PORT = 587
@@ -183,11 +264,26 @@ EMAIL_HOST_USER = 'apikey'
 EMAIL_USE_TLS = True
 EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD')
 
+# Outgoing mail is queued in the database and delivered by the
+# `send_queued_mail` worker. Failed sends are retried after
+# EMAIL_QUEUE_RETRY_DELAY seconds, doubling on every attempt.
+EMAIL_QUEUE_BATCH_SIZE = env.int('EMAIL_QUEUE_BATCH_SIZE', default=50)
+EMAIL_QUEUE_MAX_ATTEMPTS = env.int('EMAIL_QUEUE_MAX_ATTEMPTS', default=5)
+EMAIL_QUEUE_RETRY_DELAY = env.int('EMAIL_QUEUE_RETRY_DELAY', default=60)
+
 
 # JWT_EXPIRATION_DELTA set to default 1 day
 JWT_EXPIRATION_DELTA = datetime.timedelta(
     seconds=env("JWT_EXPIRATION_SECONDS", default=86400))
 
+# Authenticated users are cached per process for JWT_USER_CACHE_TTL
+# seconds, checked against a version counter in the default cache, so only
+# when SHARED_CACHE is on. Set JWT_USER_CACHE_ALIAS to one of CACHES to
+# share them between processes too.
+JWT_USER_CACHE_TTL = env.int('JWT_USER_CACHE_TTL', default=60)
+JWT_USER_CACHE_SIZE = env.int('JWT_USER_CACHE_SIZE', default=10000)
+JWT_USER_CACHE_ALIAS = env('JWT_USER_CACHE_ALIAS', default=None)
+
 VERIFCATION_URL = env('VERIFICATION_URL')
 
 # OAUTH
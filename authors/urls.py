@@ -16,8 +16,11 @@ Including another URLconf
 from django.conf.urls import include, url
 from django.contrib import admin
 
+from authors.apps.core.metrics import metrics_view
+
 urlpatterns = [
     url(r'^admin/', admin.site.urls),
+    url(r'^metrics$', metrics_view, name='metrics'),
 
     url(r'^api/', include('authors.apps.authentication.urls',
                           namespace='authentication')),